@@ -0,0 +1,200 @@
+"""Compare the legacy and staged ``get_student_context`` queries.
+
+Loads a synthetic campus graph, then runs both queries for a sample of
+students, reporting the rows produced by every operator in the PROFILE plan
+and the wall-clock latency of each query::
+
+    python -m benchmarks.student_context --students 2000 --sample 200
+
+The target database is taken from ``NEO4J_URI``/``NEO4J_USER``/``NEO4J_PASSWORD``
+and is cleared before loading unless ``--skip-load`` is given. With
+``--backend memory`` the graph is loaded into an in-process
+:class:`~src.graph.memory_graph.InMemoryGraphClient` instead; its PROFILE
+reports rows per clause rather than per operator.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Mapping, Optional, Sequence
+
+from src import config
+from src.graph import (
+    InMemoryGraphClient,
+    Neo4jClient,
+    clear_database,
+    create_constraints,
+    load_nodes,
+    load_relationships,
+)
+from src.queries import core_queries
+
+from .synthetic import DatasetShape, generate_dataset
+
+# The query ``get_student_context`` ran before the staged rewrite. Its four
+# chained OPTIONAL MATCHes fan out to courses x books x programs x scholarships
+# rows per student before collect(DISTINCT ...) folds them back.
+LEGACY_STUDENT_CONTEXT_QUERY = """
+    MATCH (s:Student {student_id: $student_id})
+    OPTIONAL MATCH (s)-[:ENROLLED_IN]->(c:Course)
+    OPTIONAL MATCH (c)-[:USES_BOOK]->(b:Book)
+    OPTIONAL MATCH (c)-[:RELATED_PROGRAM]->(p:Program)
+    OPTIONAL MATCH (sc:Scholarship)-[:REQUIRES_COURSE]->(c)
+    RETURN s,
+           collect(DISTINCT c) AS courses,
+           collect(DISTINCT b) AS books,
+           collect(DISTINCT p) AS programs,
+           collect(DISTINCT sc) AS scholarships
+    """
+
+QUERIES = {
+    "legacy": LEGACY_STUDENT_CONTEXT_QUERY,
+    "staged": core_queries.STUDENT_CONTEXT_QUERY,
+}
+
+
+@dataclass(frozen=True)
+class QueryStats:
+    name: str
+    total_rows: int
+    peak_rows: int
+    db_hits: int
+    p50_ms: float
+    mean_ms: float
+
+
+def _walk_profile(profile: Optional[Mapping[str, Any]]) -> tuple[int, int, int]:
+    if not profile:
+        return 0, 0, 0
+    total = int(profile.get("rows", 0))
+    peak = total
+    hits = int(profile.get("dbHits", 0))
+    for child in profile.get("children", ()):
+        child_total, child_peak, child_hits = _walk_profile(child)
+        total += child_total
+        peak = max(peak, child_peak)
+        hits += child_hits
+    return total, peak, hits
+
+
+def _normalized(context: dict[str, Any]) -> dict[str, Any]:
+    # collect() order is unspecified, so compare the collections as sorted lists.
+    return {
+        key: sorted(value, key=lambda node: json.dumps(node, sort_keys=True, default=str))
+        if isinstance(value, list)
+        else value
+        for key, value in context.items()
+    }
+
+
+def _check_same_output(client: Neo4jClient, student_ids: Sequence[str]) -> None:
+    for student_id in student_ids:
+        contexts = [
+            _normalized(core_queries._student_context(client.run(query, {"student_id": student_id}).single()))
+            for query in QUERIES.values()
+        ]
+        if contexts[0] != contexts[1]:
+            raise AssertionError(f"Legacy and staged queries disagree for student {student_id}")
+
+
+def measure(client: Neo4jClient, name: str, query: str, student_ids: Sequence[str], repeats: int) -> QueryStats:
+    total_rows = peak_rows = db_hits = 0
+    for student_id in student_ids:
+        summary = client.run(f"PROFILE {query}", {"student_id": student_id}).consume()
+        total, peak, hits = _walk_profile(getattr(summary, "profile", None))
+        total_rows += total
+        peak_rows = max(peak_rows, peak)
+        db_hits += hits
+
+    timings: list[float] = []
+    with client.session():
+        for _ in range(repeats):
+            for student_id in student_ids:
+                started = time.perf_counter()
+                client.run(query, {"student_id": student_id})
+                timings.append((time.perf_counter() - started) * 1000)
+    return QueryStats(
+        name=name,
+        total_rows=total_rows,
+        peak_rows=peak_rows,
+        db_hits=db_hits,
+        p50_ms=statistics.median(timings),
+        mean_ms=statistics.fmean(timings),
+    )
+
+
+def run_benchmark(
+    client: Neo4jClient,
+    student_ids: Sequence[str],
+    repeats: int = 3,
+) -> list[QueryStats]:
+    _check_same_output(client, student_ids)
+    return [measure(client, name, query, student_ids, repeats) for name, query in QUERIES.items()]
+
+
+def load_synthetic_graph(client: Neo4jClient, data_dir: Path, shape: DatasetShape, seed: int) -> list[str]:
+    generate_dataset(data_dir, shape, seed)
+    previous = (config.DATA_DIR, config.SNAPSHOT_CACHE)
+    config.DATA_DIR, config.SNAPSHOT_CACHE = data_dir, False
+    try:
+        clear_database(client)
+        create_constraints(client)
+        load_nodes(client)
+        load_relationships(client)
+    finally:
+        config.DATA_DIR, config.SNAPSHOT_CACHE = previous
+    return [record["id"] for record in client.run("MATCH (s:Student) RETURN s.student_id AS id ORDER BY id")]
+
+
+def _print_table(results: Sequence[QueryStats]) -> None:
+    print(f"{'query':<8} {'rows':>10} {'peak':>8} {'db hits':>10} {'p50 ms':>8} {'mean ms':>8}")
+    for stats in results:
+        print(
+            f"{stats.name:<8} {stats.total_rows:>10} {stats.peak_rows:>8} "
+            f"{stats.db_hits:>10} {stats.p50_ms:>8.2f} {stats.mean_ms:>8.2f}"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=DatasetShape.students)
+    parser.add_argument("--enrollments", type=int, default=DatasetShape.enrollments_per_student)
+    parser.add_argument("--sample", type=int, default=200, help="students queried per run")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--backend", choices=("neo4j", "memory"), default="neo4j")
+    parser.add_argument("--skip-load", action="store_true", help="query the graph already in the database")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.backend == "memory":
+        if args.skip_load:
+            parser.error("--skip-load needs --backend neo4j")
+        client: Neo4jClient = InMemoryGraphClient()  # type: ignore[assignment]
+    else:
+        client = Neo4jClient(config.NEO4J_URI, config.NEO4J_USER, config.NEO4J_PASSWORD)
+    try:
+        if args.skip_load:
+            records = client.run("MATCH (s:Student) RETURN s.student_id AS id ORDER BY id")
+            student_ids = [record["id"] for record in records]
+        else:
+            shape = DatasetShape(students=args.students, enrollments_per_student=args.enrollments)
+            with tempfile.TemporaryDirectory() as tmp:
+                student_ids = load_synthetic_graph(client, Path(tmp), shape, args.seed)
+        step = max(1, len(student_ids) // max(1, args.sample))
+        results = run_benchmark(client, student_ids[::step][: args.sample], args.repeats)
+    finally:
+        client.close()
+
+    _print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps([asdict(stats) for stats in results], indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
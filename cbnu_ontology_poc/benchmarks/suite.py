@@ -0,0 +1,320 @@
+"""Time the load and query paths on synthetic graphs of increasing size.
+
+Each scale multiplies the README sample graph (5,600 students, 260 courses,
+...) and measures, against a fresh backend:
+
+* ``csv_load``: parsing every source CSV (snapshot cache off)
+* ``node_load`` / ``relationship_load``: ``graph_builder.load_nodes`` and
+  ``load_relationships``
+* ``get_student_context`` / ``get_course_resources``: per-call latency
+  percentiles over a fixed sample of ids
+
+Results are printed and written as JSON so two runs can be compared::
+
+    python -m benchmarks.suite --scales 1,10 --json before.json
+    python -m benchmarks.suite --scales 1,10 --json after.json
+    python -m benchmarks.suite --compare before.json after.json
+
+The in-memory backend is used unless ``--backend neo4j`` is given, in which
+case the database at ``NEO4J_URI`` is cleared for every scale.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from src import config
+from src.etl import loaders
+from src.graph import (
+    InMemoryGraphClient,
+    Neo4jClient,
+    clear_database,
+    create_constraints,
+    load_nodes,
+    load_relationships,
+)
+from src.queries import core_queries
+
+from .synthetic import README_SAMPLE, generate_dataset
+
+DEFAULT_SCALES = (1.0, 10.0, 100.0)
+DEFAULT_QUERY_SAMPLE = 200
+RESULTS_VERSION = 1
+
+_CSV_FILES = ("students", "courses", "books", "programs", "scholarships", "departments", "relations")
+
+
+@dataclass
+class PhaseResult:
+    seconds: float
+    rows: int = 0
+    peak_mb: Optional[float] = None
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+
+@dataclass
+class LatencyResult:
+    calls: int
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+
+
+@dataclass
+class ScaleResult:
+    scale: float
+    rows: dict[str, int]
+    phases: dict[str, PhaseResult] = field(default_factory=dict)
+    queries: dict[str, LatencyResult] = field(default_factory=dict)
+    peak_rss_mb: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        for name, phase in self.phases.items():
+            data["phases"][name]["rows_per_sec"] = phase.rows_per_sec
+        return data
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of ``values`` (``fraction`` in [0, 1])."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return math.nan
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+@contextmanager
+def _phase(results: dict[str, PhaseResult], name: str, trace_memory: bool) -> Iterator[PhaseResult]:
+    result = PhaseResult(seconds=0.0)
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result.seconds = time.perf_counter() - started
+        if trace_memory:
+            result.peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+    results[name] = result
+
+
+def _latencies(call: Callable[[str], Any], ids: Sequence[str]) -> LatencyResult:
+    timings: list[float] = []
+    for item in ids:
+        started = time.perf_counter()
+        call(item)
+        timings.append((time.perf_counter() - started) * 1000)
+    return LatencyResult(
+        calls=len(timings),
+        p50_ms=percentile(timings, 0.50),
+        p95_ms=percentile(timings, 0.95),
+        mean_ms=statistics.fmean(timings) if timings else 0.0,
+    )
+
+
+def _sample(ids: Sequence[str], size: int) -> list[str]:
+    step = max(1, len(ids) // max(1, size))
+    return list(ids[::step][:size])
+
+
+def run_scale(
+    client: Neo4jClient,
+    scale: float,
+    data_dir: Path,
+    *,
+    query_sample: int = DEFAULT_QUERY_SAMPLE,
+    trace_memory: bool = False,
+    seed: int = 2024,
+) -> ScaleResult:
+    rows = generate_dataset(data_dir, README_SAMPLE.scaled(scale), seed)
+    result = ScaleResult(scale=scale, rows=rows)
+    previous = (config.DATA_DIR, config.SNAPSHOT_CACHE)
+    config.DATA_DIR, config.SNAPSHOT_CACHE = data_dir, False
+    try:
+        with _phase(result.phases, "csv_load", trace_memory) as phase:
+            for dataset in _CSV_FILES:
+                for chunk in loaders.iter_csv_chunks(loaders.dataset_filename(dataset)):
+                    phase.rows += len(chunk)
+
+        clear_database(client)
+        create_constraints(client)
+        with _phase(result.phases, "node_load", trace_memory) as phase:
+            phase.rows = load_nodes(client).rows
+        with _phase(result.phases, "relationship_load", trace_memory) as phase:
+            phase.rows = load_relationships(client).rows
+
+        student_ids = [r["id"] for r in client.run("MATCH (s:Student) RETURN s.student_id AS id ORDER BY id")]
+        course_ids = [r["id"] for r in client.run("MATCH (c:Course) RETURN c.course_id AS id ORDER BY id")]
+        with client.session():
+            result.queries["get_student_context"] = _latencies(
+                lambda item: core_queries.get_student_context(client, item), _sample(student_ids, query_sample)
+            )
+            result.queries["get_course_resources"] = _latencies(
+                lambda item: core_queries.get_course_resources(client, item), _sample(course_ids, query_sample)
+            )
+    finally:
+        config.DATA_DIR, config.SNAPSHOT_CACHE = previous
+    result.peak_rss_mb = _peak_rss_mb()
+    return result
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def run_suite(
+    make_client: Callable[[], Neo4jClient],
+    scales: Sequence[float] = DEFAULT_SCALES,
+    *,
+    backend: str = "memory",
+    query_sample: int = DEFAULT_QUERY_SAMPLE,
+    trace_memory: bool = False,
+) -> dict[str, Any]:
+    results = []
+    for scale in scales:
+        client = make_client()
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                result = run_scale(
+                    client, scale, Path(tmp), query_sample=query_sample, trace_memory=trace_memory
+                )
+        finally:
+            client.close()
+        _print_scale(result)
+        results.append(result.to_dict())
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "backend": backend,
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def _print_scale(result: ScaleResult) -> None:
+    print(f"scale {result.scale:g}x  (peak RSS {result.peak_rss_mb:.0f} MB)")
+    for name, phase in result.phases.items():
+        memory = f"  peak {phase.peak_mb:.1f} MB" if phase.peak_mb is not None else ""
+        print(f"  {name:<22} {phase.seconds:>8.2f}s {phase.rows:>10} rows {phase.rows_per_sec:>10.0f} rows/s{memory}")
+    for name, latency in result.queries.items():
+        print(f"  {name:<22} p50 {latency.p50_ms:>7.2f} ms  p95 {latency.p95_ms:>7.2f} ms  ({latency.calls} calls)")
+
+
+def _metrics(payload: dict[str, Any]) -> dict[tuple[float, str], float]:
+    metrics: dict[tuple[float, str], float] = {}
+    for result in payload["results"]:
+        scale = result["scale"]
+        for name, phase in result["phases"].items():
+            metrics[(scale, f"{name}.seconds")] = phase["seconds"]
+        for name, latency in result["queries"].items():
+            metrics[(scale, f"{name}.p50_ms")] = latency["p50_ms"]
+            metrics[(scale, f"{name}.p95_ms")] = latency["p95_ms"]
+        if not math.isnan(result["peak_rss_mb"]):
+            metrics[(scale, "peak_rss_mb")] = result["peak_rss_mb"]
+    return metrics
+
+
+def compare(before: dict[str, Any], after: dict[str, Any]) -> list[tuple[float, str, float, float, float]]:
+    """Return ``(scale, metric, before, after, after / before)`` for shared metrics."""
+    old, new = _metrics(before), _metrics(after)
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        ratio = new[key] / old[key] if old[key] else math.inf
+        rows.append((key[0], key[1], old[key], new[key], ratio))
+    return rows
+
+
+def _load_results(path: Path) -> dict[str, Any]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("version") != RESULTS_VERSION:
+        raise ValueError(f"Unsupported benchmark results version in {path}: {payload.get('version')!r}")
+    return payload
+
+
+def _parse_scales(text: str) -> list[float]:
+    scales = [float(part) for part in text.split(",") if part.strip()]
+    if not scales or any(scale <= 0 for scale in scales):
+        raise argparse.ArgumentTypeError(f"scales must be positive numbers, got {text!r}")
+    return scales
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=_parse_scales, default=list(DEFAULT_SCALES), help="e.g. 1,10,100")
+    parser.add_argument("--backend", choices=("memory", "neo4j"), default="memory")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERY_SAMPLE, help="ids sampled per query")
+    parser.add_argument("--trace-memory", action="store_true", help="track peak Python allocations per phase")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--compare", nargs=2, type=Path, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        before, after = (_load_results(path) for path in args.compare)
+        for scale, metric, old, new, ratio in compare(before, after):
+            print(f"{scale:>6g}x  {metric:<34} {old:>10.3f} -> {new:>10.3f}  ({ratio:.2f}x)")
+        return
+
+    if args.backend == "memory":
+        make_client: Callable[[], Neo4jClient] = InMemoryGraphClient  # type: ignore[assignment]
+    else:
+        def make_client() -> Neo4jClient:
+            return Neo4jClient(config.NEO4J_URI, config.NEO4J_USER, config.NEO4J_PASSWORD)
+
+    payload = run_suite(
+        make_client,
+        args.scales,
+        backend=args.backend,
+        query_sample=args.queries,
+        trace_memory=args.trace_memory,
+    )
+    if args.json:
+        args.json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.ontology_schema import NodeLabel, RelType
+
+
+@dataclass(frozen=True)
+class DatasetShape:
+    students: int = 2_000
+    courses: int = 200
+    books: int = 400
+    programs: int = 60
+    scholarships: int = 30
+    departments: int = 12
+    enrollments_per_student: int = 6
+    books_per_course: int = 4
+    programs_per_course: int = 3
+    scholarships_per_course: int = 2
+
+    def scaled(self, factor: float) -> "DatasetShape":
+        """Multiply the node counts by ``factor``; per-node degrees stay fixed."""
+        counts = {
+            name: max(1, int(round(getattr(self, name) * factor)))
+            for name in ("students", "courses", "books", "programs", "scholarships", "departments")
+        }
+        return DatasetShape(**{**asdict(self), **counts})
+
+
+# Node counts of the sample graph described in the README (books as in neo4j_loader).
+README_SAMPLE = DatasetShape(
+    students=5_600, courses=260, books=500, programs=100, scholarships=50, departments=20
+)
+
+
+def _ids(prefix: str, count: int, width: int) -> np.ndarray:
+    return np.char.add(prefix, np.char.zfill(np.arange(1, count + 1).astype(str), width))
+
+
+def _edges(
+    rng: np.random.Generator,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    degree: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    # Targets are drawn with replacement; callers drop the duplicate pairs,
+    # so a few nodes end up with slightly fewer than ``degree`` edges.
+    picks = rng.integers(0, len(targets), (len(sources), degree))
+    return np.repeat(sources, degree), targets[picks].ravel()
+
+
+def _relations(
+    from_label: NodeLabel, rel_type: RelType, to_label: NodeLabel, from_ids: np.ndarray, to_ids: np.ndarray
+) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "from_label": from_label.value,
+            "from_id": from_ids,
+            "rel_type": rel_type.value,
+            "to_label": to_label.value,
+            "to_id": to_ids,
+        }
+    )
+
+
+def generate_dataset(out_dir: Path, shape: DatasetShape = DatasetShape(), seed: int = 2024) -> dict[str, int]:
+    """Write a random campus graph in the ``data/`` CSV layout to ``out_dir``.
+
+    Returns the number of rows written per file. The same ``shape`` and
+    ``seed`` always produce the same files.
+    """
+    rng = np.random.default_rng(seed)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    dept_ids = _ids("D", shape.departments, 3)
+    student_ids = _ids("S", shape.students, 8)
+    course_ids = _ids("C", shape.courses, 5)
+    book_ids = _ids("B", shape.books, 6)
+    program_ids = _ids("P", shape.programs, 4)
+    scholarship_ids = _ids("SCH", shape.scholarships, 4)
+
+    frames = {
+        "departments.csv": pd.DataFrame({"dept_id": dept_ids, "name": np.char.add("Department ", dept_ids)}),
+        "students.csv": pd.DataFrame(
+            {
+                "student_id": student_ids,
+                "name": np.char.add("Student ", student_ids),
+                "dept_id": rng.choice(dept_ids, shape.students),
+                "year": rng.integers(1, 5, shape.students),
+                "status": rng.choice(["active", "on_leave", "graduated"], shape.students, p=[0.85, 0.1, 0.05]),
+            }
+        ),
+        "courses.csv": pd.DataFrame(
+            {
+                "course_id": course_ids,
+                "name": np.char.add("Course ", course_ids),
+                "dept_id": rng.choice(dept_ids, shape.courses),
+                "credit": rng.integers(1, 4, shape.courses),
+                "type": rng.choice(["core", "elective"], shape.courses),
+            }
+        ),
+        "books.csv": pd.DataFrame(
+            {
+                "book_id": book_ids,
+                "title": np.char.add("Book ", book_ids),
+                "author": rng.choice(["Kim", "Lee", "Park", "Choi"], shape.books),
+                "topic": rng.choice(["DB", "AI", "Systems", "Math"], shape.books),
+                "available": rng.random(shape.books) < 0.7,
+            }
+        ),
+        "programs.csv": pd.DataFrame(
+            {
+                "program_id": program_ids,
+                "name": np.char.add("Program ", program_ids),
+                "target_dept_id": rng.choice(dept_ids, shape.programs),
+                "skill_tag": rng.choice(["AI", "Career", "Research"], shape.programs),
+            }
+        ),
+        "scholarships.csv": pd.DataFrame(
+            {
+                "scholarship_id": scholarship_ids,
+                "name": np.char.add("Scholarship ", scholarship_ids),
+                "min_gpa": rng.choice([3.0, 3.5, 4.0], shape.scholarships),
+                "required_credit": rng.choice([15, 30, 60], shape.scholarships),
+            }
+        ),
+    }
+
+    course_sources, course_targets = _edges(rng, course_ids, scholarship_ids, shape.scholarships_per_course)
+    relations = pd.concat(
+        [
+            _relations(NodeLabel.STUDENT, RelType.ENROLLED_IN, NodeLabel.COURSE,
+                       *_edges(rng, student_ids, course_ids, shape.enrollments_per_student)),
+            _relations(NodeLabel.COURSE, RelType.USES_BOOK, NodeLabel.BOOK,
+                       *_edges(rng, course_ids, book_ids, shape.books_per_course)),
+            _relations(NodeLabel.COURSE, RelType.RELATED_PROGRAM, NodeLabel.PROGRAM,
+                       *_edges(rng, course_ids, program_ids, shape.programs_per_course)),
+            _relations(NodeLabel.SCHOLARSHIP, RelType.REQUIRES_COURSE, NodeLabel.COURSE,
+                       course_targets, course_sources),
+        ],
+        ignore_index=True,
+    ).drop_duplicates()
+    frames["relations.csv"] = relations
+
+    for filename, frame in frames.items():
+        frame.to_csv(out_dir / filename, index=False)
+    return {filename: len(frame) for filename, frame in frames.items()}
+
+
+__all__ = ["README_SAMPLE", "DatasetShape", "generate_dataset"]
@@ -7,17 +7,47 @@ Requirements:
 
 from __future__ import annotations
 
+import argparse
+import csv
+import json
 import os
 import random
+import threading
+import time
+import zlib
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields, replace
 from itertools import cycle
-from typing import Any, Dict, Iterable, List
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from neo4j import Driver, GraphDatabase
+from neo4j.exceptions import DriverError, Neo4jError
+
+from src import config
+from src.graph.checkpoint import LoadCheckpoint
+from src.graph.neo4j_client import SERVER_COUNTERS, summary_counters
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - only the vectorized generator needs it
+    np = None  # type: ignore[assignment]
 
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "neo4j")
 
+# Shared with src.graph, so every entry point honours the same LOAD_WORKERS.
+LOAD_WORKERS = config.LOAD_WORKERS
+CHECKPOINT_PATH = Path(os.getenv("NEO4J_LOAD_CHECKPOINT", ".sample_load_checkpoint.jsonl"))
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_TARGET_SECONDS = 0.5
+RETRY_BACKOFF = 0.1
+STUDENT_BLOCK_SIZE = 4096
+COURSE_FILL_DRAWS = 16
+
 
 def chunked(seq: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
     """Yield successive chunks from a list."""
@@ -25,12 +55,182 @@ def chunked(seq: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any
         yield seq[i : i + size]
 
 
-def run_batch(session, query: str, rows: List[Dict[str, Any]], batch_size: int = 500) -> None:
-    """Execute a parameterized query in batches."""
+def _is_retryable(exc: Exception) -> bool:
+    return isinstance(exc, (Neo4jError, DriverError)) and exc.is_retryable()
+
+
+def _is_memory_error(exc: Exception) -> bool:
+    # Transaction memory limit, memory pool exhaustion or heap OOM on the server.
+    code = getattr(exc, "code", None) or ""
+    return isinstance(exc, Neo4jError) and any(marker in code for marker in _MEMORY_ERROR_MARKERS)
+
+
+_MEMORY_ERROR_MARKERS = ("MemoryLimit", "MemoryPool", "OutOfMemory")
+
+
+def run_with_retry(
+    session,
+    query: str,
+    rows: List[Dict[str, Any]],
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    *,
+    retry_memory_errors: bool = True,
+    counters: Optional[Dict[str, int]] = None,
+) -> int:
+    """Run one auto-commit batch, retrying transient failures; returns the retries used.
+
+    A failed auto-commit batch is rolled back as a whole, so retrying its
+    CREATEs cannot duplicate anything. With ``retry_memory_errors=False``
+    a server memory error is raised at once, for callers that retry with a
+    smaller batch instead. The server's update counters of the committed
+    batch are added to ``counters`` when given.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            summary = session.run(query, rows=rows).consume()
+            if counters is not None:
+                for name, value in summary_counters(summary).items():
+                    counters[name] = counters.get(name, 0) + value
+            return attempt
+        except Exception as exc:
+            if attempt == max_retries or not _is_retryable(exc):
+                raise
+            if not retry_memory_errors and _is_memory_error(exc):
+                raise
+            time.sleep(RETRY_BACKOFF * (2**attempt) * (1 + random.random()))
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+@dataclass
+class _StatementSize:
+    size: int
+    ceiling: int
+    seconds_per_row: Optional[float] = None
+
+
+class AdaptiveBatchSizer:
+    """Per-statement batch sizes steered toward a target transaction duration.
+
+    After every batch the smoothed seconds-per-row of that statement gives
+    the size that would take ``target_seconds``; the next size moves toward
+    it by at most a factor of two. A server memory error halves the size and
+    caps further growth of that statement there. Thread-safe, so parallel
+    writers of one statement tune it together.
+    """
+
+    def __init__(
+        self,
+        target_seconds: float = DEFAULT_TARGET_SECONDS,
+        initial: int = DEFAULT_BATCH_SIZE,
+        minimum: int = 10,
+        maximum: int = 50_000,
+        smoothing: float = 0.5,
+    ) -> None:
+        if target_seconds <= 0:
+            raise ValueError(f"target_seconds must be positive, got {target_seconds}")
+        if not 0 < minimum <= initial <= maximum:
+            raise ValueError(f"expected 0 < minimum <= initial <= maximum, got {minimum}, {initial}, {maximum}")
+        self.target_seconds = target_seconds
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.smoothing = smoothing
+        self._statements: Dict[str, _StatementSize] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, key: str) -> _StatementSize:
+        state = self._statements.get(key)
+        if state is None:
+            state = self._statements[key] = _StatementSize(self.initial, self.maximum)
+        return state
+
+    def size_for(self, key: str) -> int:
+        with self._lock:
+            return self._state(key).size
+
+    def record(self, key: str, rows: int, elapsed: float) -> None:
+        if rows <= 0:
+            return
+        with self._lock:
+            state = self._state(key)
+            per_row = max(elapsed, 1e-6) / rows
+            if state.seconds_per_row is not None:
+                per_row = self.smoothing * per_row + (1 - self.smoothing) * state.seconds_per_row
+            state.seconds_per_row = per_row
+            ideal = self.target_seconds / per_row
+            size = min(max(ideal, state.size / 2), state.size * 2)
+            state.size = int(min(max(size, self.minimum), state.ceiling))
+
+    def shrink(self, key: str) -> bool:
+        """Halve ``key``'s size after a memory error; False when already at the minimum."""
+        with self._lock:
+            state = self._state(key)
+            if state.size <= self.minimum:
+                return False
+            state.size = max(self.minimum, state.size // 2)
+            state.ceiling = state.size
+            return True
+
+    def sizes(self) -> Dict[str, int]:
+        with self._lock:
+            return {key: state.size for key, state in self._statements.items()}
+
+
+def write_batches(
+    session,
+    query: str,
+    rows: List[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    *,
+    sizer: Optional[AdaptiveBatchSizer] = None,
+    key: Optional[str] = None,
+    max_retries: int = 0,
+    counters: Optional[Dict[str, int]] = None,
+) -> Tuple[int, int]:
+    """Write ``rows`` in batches on ``session``; returns ``(batches, retries)``.
+
+    Without ``sizer`` every batch has ``batch_size`` rows. With it, each
+    batch takes the size tuned for ``key`` (default: the query text), its
+    duration is fed back, and a batch that hits a server memory error is
+    retried in smaller pieces. ``counters`` is passed to :func:`run_with_retry`.
+    """
+    key = key or query
+    batches = 0
+    retries = 0
+    offset = 0
+    while offset < len(rows):
+        size = sizer.size_for(key) if sizer is not None else batch_size
+        batch = rows[offset : offset + size]
+        started = time.perf_counter()
+        try:
+            attempts = run_with_retry(
+                session, query, batch, max_retries, retry_memory_errors=sizer is None, counters=counters
+            )
+        except Exception as exc:
+            if sizer is None or not _is_memory_error(exc) or not sizer.shrink(key):
+                raise
+            retries += 1
+            continue
+        if sizer is not None and not attempts:
+            sizer.record(key, len(batch), time.perf_counter() - started)
+        retries += attempts
+        batches += 1
+        offset += len(batch)
+    return batches, retries
+
+
+def run_batch(
+    session,
+    query: str,
+    rows: List[Dict[str, Any]],
+    batch_size: int = 500,
+    *,
+    sizer: Optional[AdaptiveBatchSizer] = None,
+) -> None:
+    """Execute a parameterized query in batches, adaptively sized when ``sizer`` is given."""
     if not rows:
         return
-    for batch in chunked(rows, batch_size):
-        session.run(query, rows=batch)
+    write_batches(session, query, rows, batch_size, sizer=sizer)
 
 
 def get_driver() -> Driver:
@@ -71,9 +271,475 @@ def create_schema(driver: Driver) -> None:
     print("Ensured schema constraints are in place.")
 
 
-def load_sample_data(driver: Driver) -> None:
-    """Generate a large synthetic campus ontology and load it into Neo4j."""
-    random.seed(2024)
+@dataclass(frozen=True)
+class SampleSizes:
+    """Entity counts for the synthetic campus; the defaults are the README sample."""
+
+    students: int = 5600
+    courses: int = 260
+    books: int = 500
+    programs: int = 100
+    scholarships: int = 50
+    major_tracks: int = 30
+    professors_per_department: int = 4
+
+    def scaled(self, factor: float) -> "SampleSizes":
+        """Multiply every count by ``factor`` (colleges, departments and terms stay fixed)."""
+        if factor <= 0:
+            raise ValueError(f"scale factor must be positive, got {factor}")
+        return SampleSizes(**{name: max(1, round(value * factor)) for name, value in asdict(self).items()})
+
+
+@dataclass(frozen=True)
+class NodeFamily:
+    """A generated node family: its labels and the row keys stored as properties.
+
+    The first label names the family in relationship endpoints and import ID
+    spaces. Every property reads the row key of the same name unless
+    ``row_keys`` maps it to another one.
+    """
+
+    labels: Tuple[str, ...]
+    properties: Tuple[str, ...]
+    row_keys: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def label(self) -> str:
+        return self.labels[0]
+
+    def columns(self) -> List[Tuple[str, str]]:
+        """``(property, row key)`` pairs in declaration order."""
+        return [(name, self.row_keys.get(name, name)) for name in self.properties]
+
+
+@dataclass(frozen=True)
+class RelationshipFamily:
+    """A generated relationship family: ``(label, row key)`` of both endpoints and the stored properties."""
+
+    type: str
+    start: Tuple[str, str]
+    end: Tuple[str, str]
+    properties: Dict[str, str] = field(default_factory=dict)  # property -> row key
+
+
+NODE_FAMILIES: Dict[str, NodeFamily] = {
+    "colleges": NodeFamily(("College",), ("id", "name", "type", "dean")),
+    "departments": NodeFamily(("Department",), ("id", "name", "code", "building")),
+    "major_tracks": NodeFamily(
+        ("MajorTrack", "AcademicInfo"),
+        ("id", "name", "focusArea", "minYear", "maxYear", "departmentId"),
+        row_keys={"departmentId": "department_id"},
+    ),
+    "terms": NodeFamily(
+        ("Term", "AcademicInfo"),
+        ("id", "name", "year", "season", "sequence", "startDate", "endDate", "yearBand"),
+    ),
+    "events": NodeFamily(
+        ("AcademicEvent", "AcademicInfo"),
+        ("id", "name", "eventType", "termId", "startWeek", "endWeek", "yearFocus"),
+    ),
+    "books": NodeFamily(
+        ("Book", "ScholarlyResource"),
+        ("id", "name", "title", "author", "topic", "available", "callNumber", "publisher"),
+    ),
+    "programs": NodeFamily(
+        ("NonCurricularProgram", "AcademicInfo"),
+        ("id", "name", "category", "competency", "minYear", "maxYear", "hours", "delivery", "departmentId"),
+    ),
+    "professors": NodeFamily(
+        ("Professor", "AcademicActor"),
+        ("id", "name", "title", "email", "office", "departmentId"),
+    ),
+    "courses": NodeFamily(
+        ("Course", "AcademicInfo"),
+        (
+            "id",
+            "name",
+            "courseCode",
+            "credits",
+            "category",
+            "yearLevel",
+            "semester",
+            "deliveryMode",
+            "departmentId",
+            "termId",
+        ),
+    ),
+    "scholarships": NodeFamily(
+        ("Scholarship", "AcademicInfo"),
+        ("id", "name", "category", "minGpa", "minCredits", "amount", "targetYearMin", "targetYearMax", "status"),
+    ),
+    "students": NodeFamily(
+        ("Student", "AcademicActor"),
+        (
+            "id",
+            "name",
+            "studentNumber",
+            "yearLevel",
+            "gpa",
+            "entryYear",
+            "creditsEarned",
+            "requiredCredits",
+            "status",
+            "currentTermId",
+        ),
+    ),
+}
+
+RELATIONSHIP_FAMILIES: Dict[str, RelationshipFamily] = {
+    "department_college": RelationshipFamily("BELONGS_TO", ("Department", "dept_id"), ("College", "college_id")),
+    "track_department": RelationshipFamily("BELONGS_TO", ("MajorTrack", "track_id"), ("Department", "dept_id")),
+    "program_track": RelationshipFamily(
+        "SUITABLE_FOR_MAJOR", ("NonCurricularProgram", "program_id"), ("MajorTrack", "track_id")
+    ),
+    "program_event": RelationshipFamily(
+        "SUITABLE_FOR_YEAR",
+        ("NonCurricularProgram", "program_id"),
+        ("AcademicEvent", "event_id"),
+        {"targetYear": "yearFocus"},
+    ),
+    "course_professor": RelationshipFamily("TAUGHT_BY", ("Course", "course_id"), ("Professor", "professor_id")),
+    "course_term": RelationshipFamily("HELD_IN_TERM", ("Course", "course_id"), ("Term", "term_id")),
+    "course_book": RelationshipFamily("HAS_RECOMMENDED_BOOK", ("Course", "course_id"), ("Book", "book_id")),
+    "course_program": RelationshipFamily(
+        "RELATED_TO_PROGRAM", ("Course", "course_id"), ("NonCurricularProgram", "program_id")
+    ),
+    "course_prereq": RelationshipFamily("HAS_PREREQUISITE", ("Course", "course_id"), ("Course", "prereq_id")),
+    "event_course": RelationshipFamily("RELATED_TO_COURSE", ("AcademicEvent", "event_id"), ("Course", "course_id")),
+    "scholarship_program": RelationshipFamily(
+        "REQUIRES_PROGRAM", ("Scholarship", "scholarship_id"), ("NonCurricularProgram", "program_id")
+    ),
+    "scholarship_course": RelationshipFamily(
+        "REQUIRES_COURSE", ("Scholarship", "scholarship_id"), ("Course", "course_id")
+    ),
+    "scholarship_track": RelationshipFamily(
+        "AVAILABLE_FOR_MAJOR", ("Scholarship", "scholarship_id"), ("MajorTrack", "track_id")
+    ),
+    "scholarship_term": RelationshipFamily("AVAILABLE_IN_TERM", ("Scholarship", "scholarship_id"), ("Term", "term_id")),
+    "student_track": RelationshipFamily("MAJOR_IN", ("Student", "student_id"), ("MajorTrack", "track_id")),
+    "student_course": RelationshipFamily("ENROLLED_IN", ("Student", "student_id"), ("Course", "course_id")),
+    "student_program": RelationshipFamily(
+        "PARTICIPATED_IN", ("Student", "student_id"), ("NonCurricularProgram", "program_id"), {"hours": "hours"}
+    ),
+    "student_scholarship": RelationshipFamily(
+        "RECEIVED_SCHOLARSHIP", ("Student", "student_id"), ("Scholarship", "scholarship_id"), {"term": "year"}
+    ),
+}
+
+
+def _cypher_map(columns: Iterable[Tuple[str, str]]) -> str:
+    return "{" + ", ".join(f"{name}: row.{key}" for name, key in columns) + "}"
+
+
+def node_query(spec: NodeFamily, *, merge: bool = False) -> str:
+    """``UNWIND`` statement creating ``spec``'s nodes, or merging them on ``id`` with ``merge``."""
+    labels = "".join(f":{label}" for label in spec.labels)
+    if merge:
+        return f"UNWIND $rows AS row\nMERGE (n{labels} {{id: row.id}})\nSET n += {_cypher_map(spec.columns())}"
+    return f"UNWIND $rows AS row\nCREATE ({labels} {_cypher_map(spec.columns())})"
+
+
+def relationship_query(spec: RelationshipFamily, *, merge: bool = False) -> str:
+    """``UNWIND`` statement matching both endpoints by ``id`` and creating (or merging) the relationship."""
+    (start_label, start_key), (end_label, end_key) = spec.start, spec.end
+    properties = f" {_cypher_map(spec.properties.items())}" if spec.properties else ""
+    return (
+        "UNWIND $rows AS row\n"
+        f"MATCH (a:{start_label} {{id: row.{start_key}}})\n"
+        f"MATCH (b:{end_label} {{id: row.{end_key}}})\n"
+        f"{'MERGE' if merge else 'CREATE'} (a)-[:{spec.type}{properties}]->(b)"
+    )
+
+
+def _node_family_by_label() -> Dict[str, str]:
+    families = {spec.label: family for family, spec in NODE_FAMILIES.items()}
+    for family, spec in RELATIONSHIP_FAMILIES.items():
+        for label, _key in (spec.start, spec.end):
+            if label not in families:
+                raise ValueError(f"relationship family {family} references undeclared label {label}")
+    return families
+
+
+NODE_QUERIES: Dict[str, str] = {family: node_query(spec) for family, spec in NODE_FAMILIES.items()}
+RELATIONSHIP_QUERIES: Dict[str, str] = {
+    family: relationship_query(spec) for family, spec in RELATIONSHIP_FAMILIES.items()
+}
+FAMILY_QUERIES: Dict[str, str] = {**NODE_QUERIES, **RELATIONSHIP_QUERIES}
+
+# (label, row key) of the start and end node each relationship row matches.
+RELATIONSHIP_ENDPOINTS: Dict[str, Tuple[Tuple[str, str], Tuple[str, str]]] = {
+    family: (spec.start, spec.end) for family, spec in RELATIONSHIP_FAMILIES.items()
+}
+
+# The load DAG: the node families each relationship family reads. Edges
+# between families that share a label are ordered by ParallelWriter.
+_LABEL_FAMILIES = _node_family_by_label()
+RELATIONSHIP_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    family: tuple(dict.fromkeys(_LABEL_FAMILIES[label] for label, _key in (spec.start, spec.end)))
+    for family, spec in RELATIONSHIP_FAMILIES.items()
+}
+
+Batch = Tuple[str, List[Dict[str, Any]]]
+ProgressCallback = Callable[[str, "FamilyReport"], None]
+
+
+def _family_batches(families: Dict[str, List[Dict[str, Any]]], batch_size: int) -> Iterator[Batch]:
+    """Yield every family's rows in ``batch_size`` slices, in dict order."""
+    for family, rows in families.items():
+        for batch in chunked(rows, batch_size):
+            yield family, batch
+
+
+def _smallest_key_columns(keys: "np.ndarray", width: int) -> "np.ndarray":
+    """Per row, the column indexes of the ``width`` smallest keys, smallest first.
+
+    With uniform keys any prefix of a row is a sample without replacement, so
+    one call samples every row at once; padding keyed ``inf`` sorts last.
+    """
+    width = min(width, keys.shape[1])
+    if width < keys.shape[1]:
+        columns = np.argpartition(keys, width - 1, axis=1)[:, :width]
+    else:
+        columns = np.broadcast_to(np.arange(width), keys.shape)
+    order = np.take_along_axis(keys, columns, axis=1).argsort(axis=1)
+    return np.take_along_axis(columns, order, axis=1)
+
+
+def _vectorized_student_batches(
+    seed: int,
+    count: int,
+    batch_size: int,
+    *,
+    major_tracks: List[Dict[str, Any]],
+    terms: List[Dict[str, Any]],
+    course_lookup: Dict[str, Dict[str, Any]],
+    course_pools: Dict[str, List[str]],
+    programs_by_track: Dict[str, List[str]],
+    program_lookup: Dict[str, Dict[str, Any]],
+    scholarships_by_track_year: Dict[Tuple[str, int], List[Dict[str, Any]]],
+    names: Tuple[List[str], List[str]],
+) -> Iterator[Batch]:
+    """Draw students block by block with NumPy instead of per-student ``random`` calls.
+
+    The distributions match the default path but not its exact values. Each
+    block of ``STUDENT_BLOCK_SIZE`` students has its own generator seeded
+    from ``(seed, block)``, so the output does not depend on ``batch_size``.
+    """
+    if np is None:
+        raise RuntimeError("Vectorized sample generation requires numpy; install it or drop --vectorized")
+
+    last_names = np.array(names[0])
+    first_names = np.array(names[1])
+    years = np.array([1, 2, 3, 4])
+    term_index = {term["id"]: idx for idx, term in enumerate(terms)}
+    band_terms = [
+        np.array([idx for idx, term in enumerate(terms) if term["yearBand"] == year] or range(len(terms)))
+        for year in years.tolist()
+    ]
+    track_ids = [track["id"] for track in major_tracks]
+
+    # Course pools (a department's courses, or all courses as the fallback)
+    # laid out back to back, each sorted by term, so both a pool and its
+    # (pool, term) group are contiguous ranges of ``pool_courses``.
+    all_course_ids = list(course_lookup)
+    pool_of_track = np.empty(len(major_tracks), dtype=np.int64)
+    pools: List[List[str]] = []
+    pool_index: Dict[Optional[str], int] = {}
+    for position, track in enumerate(major_tracks):
+        pool_id = track["department_id"] if track["department_id"] in course_pools else None
+        if pool_id not in pool_index:
+            pool_index[pool_id] = len(pools)
+            pools.append(
+                sorted(course_pools.get(pool_id, all_course_ids), key=lambda cid: term_index[course_lookup[cid]["termId"]])
+            )
+        pool_of_track[position] = pool_index[pool_id]
+    pool_courses = np.array([course_id for pool in pools for course_id in pool], dtype=object)
+    pool_size = np.array([len(pool) for pool in pools], dtype=np.int64)
+    pool_start = np.concatenate([[0], np.cumsum(pool_size)[:-1]])
+    term_size = np.zeros((len(pools), len(terms)), dtype=np.int64)
+    for position, pool in enumerate(pools):
+        for course_id in pool:
+            term_size[position, term_index[course_lookup[course_id]["termId"]]] += 1
+    term_start = pool_start[:, None] + np.cumsum(term_size, axis=1) - term_size
+
+    # Programs per track, padded to one matrix; padding never gets picked.
+    program_counts = np.array([len(programs_by_track.get(track_id, [])) for track_id in track_ids])
+    program_width = max(int(program_counts.max()), 1)
+    program_ids = np.full((len(track_ids), program_width), "", dtype=object)
+    program_hours = np.zeros((len(track_ids), program_width), dtype=np.int64)
+    for position, track_id in enumerate(track_ids):
+        for column, program_id in enumerate(programs_by_track.get(track_id, [])):
+            program_ids[position, column] = program_id
+            program_hours[position, column] = program_lookup[program_id]["hours"]
+    program_padding = np.arange(program_width)[None, :] >= program_counts[:, None]
+
+    # Scholarships per (track, year) group, sorted by GPA threshold in cents
+    # and offset by group, so a single searchsorted counts every student's
+    # eligible candidates.
+    scholarship_ids: List[str] = []
+    scholarship_keys: List[int] = []
+    group_starts = [0]
+    for track_id in track_ids:
+        for year in years.tolist():
+            candidates = sorted(
+                scholarships_by_track_year.get((track_id, year), []), key=lambda sch: sch["minGpa"]
+            )
+            group = len(group_starts) - 1
+            scholarship_ids.extend(sch["id"] for sch in candidates)
+            scholarship_keys.extend(group * 1000 + round((sch["minGpa"] - 0.1) * 100) for sch in candidates)
+            group_starts.append(len(scholarship_ids))
+    scholarship_key_array = np.array(scholarship_keys, dtype=np.int64)
+    group_start_array = np.array(group_starts, dtype=np.int64)
+
+    students: List[Dict[str, Any]] = []
+    track_pairs: List[Dict[str, Any]] = []
+    course_pairs: List[Dict[str, Any]] = []
+    program_pairs: List[Dict[str, Any]] = []
+    scholarship_pairs: List[Dict[str, Any]] = []
+
+    def flush() -> Iterator[Batch]:
+        yield from _family_batches(
+            {
+                "students": students,
+                "student_track": track_pairs,
+                "student_course": course_pairs,
+                "student_program": program_pairs,
+                "student_scholarship": scholarship_pairs,
+            },
+            batch_size,
+        )
+        for rows in (students, track_pairs, course_pairs, program_pairs, scholarship_pairs):
+            rows.clear()
+
+    for block, start in enumerate(range(0, count, STUDENT_BLOCK_SIZE)):
+        rng = np.random.default_rng([seed, block])
+        n = min(STUDENT_BLOCK_SIZE, count - start)
+
+        track = rng.integers(0, len(major_tracks), n)
+        year = rng.choice(years, size=n, p=[0.27, 0.26, 0.24, 0.23])
+        term = np.empty(n, dtype=np.int64)
+        term_draw = rng.random(n)
+        for band, candidates in zip(years.tolist(), band_terms):
+            in_band = year == band
+            term[in_band] = candidates[(term_draw[in_band] * len(candidates)).astype(np.int64)]
+        graduating = (year == 4) & (rng.random(n) < 0.35)
+        credits = rng.integers(year * 25, year * 35 + 1)
+        credits = np.where(graduating, np.maximum(credits, 120 + rng.integers(0, 26, n)), credits)
+        gpa = np.round(rng.uniform(2.0, 4.3, n), 2)
+        entry_year = rng.integers(2018, 2024, n)
+        student_names = np.char.add(
+            np.char.add(last_names[rng.integers(0, len(last_names), n)], " "),
+            first_names[rng.integers(0, len(first_names), n)],
+        )
+
+        # Courses: two distinct draws from the student's (pool, term) group,
+        # then COURSE_FILL_DRAWS draws from the whole pool; the row loop keeps
+        # the first distinct ones, as the default path's set does.
+        pool = pool_of_track[track]
+        size = pool_size[pool]
+        group_size = term_size[pool, term]
+        group_start = term_start[pool, term]
+        wanted_courses = np.minimum(rng.integers(4, 7, n), size).tolist()
+        first = (rng.random(n) * group_size).astype(np.int64)
+        second = (rng.random(n) * np.maximum(group_size - 1, 0)).astype(np.int64)
+        second += second >= first
+        fill = pool_start[pool][:, None] + (rng.random((n, COURSE_FILL_DRAWS)) * size[:, None]).astype(np.int64)
+        candidates = np.column_stack([group_start + second, group_start + first, fill])
+        candidate_courses = pool_courses[np.minimum(candidates, len(pool_courses) - 1)].tolist()
+        # A group of one only contributes ``first``; an empty group nothing.
+        skip_columns = (2 - np.minimum(group_size, 2)).tolist()
+
+        keys = np.where(program_padding[track], np.inf, rng.random((n, program_width)))
+        columns = _smallest_key_columns(keys, 3)
+        program_limit = np.minimum(rng.integers(1, 4, n), program_counts[track]).tolist()
+        picked_programs = program_ids[track[:, None], columns].tolist()
+        picked_hours = np.minimum(
+            program_hours[track[:, None], columns], rng.integers(8, 21, columns.shape)
+        ).tolist()
+
+        group = track * len(years) + (year - 1)
+        group_start = group_start_array[group]
+        eligible = (
+            np.searchsorted(scholarship_key_array, group * 1000 + np.round(gpa * 100).astype(np.int64), side="right")
+            - group_start
+        )
+        applies = (rng.random(n) < 0.22) & (eligible > 0)
+        scholarship_pick = (group_start + (rng.random(n) * eligible).astype(np.int64)).tolist()
+        applies = applies.tolist()
+
+        columns = zip(
+            track.tolist(),
+            year.tolist(),
+            term.tolist(),
+            graduating.tolist(),
+            credits.tolist(),
+            gpa.tolist(),
+            entry_year.tolist(),
+            student_names.tolist(),
+        )
+        for offset, (track_pos, year_level, term_pos, is_graduating, earned, score, entry, name) in enumerate(columns):
+            idx = start + offset
+            student_id = f"STD-{idx:05}"
+            students.append(
+                {
+                    "id": student_id,
+                    "name": name,
+                    "studentNumber": 20180000 + idx,
+                    "yearLevel": year_level,
+                    "gpa": score,
+                    "entryYear": entry,
+                    "creditsEarned": earned,
+                    "requiredCredits": 130,
+                    "status": "graduating" if is_graduating else "active",
+                    "currentTermId": terms[term_pos]["id"],
+                }
+            )
+            track_pairs.append({"student_id": student_id, "track_id": track_ids[track_pos]})
+            chosen = list(dict.fromkeys(candidate_courses[offset][skip_columns[offset]:]))
+            wanted = wanted_courses[offset]
+            if len(chosen) < wanted:  # rare: tiny pools where the fill draws kept repeating
+                chosen.extend(cid for cid in pools[pool_of_track[track_pos]] if cid not in chosen)
+            for course_id in chosen[:wanted]:
+                course_pairs.append({"student_id": student_id, "course_id": course_id})
+            limit = program_limit[offset]
+            for program_id, hours in zip(picked_programs[offset][:limit], picked_hours[offset][:limit]):
+                program_pairs.append({"student_id": student_id, "program_id": program_id, "hours": hours})
+            if applies[offset]:
+                scholarship_pairs.append(
+                    {
+                        "student_id": student_id,
+                        "scholarship_id": scholarship_ids[scholarship_pick[offset]],
+                        "year": terms[term_pos]["name"],
+                    }
+                )
+
+        if len(students) >= batch_size:
+            yield from flush()
+    yield from flush()
+
+
+def generate_sample_data(
+    sizes: SampleSizes = SampleSizes(),
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    seed: int = 2024,
+    *,
+    vectorized: bool = False,
+) -> Iterator[Batch]:
+    """Yield ``(family, rows)`` batches of a synthetic campus ontology.
+
+    The catalogue (tracks, courses, programs, scholarships, ...) is yielded
+    first; students and their relationships follow every ``batch_size``
+    students, so memory no longer grows with the student count. Every batch
+    only references nodes yielded earlier. The default sizes and seed
+    reproduce the README sample graph.
+
+    ``vectorized=True`` draws the students with NumPy in blocks: much faster
+    at large scales and still deterministic per seed, but a different sample
+    than the default path.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    rng = random.Random(seed)
 
     colleges = [
         {"id": "COL-ENG", "name": "College of Engineering", "type": "Engineering", "dean": "Prof. Seo"},
@@ -127,8 +793,8 @@ def load_sample_data(driver: Driver) -> None:
     track_id_counter = 1
     for dept in departments:
         topic = track_topics[(track_id_counter - 1) % len(track_topics)]
-        min_year = random.randint(1, 2)
-        max_year = random.randint(min_year + 1, 4)
+        min_year = rng.randint(1, 2)
+        max_year = rng.randint(min_year + 1, 4)
         major_tracks.append(
             {
                 "id": f"TRK-{track_id_counter:03}",
@@ -141,11 +807,11 @@ def load_sample_data(driver: Driver) -> None:
         )
         track_id_counter += 1
     dept_cycle = cycle(departments)
-    while len(major_tracks) < 30:
+    while len(major_tracks) < sizes.major_tracks:
         dept = next(dept_cycle)
-        topic = random.choice(track_topics)
-        min_year = random.randint(1, 3)
-        max_year = random.randint(min_year, 4)
+        topic = rng.choice(track_topics)
+        min_year = rng.randint(1, 3)
+        max_year = rng.randint(min_year, 4)
         major_tracks.append(
             {
                 "id": f"TRK-{track_id_counter:03}",
@@ -188,7 +854,7 @@ def load_sample_data(driver: Driver) -> None:
     events: List[Dict[str, Any]] = []
     for term in terms:
         for name, start_week, end_week, fixed_year, abbr in event_templates:
-            year_focus = fixed_year if fixed_year else random.randint(1, 4)
+            year_focus = fixed_year if fixed_year else rng.randint(1, 4)
             events.append(
                 {
                     "id": f"EVT-{term['id']}-{abbr}",
@@ -206,10 +872,10 @@ def load_sample_data(driver: Driver) -> None:
     book_topics = ["AI", "Networks", "Databases", "Robotics", "Economics", "Marketing", "Finance", "Literature", "Mathematics", "Chemistry"]
     publishers = ["CBNU Press", "Orion Publishing", "Campus House", "Scholarly Hub"]
     books: List[Dict[str, Any]] = []
-    for idx in range(500):
-        topic = random.choice(book_topics)
+    for idx in range(sizes.books):
+        topic = rng.choice(book_topics)
         title = f"{topic} Insights Vol {idx % 25 + 1}"
-        author = f"{random.choice(last_names)} {random.choice(first_names)}"
+        author = f"{rng.choice(last_names)} {rng.choice(first_names)}"
         books.append(
             {
                 "id": f"BOOK-{idx:04}",
@@ -217,9 +883,9 @@ def load_sample_data(driver: Driver) -> None:
                 "title": title,
                 "author": author,
                 "topic": topic,
-                "available": random.random() > 0.25,
+                "available": rng.random() > 0.25,
                 "callNumber": f"{topic[:3].upper()}-{idx:04}",
-                "publisher": random.choice(publishers),
+                "publisher": rng.choice(publishers),
             }
         )
 
@@ -233,26 +899,26 @@ def load_sample_data(driver: Driver) -> None:
 
     def build_program(track: Dict[str, Any]) -> Dict[str, Any]:
         nonlocal program_id_counter
-        min_year = random.randint(1, 3)
-        max_year = random.randint(min_year, 4)
+        min_year = rng.randint(1, 3)
+        max_year = rng.randint(min_year, 4)
         event_candidates = [e for year in range(min_year, max_year + 1) for e in events_by_year.get(year, [])]
         if not event_candidates:
             event_candidates = events
-        selected_events = random.sample(event_candidates, k=min(2, len(event_candidates)))
+        selected_events = rng.sample(event_candidates, k=min(2, len(event_candidates)))
         track_ids = [track["id"]]
-        if random.random() < 0.4:
-            extra_track = random.choice(major_tracks)["id"]
+        if rng.random() < 0.4:
+            extra_track = rng.choice(major_tracks)["id"]
             if extra_track not in track_ids:
                 track_ids.append(extra_track)
         program = {
             "id": f"PRG-{program_id_counter:03}",
-            "name": f"{random.choice(program_categories)} Program {program_id_counter:02}",
-            "category": random.choice(program_categories),
-            "competency": random.choice(competencies),
+            "name": f"{rng.choice(program_categories)} Program {program_id_counter:02}",
+            "category": rng.choice(program_categories),
+            "competency": rng.choice(competencies),
             "minYear": min_year,
             "maxYear": max_year,
-            "hours": random.randint(12, 40),
-            "delivery": random.choice(["Online", "On-site", "Hybrid"]),
+            "hours": rng.randint(12, 40),
+            "delivery": rng.choice(["Online", "On-site", "Hybrid"]),
             "track_ids": track_ids,
             "departmentId": track["department_id"],
             "event_ids": [evt["id"] for evt in selected_events],
@@ -262,22 +928,22 @@ def load_sample_data(driver: Driver) -> None:
 
     for track in major_tracks:
         programs.append(build_program(track))
-    while len(programs) < 100:
-        programs.append(build_program(random.choice(major_tracks)))
+    while len(programs) < sizes.programs:
+        programs.append(build_program(rng.choice(major_tracks)))
 
     professors: List[Dict[str, Any]] = []
     professor_id = 0
     for dept in departments:
-        for _ in range(4):
+        for _ in range(sizes.professors_per_department):
             professor_id += 1
-            name = f"{random.choice(last_names)} {random.choice(first_names)}"
+            name = f"{rng.choice(last_names)} {rng.choice(first_names)}"
             professors.append(
                 {
                     "id": f"PROF-{professor_id:03}",
                     "name": name,
-                    "title": random.choice(["Assistant Professor", "Associate Professor", "Professor"]),
+                    "title": rng.choice(["Assistant Professor", "Associate Professor", "Professor"]),
                     "email": f"{name.lower().replace(' ', '.')}.{professor_id}@cbnu.ac.kr",
-                    "office": f"{dept['code']}-{random.randint(200, 450)}",
+                    "office": f"{dept['code']}-{rng.randint(200, 450)}",
                     "departmentId": dept["id"],
                 }
             )
@@ -306,24 +972,25 @@ def load_sample_data(driver: Driver) -> None:
     for event in events:
         events_by_term.setdefault(event["termId"], []).append(event["id"])
     course_counter = 0
+    courses_per_department = min(12, sizes.courses // len(departments))
     book_ids = [b["id"] for b in books]
     for dept in departments:
-        for _ in range(12):
-            prof = random.choice(professors_by_dept[dept["id"]])
+        for _ in range(courses_per_department):
+            prof = rng.choice(professors_by_dept[dept["id"]])
             term = terms[(course_counter + len(courses)) % len(terms)]
             course_id = f"COURSE-{course_counter:04}"
             course_counter += 1
-            topic = random.choice(course_topics)
-            credits = random.choice([2, 3, 3, 4])
+            topic = rng.choice(course_topics)
+            credits = rng.choice([2, 3, 3, 4])
             course = {
                 "id": course_id,
-                "name": f"{topic} for {dept['code']} {random.randint(1, 4)}",
+                "name": f"{topic} for {dept['code']} {rng.randint(1, 4)}",
                 "courseCode": f"{dept['code']}{100 + (course_counter % 400)}",
                 "credits": credits,
-                "category": random.choice(["core", "elective"]),
-                "yearLevel": random.randint(1, 4),
+                "category": rng.choice(["core", "elective"]),
+                "yearLevel": rng.randint(1, 4),
                 "semester": term["season"],
-                "deliveryMode": random.choice(["In-person", "Blended", "Online"]),
+                "deliveryMode": rng.choice(["In-person", "Blended", "Online"]),
                 "departmentId": dept["id"],
                 "termId": term["id"],
             }
@@ -333,37 +1000,37 @@ def load_sample_data(driver: Driver) -> None:
             course_professor_pairs.append({"course_id": course_id, "professor_id": prof["id"]})
             course_term_pairs.append({"course_id": course_id, "term_id": term["id"]})
 
-            if len(dept_courses[dept["id"]]) > 2 and random.random() < 0.5:
-                prereq = random.choice(dept_courses[dept["id"]][:-1])
+            if len(dept_courses[dept["id"]]) > 2 and rng.random() < 0.5:
+                prereq = rng.choice(dept_courses[dept["id"]][:-1])
                 course_prereq_pairs.append({"course_id": course_id, "prereq_id": prereq})
 
-            rec_books = random.sample(book_ids, k=random.randint(1, 3))
+            rec_books = rng.sample(book_ids, k=min(len(book_ids), rng.randint(1, 3)))
             for book_id in rec_books:
                 course_book_pairs.append({"course_id": course_id, "book_id": book_id})
 
-            program_choices = programs_by_dept.get(dept["id"]) or [random.choice(programs)["id"]]
-            selected_programs = random.sample(
-                program_choices, k=min(len(program_choices), random.randint(1, 2))
+            program_choices = programs_by_dept.get(dept["id"]) or [rng.choice(programs)["id"]]
+            selected_programs = rng.sample(
+                program_choices, k=min(len(program_choices), rng.randint(1, 2))
             )
             for program_id in selected_programs:
                 course_program_pairs.append({"course_id": course_id, "program_id": program_id})
             course_lookup[course_id]["program_ids"] = selected_programs
 
-    while len(courses) < 260:
-        dept = random.choice(departments)
-        prof = random.choice(professors_by_dept[dept["id"]])
-        term = random.choice(terms)
+    while len(courses) < sizes.courses:
+        dept = rng.choice(departments)
+        prof = rng.choice(professors_by_dept[dept["id"]])
+        term = rng.choice(terms)
         course_id = f"COURSE-{course_counter:04}"
         course_counter += 1
         course = {
             "id": course_id,
-            "name": f"Advanced {random.choice(course_topics)} {course_counter}",
+            "name": f"Advanced {rng.choice(course_topics)} {course_counter}",
             "courseCode": f"{dept['code']}{100 + (course_counter % 400)}",
-            "credits": random.choice([3, 4]),
-            "category": random.choice(["core", "elective"]),
-            "yearLevel": random.randint(2, 4),
+            "credits": rng.choice([3, 4]),
+            "category": rng.choice(["core", "elective"]),
+            "yearLevel": rng.randint(2, 4),
             "semester": term["season"],
-            "deliveryMode": random.choice(["In-person", "Blended"]),
+            "deliveryMode": rng.choice(["In-person", "Blended"]),
             "departmentId": dept["id"],
             "termId": term["id"],
         }
@@ -372,16 +1039,16 @@ def load_sample_data(driver: Driver) -> None:
         dept_courses.setdefault(dept["id"], []).append(course_id)
         course_professor_pairs.append({"course_id": course_id, "professor_id": prof["id"]})
         course_term_pairs.append({"course_id": course_id, "term_id": term["id"]})
-        rec_books = random.sample(book_ids, k=random.randint(1, 3))
+        rec_books = rng.sample(book_ids, k=min(len(book_ids), rng.randint(1, 3)))
         for book_id in rec_books:
             course_book_pairs.append({"course_id": course_id, "book_id": book_id})
-        program_choices = programs_by_dept.get(dept["id"]) or [random.choice(programs)["id"]]
-        selected_programs = random.sample(program_choices, k=1)
+        program_choices = programs_by_dept.get(dept["id"]) or [rng.choice(programs)["id"]]
+        selected_programs = rng.sample(program_choices, k=1)
         for program_id in selected_programs:
             course_program_pairs.append({"course_id": course_id, "program_id": program_id})
         course_lookup[course_id]["program_ids"] = selected_programs
         if len(dept_courses[dept["id"]]) > 2:
-            prereq = random.choice(dept_courses[dept["id"]][:-1])
+            prereq = rng.choice(dept_courses[dept["id"]][:-1])
             course_prereq_pairs.append({"course_id": course_id, "prereq_id": prereq})
 
     event_course_pairs: List[Dict[str, str]] = []
@@ -389,7 +1056,7 @@ def load_sample_data(driver: Driver) -> None:
         event_candidates = events_by_term.get(course["termId"], [])
         if not event_candidates:
             continue
-        selected_events = random.sample(event_candidates, k=min(2, len(event_candidates)))
+        selected_events = rng.sample(event_candidates, k=min(2, len(event_candidates)))
         for event_id in selected_events:
             event_course_pairs.append({"event_id": event_id, "course_id": course["id"]})
 
@@ -398,23 +1065,23 @@ def load_sample_data(driver: Driver) -> None:
     scholarship_program_pairs: List[Dict[str, str]] = []
     scholarship_track_pairs: List[Dict[str, str]] = []
     scholarship_term_pairs: List[Dict[str, str]] = []
-    for idx in range(50):
-        track_sample = random.sample(major_tracks, k=random.randint(1, 3))
-        program_sample = random.sample(programs, k=random.randint(1, 2))
-        course_sample = random.sample(courses, k=random.randint(1, 3))
-        term_sample = random.sample(terms, k=random.randint(1, 2))
-        min_year = random.randint(1, 3)
-        max_year = random.randint(min_year, 4)
+    for idx in range(sizes.scholarships):
+        track_sample = rng.sample(major_tracks, k=min(len(major_tracks), rng.randint(1, 3)))
+        program_sample = rng.sample(programs, k=min(len(programs), rng.randint(1, 2)))
+        course_sample = rng.sample(courses, k=min(len(courses), rng.randint(1, 3)))
+        term_sample = rng.sample(terms, k=rng.randint(1, 2))
+        min_year = rng.randint(1, 3)
+        max_year = rng.randint(min_year, 4)
         scholarship = {
             "id": f"SCH-{idx:03}",
-            "name": f"{random.choice(['Merit', 'Global', 'Innovation', 'Future'])} Scholarship {idx:02}",
-            "category": random.choice(["Merit", "Need-based", "Research", "Global"]),
-            "minGpa": round(random.uniform(2.7, 3.9), 2),
-            "minCredits": random.choice([30, 45, 60, 90, 120]),
-            "amount": random.choice([500000, 800000, 1000000, 1500000]),
+            "name": f"{rng.choice(['Merit', 'Global', 'Innovation', 'Future'])} Scholarship {idx:02}",
+            "category": rng.choice(["Merit", "Need-based", "Research", "Global"]),
+            "minGpa": round(rng.uniform(2.7, 3.9), 2),
+            "minCredits": rng.choice([30, 45, 60, 90, 120]),
+            "amount": rng.choice([500000, 800000, 1000000, 1500000]),
             "targetYearMin": min_year,
             "targetYearMax": max_year,
-            "status": random.choice(["open", "closed"]),
+            "status": rng.choice(["open", "closed"]),
             "available_track_ids": [t["id"] for t in track_sample],
             "required_program_ids": [p["id"] for p in program_sample],
             "required_course_ids": [c["id"] for c in course_sample],
@@ -430,38 +1097,122 @@ def load_sample_data(driver: Driver) -> None:
         for term in scholarship["available_term_ids"]:
             scholarship_term_pairs.append({"scholarship_id": scholarship["id"], "term_id": term})
 
-    scholarships_by_track: Dict[str, List[Dict[str, Any]]] = {}
-    for sch in scholarships:
-        for track_id in sch["available_track_ids"]:
-            scholarships_by_track.setdefault(track_id, []).append(sch)
-
     terms_by_band: Dict[int, List[Dict[str, Any]]] = {}
     for term in terms:
         terms_by_band.setdefault(term["yearBand"], []).append(term)
 
+    department_college_pairs = [{"dept_id": dept["id"], "college_id": dept["college_id"]} for dept in departments]
+    track_department_pairs = [{"track_id": track["id"], "dept_id": track["department_id"]} for track in major_tracks]
+    program_track_pairs = [
+        {"program_id": program["id"], "track_id": track_id} for program in programs for track_id in program["track_ids"]
+    ]
+    program_event_pairs = [
+        {"program_id": program["id"], "event_id": event_id, "yearFocus": program["minYear"]}
+        for program in programs
+        for event_id in program["event_ids"]
+    ]
+
+    yield from _family_batches(
+        {
+            "colleges": colleges,
+            "departments": departments,
+            "major_tracks": major_tracks,
+            "terms": terms,
+            "events": events,
+            "books": books,
+            "programs": programs,
+            "professors": professors,
+            "courses": courses,
+            "scholarships": scholarships,
+            "department_college": department_college_pairs,
+            "track_department": track_department_pairs,
+            "program_track": program_track_pairs,
+            "program_event": program_event_pairs,
+            "course_professor": course_professor_pairs,
+            "course_term": course_term_pairs,
+            "course_book": course_book_pairs,
+            "course_program": course_program_pairs,
+            "course_prereq": course_prereq_pairs,
+            "scholarship_program": scholarship_program_pairs,
+            "scholarship_course": scholarship_course_pairs,
+            "scholarship_track": scholarship_track_pairs,
+            "scholarship_term": scholarship_term_pairs,
+            "event_course": event_course_pairs,
+        },
+        batch_size,
+    )
+
+    # Student draws look candidates up instead of scanning for them: courses
+    # by (department, term), with ``None`` standing for the all-courses pool
+    # of a department without courses, and scholarships by (track, year) so
+    # only the GPA check is left per student.
+    all_course_ids = list(course_lookup.keys())
+    course_pools = {dept_id: course_ids for dept_id, course_ids in dept_courses.items() if course_ids}
+    courses_by_pool_term: Dict[Tuple[Optional[str], str], List[str]] = {}
+    for pool_id, pool in [*course_pools.items(), (None, all_course_ids)]:
+        for course_id in pool:
+            courses_by_pool_term.setdefault((pool_id, course_lookup[course_id]["termId"]), []).append(course_id)
+    scholarships_by_track_year: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+    for sch in scholarships:
+        for track_id in sch["available_track_ids"]:
+            for year in range(sch["targetYearMin"], sch["targetYearMax"] + 1):
+                scholarships_by_track_year.setdefault((track_id, year), []).append(sch)
+
+    if vectorized:
+        yield from _vectorized_student_batches(
+            seed,
+            sizes.students,
+            batch_size,
+            major_tracks=major_tracks,
+            terms=terms,
+            course_lookup=course_lookup,
+            course_pools=course_pools,
+            programs_by_track=programs_by_track,
+            program_lookup=program_lookup,
+            scholarships_by_track_year=scholarships_by_track_year,
+            names=(last_names, first_names),
+        )
+        return
+
+    # Students and their relationships are the bulk of the graph; they are
+    # flushed every ``batch_size`` students instead of being held in memory.
     students: List[Dict[str, Any]] = []
     student_track_pairs: List[Dict[str, str]] = []
     student_course_pairs: List[Dict[str, str]] = []
     student_program_pairs: List[Dict[str, Any]] = []
     student_scholarship_pairs: List[Dict[str, Any]] = []
-    NUM_STUDENTS = 5600
-    for idx in range(NUM_STUDENTS):
-        track = random.choice(major_tracks)
-        year_level = random.choices([1, 2, 3, 4], weights=[0.27, 0.26, 0.24, 0.23])[0]
+
+    def flush_students() -> Iterator[Batch]:
+        yield from _family_batches(
+            {
+                "students": students,
+                "student_track": student_track_pairs,
+                "student_course": student_course_pairs,
+                "student_program": student_program_pairs,
+                "student_scholarship": student_scholarship_pairs,
+            },
+            batch_size,
+        )
+        for rows in (students, student_track_pairs, student_course_pairs, student_program_pairs, student_scholarship_pairs):
+            rows.clear()
+
+    for idx in range(sizes.students):
+        track = rng.choice(major_tracks)
+        year_level = rng.choices([1, 2, 3, 4], weights=[0.27, 0.26, 0.24, 0.23])[0]
         term_candidates = terms_by_band.get(year_level, terms)
-        current_term = random.choice(term_candidates)
-        status = "graduating" if year_level == 4 and random.random() < 0.35 else "active"
-        credits = random.randint(year_level * 25, year_level * 35)
+        current_term = rng.choice(term_candidates)
+        status = "graduating" if year_level == 4 and rng.random() < 0.35 else "active"
+        credits = rng.randint(year_level * 25, year_level * 35)
         if status == "graduating":
-            credits = max(credits, 120 + random.randint(0, 25))
-        gpa = round(random.uniform(2.0, 4.3), 2)
+            credits = max(credits, 120 + rng.randint(0, 25))
+        gpa = round(rng.uniform(2.0, 4.3), 2)
         student = {
             "id": f"STD-{idx:05}",
-            "name": f"{random.choice(last_names)} {random.choice(first_names)}",
+            "name": f"{rng.choice(last_names)} {rng.choice(first_names)}",
             "studentNumber": 20180000 + idx,
             "yearLevel": year_level,
             "gpa": gpa,
-            "entryYear": random.randint(2018, 2023),
+            "entryYear": rng.randint(2018, 2023),
             "creditsEarned": credits,
             "requiredCredits": 130,
             "status": status,
@@ -470,31 +1221,29 @@ def load_sample_data(driver: Driver) -> None:
         students.append(student)
         student_track_pairs.append({"student_id": student["id"], "track_id": track["id"]})
 
-        dept_course_list = dept_courses.get(track["department_id"], list(course_lookup.keys()))
-        if not dept_course_list:
-            dept_course_list = list(course_lookup.keys())
-        num_courses = random.randint(4, 6)
-        term_specific = [cid for cid in dept_course_list if course_lookup[cid]["termId"] == current_term["id"]]
-        chosen_courses = set(random.sample(term_specific, k=min(len(term_specific), 2))) if term_specific else set()
+        pool_id = track["department_id"] if track["department_id"] in course_pools else None
+        dept_course_list = course_pools.get(pool_id, all_course_ids)
+        num_courses = min(rng.randint(4, 6), len(dept_course_list))
+        term_specific = courses_by_pool_term.get((pool_id, current_term["id"]), [])
+        # Insertion-ordered, so rows (and checkpoint offsets) depend only on --seed.
+        chosen_courses = dict.fromkeys(rng.sample(term_specific, k=min(len(term_specific), 2)) if term_specific else ())
         while len(chosen_courses) < num_courses:
-            chosen_courses.add(random.choice(dept_course_list))
+            chosen_courses[rng.choice(dept_course_list)] = None
         for course_id in chosen_courses:
             student_course_pairs.append({"student_id": student["id"], "course_id": course_id})
 
         program_candidates = programs_by_track.get(track["id"], [])
         if program_candidates:
-            participation = random.sample(program_candidates, k=min(len(program_candidates), random.randint(1, 3)))
+            participation = rng.sample(program_candidates, k=min(len(program_candidates), rng.randint(1, 3)))
             for program_id in participation:
-                hours = min(program_lookup[program_id]["hours"], random.randint(8, 20))
+                hours = min(program_lookup[program_id]["hours"], rng.randint(8, 20))
                 student_program_pairs.append({"student_id": student["id"], "program_id": program_id, "hours": hours})
 
         possible_scholarships = [
-            sch
-            for sch in scholarships_by_track.get(track["id"], [])
-            if sch["targetYearMin"] <= year_level <= sch["targetYearMax"] and gpa >= sch["minGpa"] - 0.1
+            sch for sch in scholarships_by_track_year.get((track["id"], year_level), []) if gpa >= sch["minGpa"] - 0.1
         ]
-        if possible_scholarships and random.random() < 0.22:
-            sch = random.choice(possible_scholarships)
+        if possible_scholarships and rng.random() < 0.22:
+            sch = rng.choice(possible_scholarships)
             student_scholarship_pairs.append(
                 {
                     "student_id": student["id"],
@@ -503,392 +1252,717 @@ def load_sample_data(driver: Driver) -> None:
                 }
             )
 
-    department_college_pairs = [{"dept_id": dept["id"], "college_id": dept["college_id"]} for dept in departments]
-    track_department_pairs = [{"track_id": track["id"], "dept_id": track["department_id"]} for track in major_tracks]
-    program_track_pairs = [
-        {"program_id": program["id"], "track_id": track_id} for program in programs for track_id in program["track_ids"]
-    ]
-    program_event_pairs = [
-        {"program_id": program["id"], "event_id": event_id, "yearFocus": program["minYear"]}
-        for program in programs
-        for event_id in program["event_ids"]
-    ]
+        if len(students) >= batch_size:
+            yield from flush_students()
+    yield from flush_students()
 
-    try:
-        with driver.session() as session:
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                CREATE (:College {id: row.id, name: row.name, type: row.type, dean: row.dean})
-                """,
-                colleges,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                CREATE (:Department {id: row.id, name: row.name, code: row.code, building: row.building})
-                """,
-                departments,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                CREATE (:MajorTrack:AcademicInfo {
-                    id: row.id,
-                    name: row.name,
-                    focusArea: row.focusArea,
-                    minYear: row.minYear,
-                    maxYear: row.maxYear,
-                    departmentId: row.department_id
-                })
-                """,
-                major_tracks,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                CREATE (:Term:AcademicInfo {
-                    id: row.id,
-                    name: row.name,
-                    year: row.year,
-                    season: row.season,
-                    sequence: row.sequence,
-                    startDate: row.startDate,
-                    endDate: row.endDate,
-                    yearBand: row.yearBand
-                })
-                """,
-                terms,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                CREATE (:AcademicEvent:AcademicInfo {
-                    id: row.id,
-                    name: row.name,
-                    eventType: row.eventType,
-                    termId: row.termId,
-                    startWeek: row.startWeek,
-                    endWeek: row.endWeek,
-                    yearFocus: row.yearFocus
-                })
-                """,
-                events,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                CREATE (:Book:ScholarlyResource {
-                    id: row.id,
-                    name: row.name,
-                    title: row.title,
-                    author: row.author,
-                    topic: row.topic,
-                    available: row.available,
-                    callNumber: row.callNumber,
-                    publisher: row.publisher
-                })
-                """,
-                books,
-                batch_size=500,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                CREATE (:NonCurricularProgram:AcademicInfo {
-                    id: row.id,
-                    name: row.name,
-                    category: row.category,
-                    competency: row.competency,
-                    minYear: row.minYear,
-                    maxYear: row.maxYear,
-                    hours: row.hours,
-                    delivery: row.delivery,
-                    departmentId: row.departmentId
-                })
-                """,
-                programs,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                CREATE (:Professor:AcademicActor {
-                    id: row.id,
-                    name: row.name,
-                    title: row.title,
-                    email: row.email,
-                    office: row.office,
-                    departmentId: row.departmentId
-                })
-                """,
-                professors,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                CREATE (:Course:AcademicInfo {
-                    id: row.id,
-                    name: row.name,
-                    courseCode: row.courseCode,
-                    credits: row.credits,
-                    category: row.category,
-                    yearLevel: row.yearLevel,
-                    semester: row.semester,
-                    deliveryMode: row.deliveryMode,
-                    departmentId: row.departmentId,
-                    termId: row.termId
-                })
-                """,
-                courses,
-                batch_size=500,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                CREATE (:Scholarship:AcademicInfo {
-                    id: row.id,
-                    name: row.name,
-                    category: row.category,
-                    minGpa: row.minGpa,
-                    minCredits: row.minCredits,
-                    amount: row.amount,
-                    targetYearMin: row.targetYearMin,
-                    targetYearMax: row.targetYearMax,
-                    status: row.status
-                })
-                """,
-                scholarships,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                CREATE (:Student:AcademicActor {
-                    id: row.id,
-                    name: row.name,
-                    studentNumber: row.studentNumber,
-                    yearLevel: row.yearLevel,
-                    gpa: row.gpa,
-                    entryYear: row.entryYear,
-                    creditsEarned: row.creditsEarned,
-                    requiredCredits: row.requiredCredits,
-                    status: row.status,
-                    currentTermId: row.currentTermId
-                })
-                """,
-                students,
-                batch_size=1000,
-            )
 
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (d:Department {id: row.dept_id})
-                MATCH (c:College {id: row.college_id})
-                CREATE (d)-[:BELONGS_TO]->(c)
-                """,
-                department_college_pairs,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (t:MajorTrack {id: row.track_id})
-                MATCH (d:Department {id: row.dept_id})
-                CREATE (t)-[:BELONGS_TO]->(d)
-                """,
-                track_department_pairs,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (p:NonCurricularProgram {id: row.program_id})
-                MATCH (t:MajorTrack {id: row.track_id})
-                CREATE (p)-[:SUITABLE_FOR_MAJOR]->(t)
-                """,
-                program_track_pairs,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (p:NonCurricularProgram {id: row.program_id})
-                MATCH (e:AcademicEvent {id: row.event_id})
-                CREATE (p)-[:SUITABLE_FOR_YEAR {targetYear: row.yearFocus}]->(e)
-                """,
-                program_event_pairs,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (c:Course {id: row.course_id})
-                MATCH (p:Professor {id: row.professor_id})
-                CREATE (c)-[:TAUGHT_BY]->(p)
-                """,
-                course_professor_pairs,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (c:Course {id: row.course_id})
-                MATCH (t:Term {id: row.term_id})
-                CREATE (c)-[:HELD_IN_TERM]->(t)
-                """,
-                course_term_pairs,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (c:Course {id: row.course_id})
-                MATCH (b:Book {id: row.book_id})
-                CREATE (c)-[:HAS_RECOMMENDED_BOOK]->(b)
-                """,
-                course_book_pairs,
-                batch_size=1000,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (c:Course {id: row.course_id})
-                MATCH (p:NonCurricularProgram {id: row.program_id})
-                CREATE (c)-[:RELATED_TO_PROGRAM]->(p)
-                """,
-                course_program_pairs,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (c1:Course {id: row.course_id})
-                MATCH (c2:Course {id: row.prereq_id})
-                CREATE (c1)-[:HAS_PREREQUISITE]->(c2)
-                """,
-                course_prereq_pairs,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (sch:Scholarship {id: row.scholarship_id})
-                MATCH (prog:NonCurricularProgram {id: row.program_id})
-                CREATE (sch)-[:REQUIRES_PROGRAM]->(prog)
-                """,
-                scholarship_program_pairs,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (sch:Scholarship {id: row.scholarship_id})
-                MATCH (course:Course {id: row.course_id})
-                CREATE (sch)-[:REQUIRES_COURSE]->(course)
-                """,
-                scholarship_course_pairs,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (sch:Scholarship {id: row.scholarship_id})
-                MATCH (track:MajorTrack {id: row.track_id})
-                CREATE (sch)-[:AVAILABLE_FOR_MAJOR]->(track)
-                """,
-                scholarship_track_pairs,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (sch:Scholarship {id: row.scholarship_id})
-                MATCH (term:Term {id: row.term_id})
-                CREATE (sch)-[:AVAILABLE_IN_TERM]->(term)
-                """,
-                scholarship_term_pairs,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (s:Student {id: row.student_id})
-                MATCH (t:MajorTrack {id: row.track_id})
-                CREATE (s)-[:MAJOR_IN]->(t)
-                """,
-                student_track_pairs,
-                batch_size=1000,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (s:Student {id: row.student_id})
-                MATCH (c:Course {id: row.course_id})
-                CREATE (s)-[:ENROLLED_IN]->(c)
-                """,
-                student_course_pairs,
-                batch_size=1000,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (s:Student {id: row.student_id})
-                MATCH (p:NonCurricularProgram {id: row.program_id})
-                CREATE (s)-[:PARTICIPATED_IN {hours: row.hours}]->(p)
-                """,
-                student_program_pairs,
-                batch_size=1000,
-            )
-            run_batch(
-                session,
-                """
-                UNWIND $rows AS row
-                MATCH (s:Student {id: row.student_id})
-                MATCH (sch:Scholarship {id: row.scholarship_id})
-                CREATE (s)-[:RECEIVED_SCHOLARSHIP {term: row.year}]->(sch)
-                """,
-                student_scholarship_pairs,
-            )
-            run_batch(
+@dataclass(frozen=True)
+class FamilyReport:
+    """Rows written for one family; ``elapsed`` is summed over all sessions.
+
+    ``counters`` holds the server-reported ``SERVER_COUNTERS`` of its batches.
+    """
+
+    rows: int
+    batches: int
+    retries: int
+    elapsed: float
+    counters: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def rows_per_sec(self) -> float:
+        if self.elapsed <= 0:
+            return float(self.rows)
+        return self.rows / self.elapsed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "rows_per_sec": self.rows_per_sec}
+
+
+@dataclass(frozen=True)
+class SampleLoadReport:
+    families: Dict[str, FamilyReport]
+    elapsed: float
+    workers: int
+    batch_sizes: Dict[str, int] = field(default_factory=dict)
+    skipped: int = 0
+
+    @property
+    def rows(self) -> int:
+        return sum(report.rows for report in self.families.values())
+
+    @property
+    def rows_per_sec(self) -> float:
+        if self.elapsed <= 0:
+            return float(self.rows)
+        return self.rows / self.elapsed
+
+    def count(self, family: str) -> int:
+        report = self.families.get(family)
+        return report.rows if report else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        totals: Dict[str, Any] = {
+            "rows": self.rows,
+            "elapsed": self.elapsed,
+            "rows_per_sec": self.rows_per_sec,
+            "retries": sum(report.retries for report in self.families.values()),
+        }
+        for name in SERVER_COUNTERS:
+            totals[name] = sum(report.counters.get(name, 0) for report in self.families.values())
+        return {
+            "workers": self.workers,
+            "skipped": self.skipped,
+            "batch_sizes": self.batch_sizes,
+            "families": {family: report.to_dict() for family, report in self.families.items()},
+            "totals": totals,
+        }
+
+    def write_json(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+
+def _partition(value: Any, partitions: int) -> int:
+    # crc32 rather than hash(): str hashes change between processes.
+    return zlib.crc32(str(value).encode()) % partitions
+
+
+def mix_and_batch_rounds(
+    rows: List[Dict[str, Any]], start_key: str, end_key: str, partitions: int
+) -> List[List[List[Dict[str, Any]]]]:
+    """Split relationship rows into rounds of cells that can be written concurrently.
+
+    Rows go to cell ``(partition(start), partition(end))`` of a
+    ``partitions x partitions`` grid. Round ``r`` holds the cells
+    ``(i, (i + r) % partitions)``: no two of them share a start or an end
+    partition, so concurrent writers never lock the same node. Only valid
+    when start and end nodes have different labels.
+    """
+    cells: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+    for row in rows:
+        cell = (_partition(row[start_key], partitions), _partition(row[end_key], partitions))
+        cells.setdefault(cell, []).append(row)
+    rounds = []
+    for offset in range(partitions):
+        diagonal = [cells[(i, (i + offset) % partitions)] for i in range(partitions) if (i, (i + offset) % partitions) in cells]
+        if diagonal:
+            rounds.append(diagonal)
+    return rounds
+
+
+def replay_query(family: str) -> str:
+    """Idempotent form of ``family``'s statement, for batches that may have committed before a crash.
+
+    Nodes are merged on ``id`` and relationships merged between their
+    endpoints, so rows already in the graph are not created twice.
+    """
+    if family in NODE_FAMILIES:
+        return node_query(NODE_FAMILIES[family], merge=True)
+    return relationship_query(RELATIONSHIP_FAMILIES[family], merge=True)
+
+
+def _dependency_error(dependencies: List[Future]) -> Optional[BaseException]:
+    for dependency in dependencies:
+        if dependency.cancelled():
+            return CancelledError()
+        if dependency.exception() is not None:
+            return dependency.exception()
+    return None
+
+
+def _copy_outcome(source: Future, target: Future) -> None:
+    if source.cancelled():
+        target.set_exception(CancelledError())
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class StepScheduler:
+    """Run steps on a thread pool once the steps they depend on have finished.
+
+    ``submit(fn, *args, after=futures)`` returns a future for ``fn(*args)``
+    that starts only when every future in ``after`` has succeeded, and fails
+    with the first dependency's exception otherwise. A waiting step holds no
+    thread, so at most ``parallelism`` steps run at a time and independent
+    steps never queue behind blocked ones. With ``parallelism`` 1 steps run
+    in the submitting thread (their dependencies, submitted earlier, have
+    finished by then).
+    """
+
+    def __init__(self, parallelism: int, thread_name_prefix: str = "sample-load") -> None:
+        if parallelism <= 0:
+            raise ValueError(f"parallelism must be positive, got {parallelism}")
+        self.parallelism = parallelism
+        self._pool = ThreadPoolExecutor(parallelism, thread_name_prefix=thread_name_prefix) if parallelism > 1 else None
+
+    def submit(self, fn: Callable[..., Any], *args: Any, after: Iterable[Future] = ()) -> Future:
+        dependencies = list(after)
+        result: Future = Future()
+        if self._pool is None:
+            error = _dependency_error(dependencies)
+            if error is not None:
+                result.set_exception(error)
+                return result
+            try:
+                result.set_result(fn(*args))
+            except Exception as exc:
+                result.set_exception(exc)
+            return result
+
+        # One extra count so the step cannot start while callbacks are still being added.
+        remaining = [len(dependencies) + 1]
+        lock = threading.Lock()
+
+        def ready(_dependency: Optional[Future] = None) -> None:
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            error = _dependency_error(dependencies)
+            if error is not None:
+                result.set_exception(error)
+                return
+            try:
+                step = self._pool.submit(fn, *args)
+            except RuntimeError as exc:  # the pool was shut down after a failure
+                result.set_exception(exc)
+                return
+            step.add_done_callback(lambda done: _copy_outcome(done, result))
+
+        for dependency in dependencies:
+            dependency.add_done_callback(ready)
+        ready()
+        return result
+
+    def shutdown(self, cancel: bool = False) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=cancel)
+
+
+class ParallelWriter:
+    """Write generated batches as a dependency graph of concurrent steps.
+
+    Node batches have no dependencies and are written as they arrive (each
+    node is created once, so they never conflict). Relationship rows are
+    buffered per family and flushed once enough have accumulated; a flush
+    waits only for the pending batches of the node families it reads
+    (:data:`RELATIONSHIP_DEPENDENCIES`) and for earlier flushes touching
+    either of its labels, so families over disjoint labels are written at
+    the same time. Each flush is split with :func:`mix_and_batch_rounds`
+    into rounds of cells that share no node; families whose both endpoints
+    have the same label (``course_prereq``) are written by a single
+    session. A :class:`StepScheduler` runs at most ``workers`` steps at
+    once. With a ``sizer`` each family's batches are sized by it instead of
+    ``batch_size``. Use as a context manager; ``report()`` is final after
+    exit.
+
+    With a ``checkpoint`` every generated batch, identified by its family
+    and row offset, is marked started before its rows are sent and done once
+    all of them have committed. Done batches are skipped; batches that were
+    started but never marked done may have partly committed, so they are
+    written with :func:`replay_query` instead.
+
+    ``on_progress(family, report)`` is called with the family's running
+    totals after each of its writes, from the thread that wrote it.
+    """
+
+    def __init__(
+        self,
+        driver: Driver,
+        workers: int = LOAD_WORKERS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        sizer: Optional[AdaptiveBatchSizer] = None,
+        checkpoint: Optional[LoadCheckpoint] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        if workers <= 0:
+            raise ValueError(f"workers must be positive, got {workers}")
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        self._driver = driver
+        self._workers = workers
+        self._batch_size = batch_size
+        self._max_retries = max_retries
+        self._sizer = sizer
+        self._checkpoint = checkpoint
+        self._offsets: Dict[str, int] = {}
+        self._buffered_offsets: Dict[str, List[int]] = {}
+        self._replaying: set = set()
+        self._skipped = 0
+        # A full round gives every cell about one batch.
+        self._flush_rows = batch_size * workers * workers
+        self._scheduler = StepScheduler(workers)
+        self._slots = threading.BoundedSemaphore(workers * 2)
+        # Unfinished node batches per node family, and the last relationship
+        # steps per label.
+        self._node_steps: Dict[str, List[Future]] = {}
+        self._label_steps: Dict[str, List[Future]] = {}
+        self._pending: set = set()
+        self._pending_lock = threading.Lock()
+        self._failure: Optional[BaseException] = None
+        self._buffers: Dict[str, List[Dict[str, Any]]] = {}
+        self._stats: Dict[str, List[float]] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._on_progress = on_progress
+        self._stats_lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._elapsed: Optional[float] = None
+
+    def __enter__(self) -> "ParallelWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            self._scheduler.shutdown(cancel=exc_type is not None or self._failure is not None)
+            self._elapsed = time.perf_counter() - self._started
+
+    def write(self, family: str, rows: List[Dict[str, Any]]) -> None:
+        self._raise_failure()
+        offset = self._offsets.get(family, 0)
+        self._offsets[family] = offset + len(rows)
+        replay = False
+        if self._checkpoint is not None:
+            if self._checkpoint.is_done(family, offset):
+                self._skipped += 1
+                return
+            replay = self._checkpoint.was_started(family, offset)
+        if family in NODE_QUERIES:
+            step = self._submit(self._write_node_batch, family, offset, rows, replay)
+            self._node_steps.setdefault(family, []).append(step)
+            self._raise_failure()
+            return
+        buffer = self._buffers.setdefault(family, [])
+        buffer.extend(rows)
+        self._buffered_offsets.setdefault(family, []).append(offset)
+        if replay:
+            self._replaying.add(family)
+        if len(buffer) >= self._flush_rows:
+            self._flush_family(family)
+
+    def flush(self) -> None:
+        for family in list(self._buffers):
+            self._flush_family(family)
+        with self._pending_lock:
+            pending = list(self._pending)
+        for step in pending:
+            try:
+                step.result()
+            except Exception:
+                pass
+        self._raise_failure()
+
+    def report(self) -> SampleLoadReport:
+        with self._stats_lock:
+            families = {
+                family: self._family_report(family) for family in self._stats
+            }
+        elapsed = self._elapsed if self._elapsed is not None else time.perf_counter() - self._started
+        batch_sizes = self._sizer.sizes() if self._sizer is not None else {}
+        return SampleLoadReport(
+            families=families,
+            elapsed=elapsed,
+            workers=self._workers,
+            batch_sizes=batch_sizes,
+            skipped=self._skipped,
+        )
+
+    def _family_report(self, family: str) -> FamilyReport:
+        rows, batches, retries, elapsed = self._stats[family]
+        return FamilyReport(int(rows), int(batches), int(retries), elapsed, dict(self._counters[family]))
+
+    def _submit(self, fn: Callable[..., Any], *args: Any, after: Iterable[Future] = (), slot: bool = True) -> Future:
+        # The slots bound the rows held by queued steps; a step only waits on
+        # steps submitted before it, so whoever holds a slot can finish.
+        slot = slot and self._workers > 1
+        if slot:
+            self._slots.acquire()
+        step = self._scheduler.submit(fn, *args, after=after)
+        with self._pending_lock:
+            self._pending.add(step)
+        step.add_done_callback(lambda done: self._finished(done, slot))
+        return step
+
+    def _finished(self, step: Future, slot: bool) -> None:
+        if slot:
+            self._slots.release()
+        with self._pending_lock:
+            self._pending.discard(step)
+        error = _dependency_error([step])
+        if error is not None and self._failure is None:
+            self._failure = error
+
+    def _raise_failure(self) -> None:
+        if self._failure is not None:
+            raise self._failure
+
+    def _dependencies(self, family: str) -> List[Future]:
+        """Unfinished steps a flush of relationship ``family`` must wait for."""
+        steps: List[Future] = []
+        for node_family in RELATIONSHIP_DEPENDENCIES[family]:
+            pending = [step for step in self._node_steps.get(node_family, []) if not step.done()]
+            self._node_steps[node_family] = pending
+            steps.extend(pending)
+        for label, _key in RELATIONSHIP_ENDPOINTS[family]:
+            steps.extend(step for step in self._label_steps.get(label, []) if not step.done())
+        return steps
+
+    def _mark(self, family: str, offsets: List[int], done: bool) -> None:
+        if self._checkpoint is None:
+            return
+        for offset in offsets:
+            if done:
+                self._checkpoint.mark_done(family, offset)
+            else:
+                self._checkpoint.mark_started(family, offset)
+
+    def _write_node_batch(self, family: str, offset: int, rows: List[Dict[str, Any]], replay: bool) -> None:
+        self._mark(family, [offset], done=False)
+        self._write_cell(family, rows, replay)
+        self._mark(family, [offset], done=True)
+
+    def _flush_family(self, family: str) -> None:
+        rows = self._buffers.pop(family, [])
+        offsets = self._buffered_offsets.pop(family, [])
+        replay = family in self._replaying
+        self._replaying.discard(family)
+        if not rows:
+            return
+        # Relationship rows only reference nodes from earlier batches.
+        after = self._dependencies(family)
+        self._mark(family, offsets, done=False)
+        (start_label, start_key), (end_label, end_key) = RELATIONSHIP_ENDPOINTS[family]
+        if self._workers == 1 or start_label == end_label:
+            rounds = [[rows]]
+        else:
+            rounds = mix_and_batch_rounds(rows, start_key, end_key, self._workers)
+        for cells in rounds:
+            after = [self._submit(self._write_cell, family, cell, replay, after=after) for cell in cells]
+        # Each round waits for the one before, so the last round finishing means the flush is done.
+        self._label_steps[start_label] = self._label_steps[end_label] = after
+        self._submit(self._mark, family, offsets, True, after=after, slot=False)
+        self._raise_failure()
+
+    def _write_cell(self, family: str, rows: List[Dict[str, Any]], replay: bool = False) -> None:
+        query = replay_query(family) if replay else FAMILY_QUERIES[family]
+        started = time.perf_counter()
+        counters: Dict[str, int] = {}
+        with self._driver.session() as session:
+            batches, retries = write_batches(
                 session,
-                """
-                UNWIND $rows AS row
-                MATCH (e:AcademicEvent {id: row.event_id})
-                MATCH (c:Course {id: row.course_id})
-                CREATE (e)-[:RELATED_TO_COURSE]->(c)
-                """,
-                event_course_pairs,
+                query,
+                rows,
+                self._batch_size,
+                sizer=self._sizer,
+                key=family,
+                max_retries=self._max_retries,
+                counters=counters,
             )
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            stats = self._stats.setdefault(family, [0, 0, 0, 0.0])
+            stats[0] += len(rows)
+            stats[1] += batches
+            stats[2] += retries
+            stats[3] += elapsed
+            totals = self._counters.setdefault(family, {})
+            for name, value in counters.items():
+                totals[name] = totals.get(name, 0) + value
+            progress = self._family_report(family) if self._on_progress is not None else None
+        if progress is not None:
+            self._on_progress(family, progress)
+
+
+IMPORT_ARGS_FILE = "import.args"
+
 
+def _import_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return ":boolean"
+    if isinstance(value, int):
+        return ":long"
+    if isinstance(value, float):
+        return ":double"
+    return ""
+
+
+def _import_value(value: Any) -> Any:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else value
+
+
+def import_layout(family: str, sample: Dict[str, Any]) -> Tuple[List[str], List[str], List[str]]:
+    """Header, row keys and constant trailing values of ``family``'s import file.
+
+    Nodes use their first label as ID space (``id:ID(Student)``) and list
+    every label in a ``:LABEL`` column; relationships reference those ID
+    spaces and name their type in a ``:TYPE`` column. Property types follow
+    the Python types in ``sample``.
+    """
+    if family in NODE_FAMILIES:
+        spec = NODE_FAMILIES[family]
+        columns = spec.columns()
+        header = [
+            f"{name}:ID({spec.label})" if name == "id" else f"{name}{_import_type(sample.get(key))}"
+            for name, key in columns
+        ]
+        return header + [":LABEL"], [key for _name, key in columns], [";".join(spec.labels)]
+
+    relationship = RELATIONSHIP_FAMILIES[family]
+    (start_label, start_key), (end_label, end_key) = relationship.start, relationship.end
+    properties = list(relationship.properties.items())
+    header = [f":START_ID({start_label})", f":END_ID({end_label})"]
+    header += [f"{name}{_import_type(sample.get(key))}" for name, key in properties]
+    return header + [":TYPE"], [start_key, end_key] + [key for _name, key in properties], [relationship.type]
+
+
+class BulkImportWriter:
+    """Write generated batches as ``neo4j-admin database import`` input.
+
+    Every family gets a ``<family>_header.csv`` and a ``<family>.csv`` data
+    file in ``out_dir``; on exit an ``import.args`` file lists them as
+    ``--nodes``/``--relationships`` options, with paths relative to
+    ``out_dir``.
+    """
+
+    def __init__(self, out_dir: Path) -> None:
+        self.out_dir = Path(out_dir)
+        self._files: Dict[str, Any] = {}
+        self._writers: Dict[str, Any] = {}
+        self._layouts: Dict[str, Tuple[List[str], List[str]]] = {}
+        self.counts: Dict[str, int] = {}
+
+    def __enter__(self) -> "BulkImportWriter":
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        for handle in self._files.values():
+            handle.close()
+        if exc_type is None:
+            self._write_args()
+
+    def write(self, family: str, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if family not in self._writers:
+            header, keys, constants = import_layout(family, rows[0])
+            with open(self.out_dir / f"{family}_header.csv", "w", newline="", encoding="utf-8") as handle:
+                csv.writer(handle).writerow(header)
+            self._files[family] = open(self.out_dir / f"{family}.csv", "w", newline="", encoding="utf-8")
+            self._writers[family] = csv.writer(self._files[family])
+            self._layouts[family] = (keys, constants)
+        keys, constants = self._layouts[family]
+        self._writers[family].writerows([_import_value(row[key]) for key in keys] + constants for row in rows)
+        self.counts[family] = self.counts.get(family, 0) + len(rows)
+
+    def _write_args(self) -> None:
+        lines = []
+        for family in FAMILY_QUERIES:
+            if family in self._writers:
+                option = "--nodes" if family in NODE_QUERIES else "--relationships"
+                lines.append(f"{option}={family}_header.csv,{family}.csv")
+        (self.out_dir / IMPORT_ARGS_FILE).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def export_bulk_import(
+    out_dir: Path,
+    scale: float = 1.0,
+    *,
+    sizes: Optional[SampleSizes] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    seed: int = 2024,
+    vectorized: bool = False,
+) -> Dict[str, int]:
+    """Write the sample graph as offline-import CSV files instead of loading it.
+
+    Same arguments and data as :func:`load_sample_data`. Seed an empty
+    database with ``neo4j-admin database import full @import.args <db>``
+    run from ``out_dir``, then apply :func:`create_schema`. Returns the rows
+    written per family.
+    """
+    sizes = sizes or SampleSizes().scaled(scale)
+    with BulkImportWriter(out_dir) as writer:
+        for family, rows in generate_sample_data(sizes, batch_size, seed, vectorized=vectorized):
+            writer.write(family, rows)
+    return writer.counts
+
+
+def load_sample_data(
+    driver: Driver,
+    scale: float = 1.0,
+    *,
+    sizes: Optional[SampleSizes] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    seed: int = 2024,
+    vectorized: bool = False,
+    workers: int = LOAD_WORKERS,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    adaptive: bool = False,
+    target_seconds: float = DEFAULT_TARGET_SECONDS,
+    checkpoint: Optional[LoadCheckpoint] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> SampleLoadReport:
+    """Generate a synthetic campus ontology and load it into Neo4j.
+
+    ``scale`` multiplies the default :class:`SampleSizes` (``sizes`` overrides
+    it entirely). Batches are written as they are generated, so memory use
+    depends on ``batch_size`` rather than on the scale. ``vectorized`` is
+    passed to :func:`generate_sample_data`. Writes go through a
+    :class:`ParallelWriter` with ``workers`` sessions (``1`` writes
+    sequentially). With ``adaptive`` each family's batch size starts at
+    ``batch_size`` and is tuned by an :class:`AdaptiveBatchSizer` toward
+    ``target_seconds`` per transaction. Returns the rows, retries,
+    throughput and final batch size per family.
+
+    With a ``checkpoint`` the load records its progress there and skips the
+    batches it already lists (see :class:`ParallelWriter`), so a failed load
+    is continued by calling again with a checkpoint opened with
+    ``resume=True``. The generation settings are checked against the ones
+    the checkpoint was written with. ``on_progress`` receives each family's
+    running :class:`FamilyReport`, server counters included, as it grows.
+    """
+    sizes = sizes or SampleSizes().scaled(scale)
+    sizer = AdaptiveBatchSizer(target_seconds, initial=batch_size, minimum=min(10, batch_size)) if adaptive else None
+    if checkpoint is not None:
+        # Batch offsets depend on every input of generate_sample_data.
+        checkpoint.require("sample.sizes", asdict(sizes))
+        checkpoint.require("sample.batch_size", batch_size)
+        checkpoint.require("sample.seed", seed)
+        checkpoint.require("sample.vectorized", vectorized)
+    try:
+        with ParallelWriter(driver, workers, batch_size, max_retries, sizer, checkpoint, on_progress) as writer:
+            for family, rows in generate_sample_data(sizes, batch_size, seed, vectorized=vectorized):
+                writer.write(family, rows)
+        report = writer.report()
+
+        print(
+            f"Loaded sample data: {report.count('students')} students, {report.count('courses')} courses, "
+            f"{report.count('programs')} programs, {report.count('scholarships')} scholarships."
+        )
         print(
-            f"Loaded sample data: {len(students)} students, {len(courses)} courses, "
-            f"{len(programs)} programs, {len(scholarships)} scholarships."
+            f"Wrote {report.rows} rows in {report.elapsed:.1f}s ({report.rows_per_sec:,.0f} rows/sec, "
+            f"{report.workers} workers, {sum(f.retries for f in report.families.values())} retries)."
         )
+        if report.skipped:
+            print(f"Skipped {report.skipped} batches already committed according to {checkpoint.path}.")
+        if report.batch_sizes:
+            print("Tuned batch sizes: " + ", ".join(f"{family}={size}" for family, size in sorted(report.batch_sizes.items())))
     except Exception as exc:  # pragma: no cover - setup helper
+        if checkpoint is not None:
+            raise RuntimeError(f"Failed to load sample data; progress is saved in {checkpoint.path}") from exc
         raise RuntimeError("Failed to load sample data") from exc
+    return report
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every default entity count")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="rows per UNWIND batch")
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="draw students with NumPy (faster at large scales, different sample)",
+    )
+    parser.add_argument("--workers", type=int, default=LOAD_WORKERS, help="concurrent write sessions")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES, help="retries per batch on transient errors")
+    parser.add_argument(
+        "--adaptive-batches",
+        action="store_true",
+        help="tune each statement's batch size toward --target-seconds per transaction",
+    )
+    parser.add_argument(
+        "--target-seconds",
+        type=float,
+        default=DEFAULT_TARGET_SECONDS,
+        help="transaction duration aimed for by --adaptive-batches",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=CHECKPOINT_PATH,
+        metavar="FILE",
+        help="record committed batches in FILE",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue the load recorded in --checkpoint instead of clearing the database",
+    )
+    parser.add_argument("--report", type=Path, metavar="FILE", help="write the load telemetry to FILE as JSON")
+    parser.add_argument(
+        "--export",
+        type=Path,
+        metavar="DIR",
+        help="write neo4j-admin import CSV files to DIR instead of loading the database",
+    )
+    parser.add_argument("--schema-only", action="store_true", help="only create the constraints (e.g. after an import)")
+    for field in fields(SampleSizes):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            type=int,
+            default=None,
+            help=f"override the scaled {field.name.replace('_', ' ')} count",
+        )
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
+    ARGS = _parse_args()
+    SIZES = replace(
+        SampleSizes().scaled(ARGS.scale),
+        **{
+            field.name: getattr(ARGS, field.name)
+            for field in fields(SampleSizes)
+            if getattr(ARGS, field.name) is not None
+        },
+    )
+    if ARGS.export:
+        COUNTS = export_bulk_import(
+            ARGS.export, sizes=SIZES, batch_size=ARGS.batch_size, seed=ARGS.seed, vectorized=ARGS.vectorized
+        )
+        print(f"Wrote {sum(COUNTS.values())} rows in {len(COUNTS)} files to {ARGS.export}.")
+        print(
+            f"Import into an empty database with: cd {ARGS.export} && "
+            f"neo4j-admin database import full @{IMPORT_ARGS_FILE} neo4j, "
+            f"then run: python neo4j_loader.py --schema-only"
+        )
+        raise SystemExit(0)
+
     DRIVER = get_driver()
     try:
-        clear_database(DRIVER)
+        if ARGS.schema_only:
+            create_schema(DRIVER)
+            raise SystemExit(0)
+        if ARGS.resume and not ARGS.checkpoint.is_file():
+            raise SystemExit(f"No checkpoint at {ARGS.checkpoint}; run without --resume to start a new load.")
+        if not ARGS.resume:
+            clear_database(DRIVER)
         create_schema(DRIVER)
-        load_sample_data(DRIVER)
+        with LoadCheckpoint(ARGS.checkpoint, resume=ARGS.resume) as CHECKPOINT:
+            REPORT = load_sample_data(
+                DRIVER,
+                sizes=SIZES,
+                batch_size=ARGS.batch_size,
+                seed=ARGS.seed,
+                vectorized=ARGS.vectorized,
+                workers=ARGS.workers,
+                max_retries=ARGS.max_retries,
+                adaptive=ARGS.adaptive_batches,
+                target_seconds=ARGS.target_seconds,
+                checkpoint=CHECKPOINT,
+            )
+        if ARGS.report:
+            REPORT.write_json(ARGS.report)
         print("Sample data loaded. Execute pytest to run query validations.")
     finally:
         DRIVER.close()
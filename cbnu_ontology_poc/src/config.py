@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
+from typing import Optional
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data"
@@ -10,11 +11,43 @@ NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
 
+LOAD_WORKERS = int(os.getenv("LOAD_WORKERS", "4"))
+
+SNAPSHOT_CACHE = os.getenv("SNAPSHOT_CACHE", "1").lower() not in ("0", "false", "no")
+SNAPSHOT_DIR: Optional[Path] = Path(os.environ["SNAPSHOT_DIR"]) if os.getenv("SNAPSHOT_DIR") else None
+
+LOAD_MANIFEST_PATH: Optional[Path] = (
+    Path(os.environ["LOAD_MANIFEST_PATH"]) if os.getenv("LOAD_MANIFEST_PATH") else None
+)
+
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "300"))
+QUERY_CONCURRENCY = int(os.getenv("QUERY_CONCURRENCY", "100"))
+
+CONTEXT_STORE_PATH: Optional[Path] = (
+    Path(os.environ["CONTEXT_STORE_PATH"]) if os.getenv("CONTEXT_STORE_PATH") else None
+)
+
+QUERY_PROFILE_SAMPLE = float(os.getenv("QUERY_PROFILE_SAMPLE", "0"))
+SLOW_QUERY_SECONDS = float(os.getenv("SLOW_QUERY_SECONDS", "0.5"))
+SLOW_QUERY_LOG: Optional[Path] = Path(os.environ["SLOW_QUERY_LOG"]) if os.getenv("SLOW_QUERY_LOG") else None
+
 __all__ = [
     "PROJECT_ROOT",
     "DATA_DIR",
     "NEO4J_URI",
     "NEO4J_USER",
     "NEO4J_PASSWORD",
+    "LOAD_WORKERS",
+    "SNAPSHOT_CACHE",
+    "SNAPSHOT_DIR",
+    "LOAD_MANIFEST_PATH",
+    "QUERY_CACHE_SIZE",
+    "QUERY_CACHE_TTL",
+    "QUERY_CONCURRENCY",
+    "CONTEXT_STORE_PATH",
+    "QUERY_PROFILE_SAMPLE",
+    "SLOW_QUERY_SECONDS",
+    "SLOW_QUERY_LOG",
 ]
 
@@ -1,4 +1,15 @@
 from .loaders import (
+    DEFAULT_BATCH_SIZE,
+    dataset_filename,
+    iter_books,
+    iter_courses,
+    iter_csv_batches,
+    iter_csv_chunks,
+    iter_departments,
+    iter_programs,
+    iter_relation_chunks,
+    iter_scholarships,
+    iter_students,
     load_books,
     load_courses,
     load_departments,
@@ -7,13 +18,28 @@ from .loaders import (
     load_students,
     load_csv,
 )
+from .snapshot_cache import clear_snapshots
 from .validators import (
     REQUIRED_COLUMNS,
+    ValidationReport,
+    validate_data_dir,
+    validate_datasets,
     validate_no_null_in_key,
     validate_required_columns,
 )
 
 __all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "dataset_filename",
+    "iter_books",
+    "iter_courses",
+    "iter_csv_batches",
+    "iter_csv_chunks",
+    "iter_departments",
+    "iter_programs",
+    "iter_relation_chunks",
+    "iter_scholarships",
+    "iter_students",
     "load_books",
     "load_courses",
     "load_departments",
@@ -21,7 +47,11 @@ __all__ = [
     "load_scholarships",
     "load_students",
     "load_csv",
+    "clear_snapshots",
     "REQUIRED_COLUMNS",
+    "ValidationReport",
+    "validate_data_dir",
+    "validate_datasets",
     "validate_no_null_in_key",
     "validate_required_columns",
 ]
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 from pathlib import Path
-from typing import Final
+from typing import Any, Final, Iterator, Optional, Sequence
 
 import pandas as pd
 
 from src import config
+from src.ontology_schema import NODE_SCHEMAS, RELATION_COLUMN_TYPES, ColumnType, NodeLabel
+
+from . import snapshot_cache
 
 _DATASET_FILENAMES: Final[dict[str, str]] = {
     "students": "students.csv",
@@ -14,17 +20,196 @@ _DATASET_FILENAMES: Final[dict[str, str]] = {
     "programs": "programs.csv",
     "scholarships": "scholarships.csv",
     "departments": "departments.csv",
+    "relations": "relations.csv",
+}
+
+DATASET_LABELS: Final[dict[str, NodeLabel]] = {
+    "students": NodeLabel.STUDENT,
+    "courses": NodeLabel.COURSE,
+    "books": NodeLabel.BOOK,
+    "programs": NodeLabel.PROGRAM,
+    "scholarships": NodeLabel.SCHOLARSHIP,
+    "departments": NodeLabel.DEPARTMENT,
 }
 
+# Spellings of booleans accepted in BOOL columns (compared lowercased).
+BOOLEAN_TEXT: Final[dict[str, bool]] = {
+    "true": True,
+    "false": False,
+    "1": True,
+    "0": False,
+    "1.0": True,
+    "0.0": False,
+}
+
+DEFAULT_BATCH_SIZE: Final[int] = 10_000
+
+# Arrow-backed strings take a fraction of the memory of Python str objects.
+_STRING_DTYPE = pd.StringDtype("pyarrow") if snapshot_cache.snapshots_available() else pd.StringDtype()
+# Bump when the way CSV files are parsed changes, so older snapshots are rebuilt.
+_PARSE_VERSION: Final[int] = 2
+
+Record = dict[str, Any]
+
+logger = logging.getLogger(__name__)
+
+
+def _column_types(filename: str) -> dict[str, ColumnType]:
+    if filename == _DATASET_FILENAMES["relations"]:
+        return dict(RELATION_COLUMN_TYPES)
+    for dataset, label in DATASET_LABELS.items():
+        if _DATASET_FILENAMES[dataset] == filename:
+            schema = NODE_SCHEMAS[label]
+            return {column: schema.column_type(column) for column in schema.properties}
+    return {}
+
+
+def dataset_filename(dataset: str) -> str:
+    try:
+        return _DATASET_FILENAMES[dataset]
+    except KeyError:
+        raise KeyError(f"Unknown dataset '{dataset}'") from None
+
+
 def _resolve_csv_path(filename: str) -> Path:
     return config.DATA_DIR / filename
 
 
-def load_csv(filename: str) -> pd.DataFrame:
+def _existing_csv_path(filename: str) -> Path:
     csv_path = _resolve_csv_path(filename)
     if not csv_path.is_file():
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
-    return pd.read_csv(csv_path)
+    return csv_path
+
+
+def _parse_dtypes(filename: str) -> dict[str, Any]:
+    # Text columns are never type-inferred: numeric-looking ids would come
+    # back as integers in one file (or chunk) and as strings in another.
+    # Categories, numbers and booleans are converted by _apply_types, so a
+    # malformed value does not abort the read and every chunk records into
+    # the snapshot with one schema.
+    return {
+        column: _STRING_DTYPE
+        for column, kind in _column_types(filename).items()
+        if kind in (ColumnType.ID, ColumnType.TEXT, ColumnType.CATEGORY)
+    }
+
+
+def parse_schema(filename: str) -> str:
+    """Digest of how ``filename`` is parsed; snapshots keep it to detect dtype changes."""
+    dtypes = {column: str(dtype) for column, dtype in _parse_dtypes(filename).items()}
+    payload = json.dumps({"version": _PARSE_VERSION, "dtypes": dtypes}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _convert(series: pd.Series, kind: ColumnType) -> pd.Series:
+    if kind in (ColumnType.ID, ColumnType.TEXT):
+        return series if series.dtype == _STRING_DTYPE else series.astype(_STRING_DTYPE)
+    if kind is ColumnType.CATEGORY:
+        return series.astype(_STRING_DTYPE).astype("category")
+    if kind is ColumnType.BOOL:
+        if pd.api.types.is_bool_dtype(series):
+            return series.astype("boolean")
+        return series.astype(str).str.strip().str.lower().map(BOOLEAN_TEXT).astype("boolean")
+    numbers = pd.to_numeric(series, errors="coerce")
+    if kind is ColumnType.INT:
+        return numbers.where(numbers.mod(1).eq(0)).astype("Int64")
+    return numbers.astype("float64")
+
+
+def _apply_types(frame: pd.DataFrame, filename: str) -> pd.DataFrame:
+    converted = {}
+    for column, kind in _column_types(filename).items():
+        if column not in frame.columns:
+            continue
+        original = frame[column]
+        converted[column] = _convert(original, kind)
+        if kind in (ColumnType.ID, ColumnType.TEXT, ColumnType.CATEGORY):
+            continue
+        unreadable = int((original.notna() & converted[column].isna()).sum())
+        if unreadable:
+            logger.warning(
+                "%s: %d values in column %s are not %s and were read as missing",
+                filename,
+                unreadable,
+                column,
+                kind.value,
+            )
+    return frame.assign(**converted) if converted else frame
+
+
+def frame_records(frame: pd.DataFrame) -> list[Record]:
+    """Rows of ``frame`` as dicts of plain Python values, with ``None`` for every missing value."""
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def load_csv(filename: str, *, typed: bool = True) -> pd.DataFrame:
+    """Read a whole CSV file with the dtypes of its ontology schema.
+
+    Keys and text are Arrow-backed strings, :attr:`ColumnType.CATEGORY`
+    columns categoricals, and numbers and booleans nullable ``Int64``,
+    ``float64`` and ``boolean``. Values that do not parse as their type are
+    read as missing (with a warning). ``typed=False`` returns every column
+    as parsed, malformed values included, for validation.
+    """
+    csv_path = _existing_csv_path(filename)
+
+    def read_csv() -> pd.DataFrame:
+        # The C parser, as for chunked reads: the Arrow parser infers numbers
+        # before applying string dtypes, which strips leading zeros from ids.
+        return pd.read_csv(csv_path, dtype=_parse_dtypes(filename))
+
+    if snapshot_cache.snapshots_enabled():
+        frame = snapshot_cache.read_frame(csv_path, read_csv, parse_schema(filename))
+    else:
+        frame = read_csv()
+    return _apply_types(frame, filename) if typed else frame
+
+
+def _read_csv_chunks(
+    csv_path: Path,
+    filename: str,
+    batch_size: int,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    with pd.read_csv(
+        csv_path,
+        chunksize=batch_size,
+        usecols=list(columns) if columns is not None else None,
+        dtype=_parse_dtypes(filename),
+    ) as reader:
+        yield from reader
+
+
+def iter_csv_chunks(
+    filename: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    csv_path = _existing_csv_path(filename)
+    if snapshot_cache.snapshots_enabled():
+        chunks = snapshot_cache.iter_chunks(
+            csv_path,
+            lambda size: _read_csv_chunks(csv_path, filename, size),
+            batch_size,
+            columns,
+            parse_schema(filename),
+        )
+    else:
+        chunks = _read_csv_chunks(csv_path, filename, batch_size, columns)
+    for chunk in chunks:
+        yield _apply_types(chunk, filename)
+
+
+def iter_csv_batches(
+    filename: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[list[Record]]:
+    for chunk in iter_csv_chunks(filename, batch_size, columns):
+        yield frame_records(chunk)
 
 
 def load_students() -> pd.DataFrame:
@@ -50,12 +235,67 @@ def load_scholarships() -> pd.DataFrame:
 def load_departments() -> pd.DataFrame:
     return load_csv(_DATASET_FILENAMES["departments"])
 
+
+def iter_students(
+    batch_size: int = DEFAULT_BATCH_SIZE, columns: Optional[Sequence[str]] = None
+) -> Iterator[list[Record]]:
+    return iter_csv_batches(_DATASET_FILENAMES["students"], batch_size, columns)
+
+
+def iter_courses(
+    batch_size: int = DEFAULT_BATCH_SIZE, columns: Optional[Sequence[str]] = None
+) -> Iterator[list[Record]]:
+    return iter_csv_batches(_DATASET_FILENAMES["courses"], batch_size, columns)
+
+
+def iter_books(
+    batch_size: int = DEFAULT_BATCH_SIZE, columns: Optional[Sequence[str]] = None
+) -> Iterator[list[Record]]:
+    return iter_csv_batches(_DATASET_FILENAMES["books"], batch_size, columns)
+
+
+def iter_programs(
+    batch_size: int = DEFAULT_BATCH_SIZE, columns: Optional[Sequence[str]] = None
+) -> Iterator[list[Record]]:
+    return iter_csv_batches(_DATASET_FILENAMES["programs"], batch_size, columns)
+
+
+def iter_scholarships(
+    batch_size: int = DEFAULT_BATCH_SIZE, columns: Optional[Sequence[str]] = None
+) -> Iterator[list[Record]]:
+    return iter_csv_batches(_DATASET_FILENAMES["scholarships"], batch_size, columns)
+
+
+def iter_departments(
+    batch_size: int = DEFAULT_BATCH_SIZE, columns: Optional[Sequence[str]] = None
+) -> Iterator[list[Record]]:
+    return iter_csv_batches(_DATASET_FILENAMES["departments"], batch_size, columns)
+
+
+def iter_relation_chunks(batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+    return iter_csv_chunks(_DATASET_FILENAMES["relations"], batch_size)
+
 __all__ = [
+    "BOOLEAN_TEXT",
+    "DATASET_LABELS",
+    "DEFAULT_BATCH_SIZE",
+    "dataset_filename",
+    "frame_records",
     "load_csv",
+    "parse_schema",
+    "iter_csv_chunks",
+    "iter_csv_batches",
     "load_students",
     "load_courses",
     "load_books",
     "load_programs",
     "load_scholarships",
     "load_departments",
+    "iter_students",
+    "iter_courses",
+    "iter_books",
+    "iter_programs",
+    "iter_scholarships",
+    "iter_departments",
+    "iter_relation_chunks",
 ]
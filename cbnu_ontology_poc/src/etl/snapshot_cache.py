@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # pragma: no cover - handled at runtime
+    pa = None  # type: ignore[assignment]
+    pa_ipc = None  # type: ignore[assignment]
+
+from src import config
+
+SNAPSHOT_SUFFIX = ".feather"
+METADATA_SUFFIX = ".json"
+
+FrameReader = Callable[[], pd.DataFrame]
+ChunkReader = Callable[[int], Iterator[pd.DataFrame]]
+
+
+@dataclass(frozen=True)
+class SourceFingerprint:
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    # How the CSV was parsed (see ``loaders.parse_schema``); a snapshot
+    # written with other dtypes is rebuilt.
+    parse_schema: str = ""
+
+
+def snapshots_available() -> bool:
+    return pa is not None
+
+
+def snapshots_enabled() -> bool:
+    return config.SNAPSHOT_CACHE and snapshots_available()
+
+
+def snapshot_dir() -> Path:
+    return config.SNAPSHOT_DIR or config.DATA_DIR / ".snapshots"
+
+
+def _snapshot_paths(csv_path: Path) -> tuple[Path, Path]:
+    resolved = str(csv_path.resolve())
+    stem = f"{csv_path.stem}-{hashlib.sha1(resolved.encode()).hexdigest()[:12]}"
+    directory = snapshot_dir()
+    return directory / f"{stem}{SNAPSHOT_SUFFIX}", directory / f"{stem}{METADATA_SUFFIX}"
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_metadata(meta_path: Path) -> Optional[SourceFingerprint]:
+    try:
+        return SourceFingerprint(**json.loads(meta_path.read_text(encoding="utf-8")))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _write_metadata(meta_path: Path, fingerprint: SourceFingerprint) -> None:
+    tmp_path = meta_path.with_suffix(meta_path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(asdict(fingerprint)), encoding="utf-8")
+    os.replace(tmp_path, meta_path)
+
+
+def _fingerprint(
+    csv_path: Path, cached: Optional[SourceFingerprint], parse_schema: str = ""
+) -> tuple[SourceFingerprint, bool]:
+    """Return the current fingerprint and whether ``cached`` still describes the file.
+
+    The content hash is only recomputed when size or mtime moved, so an
+    unchanged file costs a single ``stat`` call.
+    """
+    stat = csv_path.stat()
+    resolved = str(csv_path.resolve())
+    if cached is not None and cached.parse_schema != parse_schema:
+        cached = None
+    if (
+        cached is not None
+        and cached.path == resolved
+        and cached.size == stat.st_size
+        and cached.mtime_ns == stat.st_mtime_ns
+    ):
+        return cached, True
+    current = SourceFingerprint(resolved, stat.st_size, stat.st_mtime_ns, _file_digest(csv_path), parse_schema)
+    return current, cached is not None and cached.path == resolved and cached.sha256 == current.sha256
+
+
+def _valid_snapshot(csv_path: Path, parse_schema: str) -> tuple[Path, Path, SourceFingerprint, bool]:
+    data_path, meta_path = _snapshot_paths(csv_path)
+    cached = _read_metadata(meta_path)
+    fingerprint, valid = _fingerprint(csv_path, cached, parse_schema)
+    valid = valid and data_path.is_file()
+    if valid and fingerprint != cached:
+        _write_metadata(meta_path, fingerprint)
+    return data_path, meta_path, fingerprint, valid
+
+
+def _to_table(df: pd.DataFrame, schema: Optional["pa.Schema"] = None) -> "pa.Table":
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def _write_snapshot(df: pd.DataFrame, data_path: Path, meta_path: Path, fingerprint: SourceFingerprint) -> None:
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = data_path.with_suffix(data_path.suffix + ".tmp")
+    table = _to_table(df)
+    with pa.OSFile(str(tmp_path), "wb") as sink, pa_ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, data_path)
+    _write_metadata(meta_path, fingerprint)
+
+
+def read_frame(csv_path: Path, read_csv: FrameReader, parse_schema: str = "") -> pd.DataFrame:
+    """Load ``csv_path`` from its snapshot, rebuilding it when the CSV or ``parse_schema`` changed."""
+    data_path, meta_path, fingerprint, valid = _valid_snapshot(csv_path, parse_schema)
+    if valid:
+        with pa.memory_map(str(data_path)) as source:
+            return pa_ipc.open_file(source).read_all().to_pandas()
+    df = read_csv()
+    _write_snapshot(df, data_path, meta_path, fingerprint)
+    return df
+
+
+def _stream_snapshot(
+    data_path: Path, batch_size: int, columns: Optional[Sequence[str]]
+) -> Iterator[pd.DataFrame]:
+    with pa.memory_map(str(data_path)) as source:
+        table = pa_ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(list(columns))
+        for batch in table.to_batches(max_chunksize=batch_size):
+            yield batch.to_pandas()
+
+
+def _stream_and_record(
+    data_path: Path,
+    meta_path: Path,
+    fingerprint: SourceFingerprint,
+    read_chunks: ChunkReader,
+    batch_size: int,
+    columns: Optional[Sequence[str]],
+) -> Iterator[pd.DataFrame]:
+    # Chunks are appended to the snapshot as they are yielded; the snapshot is
+    # only published if the whole file was read and every chunk fit one schema.
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = data_path.with_suffix(data_path.suffix + ".tmp")
+    sink = pa.OSFile(str(tmp_path), "wb")
+    writer = None
+    schema = None
+    recording = True
+    completed = False
+    try:
+        for chunk in read_chunks(batch_size):
+            if recording:
+                try:
+                    table = _to_table(chunk, schema)
+                    if writer is None:
+                        schema = table.schema
+                        writer = pa_ipc.new_file(sink, schema)
+                    writer.write_table(table)
+                except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError):
+                    recording = False
+            yield chunk.loc[:, list(columns)] if columns is not None else chunk
+        completed = True
+    finally:
+        if writer is not None:
+            writer.close()
+        sink.close()
+        if completed and recording and writer is not None:
+            os.replace(tmp_path, data_path)
+            _write_metadata(meta_path, fingerprint)
+        else:
+            tmp_path.unlink(missing_ok=True)
+
+
+def iter_chunks(
+    csv_path: Path,
+    read_chunks: ChunkReader,
+    batch_size: int,
+    columns: Optional[Sequence[str]] = None,
+    parse_schema: str = "",
+) -> Iterator[pd.DataFrame]:
+    """Stream ``csv_path`` in ``batch_size`` frames, from its snapshot when valid."""
+    data_path, meta_path, fingerprint, valid = _valid_snapshot(csv_path, parse_schema)
+    if valid:
+        yield from _stream_snapshot(data_path, batch_size, columns)
+    else:
+        yield from _stream_and_record(data_path, meta_path, fingerprint, read_chunks, batch_size, columns)
+
+
+def clear_snapshots() -> int:
+    directory = snapshot_dir()
+    if not directory.is_dir():
+        return 0
+    removed = 0
+    for path in directory.iterdir():
+        if path.suffix in (SNAPSHOT_SUFFIX, METADATA_SUFFIX):
+            path.unlink()
+            removed += 1
+    return removed
+
+
+__all__ = [
+    "SourceFingerprint",
+    "clear_snapshots",
+    "iter_chunks",
+    "read_frame",
+    "snapshot_dir",
+    "snapshots_available",
+    "snapshots_enabled",
+]
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
-from typing import Final
+import logging
+from dataclasses import dataclass
+from enum import Enum
+from typing import Final, Iterable, Iterator, Mapping, Optional
 
+import numpy as np
 import pandas as pd
 
+from src.ontology_schema import NODE_SCHEMAS, ColumnType, NodeLabel, RelType
+
+from . import loaders
+from .loaders import DATASET_LABELS
+
 REQUIRED_COLUMNS: Final[dict[str, set[str]]] = {
     "students": {"student_id", "name", "dept_id", "year", "status"},
     "courses": {"course_id", "name", "dept_id", "credit", "type"},
@@ -11,7 +20,33 @@ REQUIRED_COLUMNS: Final[dict[str, set[str]]] = {
     "programs": {"program_id", "name", "target_dept_id", "skill_tag"},
     "scholarships": {"scholarship_id", "name", "min_gpa", "required_credit"},
     "departments": {"dept_id", "name"},
+    "relations": {"from_label", "from_id", "rel_type", "to_label", "to_id"},
+}
+
+_PARSED_TYPES = (ColumnType.INT, ColumnType.FLOAT, ColumnType.BOOL)
+
+# Non-text columns of every node dataset; a non-empty value that does not
+# parse as the type is a mismatch. Empty values are allowed outside the key.
+COLUMN_TYPES: Final[dict[str, dict[str, ColumnType]]] = {
+    dataset: {
+        column: kind for column, kind in NODE_SCHEMAS[label].types.items() if kind in _PARSED_TYPES
+    }
+    for dataset, label in DATASET_LABELS.items()
 }
+_ISSUE_COLUMNS = ["dataset", "line", "check", "column", "value"]
+
+logger = logging.getLogger(__name__)
+
+
+class Check(str, Enum):
+    MISSING_COLUMN = "missing_column"
+    NULL_KEY = "null_key"
+    DUPLICATE_KEY = "duplicate_key"
+    DTYPE_MISMATCH = "dtype_mismatch"
+    UNKNOWN_LABEL = "unknown_label"
+    UNKNOWN_REL_TYPE = "unknown_rel_type"
+    DANGLING_ENDPOINT = "dangling_endpoint"
+
 
 def validate_required_columns(df: pd.DataFrame, required: set[str]) -> bool:
     available = {str(column) for column in df.columns}
@@ -23,8 +58,232 @@ def validate_no_null_in_key(df: pd.DataFrame, key_col: str) -> bool:
         raise KeyError(f"Column '{key_col}' is not present in the DataFrame")
     return not df[key_col].isna().any()
 
+
+@dataclass(frozen=True)
+class ValidationReport:
+    """Problems found by :func:`validate_datasets`.
+
+    ``issues`` has one row per problem with the ``dataset``, the ``line`` in
+    its CSV file (the header is line 1), the ``check`` that failed, the
+    ``column`` and the offending ``value``. ``invalid_rows`` holds the sorted
+    0-based positions of every dataset's rows that must not be loaded.
+    """
+
+    issues: pd.DataFrame
+    invalid_rows: dict[str, np.ndarray]
+    rows: dict[str, int]
+
+    @property
+    def ok(self) -> bool:
+        return self.issues.empty
+
+    def counts(self) -> dict[tuple[str, str], int]:
+        """Issues per ``(dataset, check)``."""
+        if self.issues.empty:
+            return {}
+        return {key: int(n) for key, n in self.issues.groupby(["dataset", "check"], sort=True).size().items()}
+
+    def dropped(self, dataset: str) -> int:
+        return len(self.invalid_rows.get(dataset, ()))
+
+    def keep_mask(self, dataset: str, start: int, length: int) -> np.ndarray:
+        """Boolean mask over rows ``start .. start + length - 1`` that passed validation."""
+        mask = np.ones(length, dtype=bool)
+        invalid = self.invalid_rows.get(dataset)
+        if invalid is not None and len(invalid):
+            low, high = np.searchsorted(invalid, [start, start + length])
+            mask[invalid[low:high] - start] = False
+        return mask
+
+    def filter_chunks(self, dataset: str, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Drop the invalid rows of ``dataset`` from its chunks, read in file order."""
+        start = 0
+        for chunk in chunks:
+            mask = self.keep_mask(dataset, start, len(chunk))
+            start += len(chunk)
+            yield chunk if mask.all() else chunk[mask]
+
+    def filter_batches(self, dataset: str, batches: Iterable[list[dict]]) -> Iterator[list[dict]]:
+        """Like :meth:`filter_chunks` for record batches; batches left empty are skipped."""
+        start = 0
+        for batch in batches:
+            mask = self.keep_mask(dataset, start, len(batch))
+            start += len(batch)
+            if mask.all():
+                yield batch
+            elif mask.any():
+                yield [row for row, keep in zip(batch, mask) if keep]
+
+
+class _Findings:
+    """Collects issues and the rows they invalidate."""
+
+    def __init__(self) -> None:
+        self.pieces: list[pd.DataFrame] = []
+        self.invalid: dict[str, list[np.ndarray]] = {}
+
+    def reject(self, dataset: str, df: pd.DataFrame, mask: pd.Series | np.ndarray, check: Check, column: str) -> None:
+        positions = np.flatnonzero(np.asarray(mask))
+        if not len(positions):
+            return
+        self.pieces.append(
+            pd.DataFrame(
+                {
+                    "dataset": dataset,
+                    "line": positions + 2,
+                    "check": check.value,
+                    "column": column,
+                    "value": df[column].iloc[positions].to_numpy(dtype=object),
+                },
+                columns=_ISSUE_COLUMNS,
+            )
+        )
+        self.invalid.setdefault(dataset, []).append(positions)
+
+    def reject_all(self, dataset: str, df: pd.DataFrame, missing: list[str]) -> None:
+        self.pieces.append(
+            pd.DataFrame(
+                [{"dataset": dataset, "line": 1, "check": Check.MISSING_COLUMN.value, "column": ", ".join(missing)}],
+                columns=_ISSUE_COLUMNS,
+            )
+        )
+        self.invalid.setdefault(dataset, []).append(np.arange(len(df)))
+
+    def report(self, rows: dict[str, int]) -> ValidationReport:
+        issues = pd.concat(self.pieces, ignore_index=True) if self.pieces else pd.DataFrame(columns=_ISSUE_COLUMNS)
+        return ValidationReport(
+            issues=issues,
+            invalid_rows={dataset: np.unique(np.concatenate(parts)) for dataset, parts in self.invalid.items()},
+            rows=rows,
+        )
+
+
+def _type_mismatch(series: pd.Series, kind: ColumnType) -> pd.Series:
+    if kind is ColumnType.BOOL:
+        if pd.api.types.is_bool_dtype(series):
+            return pd.Series(False, index=series.index)
+        bad = ~series.astype(str).str.strip().str.lower().isin(loaders.BOOLEAN_TEXT.keys())
+    else:
+        numbers = pd.to_numeric(series, errors="coerce")
+        bad = numbers.isna()
+        if kind is ColumnType.INT:
+            bad |= numbers.mod(1).fillna(0).ne(0)
+    return series.notna() & bad
+
+
+def _as_text(series: pd.Series) -> pd.Series:
+    # Keys are compared as Python str, whichever way a file's ids were
+    # parsed; hashing those is faster than Arrow-backed isin.
+    if pd.api.types.is_object_dtype(series):
+        return series
+    if pd.api.types.is_string_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+        return series.astype(object)
+    return series.astype(str)
+
+
+def _missing_columns(dataset: str, df: pd.DataFrame) -> list[str]:
+    return sorted(REQUIRED_COLUMNS[dataset].difference(str(column) for column in df.columns))
+
+
+def _validate_nodes(dataset: str, df: pd.DataFrame, findings: _Findings) -> Optional[pd.Series]:
+    """Check one node dataset; returns the keys of its valid rows."""
+    missing = _missing_columns(dataset, df)
+    if missing:
+        findings.reject_all(dataset, df, missing)
+        return None
+    key = NODE_SCHEMAS[DATASET_LABELS[dataset]].key
+    null_key = df[key].isna()
+    duplicate = df[key].duplicated(keep="first") & ~null_key
+    findings.reject(dataset, df, null_key, Check.NULL_KEY, key)
+    findings.reject(dataset, df, duplicate, Check.DUPLICATE_KEY, key)
+    bad = null_key | duplicate
+    for column, kind in COLUMN_TYPES.get(dataset, {}).items():
+        mismatch = _type_mismatch(df[column], kind)
+        findings.reject(dataset, df, mismatch, Check.DTYPE_MISMATCH, column)
+        bad |= mismatch
+    return _as_text(df.loc[~bad, key])
+
+
+def _validate_relations(relations: pd.DataFrame, known_keys: dict[str, pd.Series], findings: _Findings) -> None:
+    missing = _missing_columns("relations", relations)
+    if missing:
+        findings.reject_all("relations", relations, missing)
+        return
+    labels = {label.value for label in NodeLabel}
+    for column in ("from_label", "to_label"):
+        findings.reject("relations", relations, ~relations[column].isin(labels), Check.UNKNOWN_LABEL, column)
+    unknown_type = ~relations["rel_type"].isin({rel_type.value for rel_type in RelType})
+    findings.reject("relations", relations, unknown_type, Check.UNKNOWN_REL_TYPE, "rel_type")
+    for label_column, id_column in (("from_label", "from_id"), ("to_label", "to_id")):
+        null_id = relations[id_column].isna()
+        findings.reject("relations", relations, null_id, Check.NULL_KEY, id_column)
+        ids = _as_text(relations[id_column])
+        codes, labels_seen = pd.factorize(relations[label_column])
+        dangling = np.zeros(len(relations), dtype=bool)
+        for code, label in enumerate(labels_seen):
+            if label in known_keys:
+                rows = codes == code
+                dangling[rows] = ~ids[rows].isin(known_keys[label]).to_numpy()
+        dangling &= ~null_id.to_numpy()
+        findings.reject("relations", relations, dangling, Check.DANGLING_ENDPOINT, id_column)
+
+
+def validate_datasets(frames: Mapping[str, pd.DataFrame]) -> ValidationReport:
+    """Check node datasets and ``relations`` before they are loaded.
+
+    ``frames`` maps dataset names (the keys of :data:`REQUIRED_COLUMNS`) to
+    their full contents in file order. Every check is a vectorized pass over
+    whole columns:
+
+    * node datasets: missing required columns, null and duplicate keys (the
+      first occurrence is kept) and values that do not parse as their
+      :data:`COLUMN_TYPES` type;
+    * relations: null endpoint ids, labels and relationship types outside
+      the ontology, and endpoints whose id is not the key of a valid row of
+      its label's dataset (a hashed lookup per label). Endpoints of
+      labels whose dataset is not in ``frames`` are not checked.
+
+    A dataset missing a required column is rejected as a whole.
+    """
+    findings = _Findings()
+    known_keys: dict[str, pd.Series] = {}
+    for dataset, df in frames.items():
+        if dataset in DATASET_LABELS:
+            valid_keys = _validate_nodes(dataset, df, findings)
+            known_keys[DATASET_LABELS[dataset].value] = valid_keys if valid_keys is not None else pd.Series([], dtype=object)
+    if "relations" in frames:
+        _validate_relations(frames["relations"], known_keys, findings)
+
+    report = findings.report({dataset: len(df) for dataset, df in frames.items()})
+    for (dataset, check), count in report.counts().items():
+        logger.warning("%s: %d rows failed %s", dataset, count, check)
+    return report
+
+
+def validate_data_dir(datasets: Optional[Iterable[str]] = None) -> ValidationReport:
+    """Run :func:`validate_datasets` over the CSV files in ``config.DATA_DIR``.
+
+    ``datasets`` defaults to every dataset whose file exists.
+    """
+    frames: dict[str, pd.DataFrame] = {}
+    for dataset in datasets if datasets is not None else REQUIRED_COLUMNS:
+        filename = loaders.dataset_filename(dataset)
+        try:
+            frames[dataset] = loaders.load_csv(filename, typed=False)
+        except FileNotFoundError:
+            if datasets is not None:
+                raise
+    return validate_datasets(frames)
+
+
 __all__ = [
+    "COLUMN_TYPES",
+    "Check",
+    "DATASET_LABELS",
     "REQUIRED_COLUMNS",
+    "ValidationReport",
+    "validate_data_dir",
+    "validate_datasets",
     "validate_required_columns",
     "validate_no_null_in_key",
 ]
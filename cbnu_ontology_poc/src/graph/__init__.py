@@ -1,11 +1,39 @@
-from .neo4j_client import Neo4jClient
-from .graph_builder import clear_database, load_nodes, load_relationships
-from .schema_manager import create_constraints
+from .neo4j_client import AsyncNeo4jClient, Neo4jClient, QueryResult
+from .memory_graph import InMemoryGraph, InMemoryGraphClient
+from .checkpoint import LoadCheckpoint
+from .graph_builder import (
+    LoadReport,
+    add_load_listener,
+    clear_database,
+    load_nodes,
+    load_relationships,
+    remove_load_listener,
+    write_load_report,
+)
+from .profiling import QueryProfile, QueryProfiler
+from .incremental import SyncReport, sync_graph
+from .schema_manager import check_query_patterns, create_constraints, diff_indexes, sync_indexes
 
 __all__ = [
+    "AsyncNeo4jClient",
     "Neo4jClient",
+    "QueryResult",
+    "InMemoryGraph",
+    "InMemoryGraphClient",
+    "LoadCheckpoint",
+    "LoadReport",
+    "add_load_listener",
+    "remove_load_listener",
+    "write_load_report",
     "clear_database",
     "load_nodes",
     "load_relationships",
     "create_constraints",
+    "check_query_patterns",
+    "diff_indexes",
+    "sync_indexes",
+    "QueryProfile",
+    "QueryProfiler",
+    "SyncReport",
+    "sync_graph",
 ]
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, TextIO
+
+CHECKPOINT_VERSION = 1
+
+_STARTED = "started"
+_DONE = "done"
+
+logger = logging.getLogger(__name__)
+
+
+class LoadCheckpoint:
+    """Append-only record of the batches a load has committed.
+
+    Every batch is identified by its statement and the row offset it starts
+    at within that statement's stream, so a rerun over the same input with
+    the same batch sizes produces the same ``(statement, offset)`` pairs and
+    can skip the committed ones. Loaders record the settings those offsets
+    depend on with :meth:`require`; resuming with different settings raises
+    ``ValueError`` instead of skipping the wrong rows.
+
+    The file holds one JSON object per line and is flushed after every
+    entry. A line cut short by a crash is ignored on resume.
+    """
+
+    def __init__(self, path: Path, *, resume: bool = False) -> None:
+        self.path = Path(path)
+        self._settings: dict[str, Any] = {}
+        self._states: dict[tuple[str, int], str] = {}
+        self._lock = threading.Lock()
+        if resume and self.path.is_file():
+            self._read()
+            self._file: TextIO = self.path.open("a", encoding="utf-8")
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("w", encoding="utf-8")
+            self._append({"version": CHECKPOINT_VERSION})
+
+    def _read(self) -> None:
+        with self.path.open(encoding="utf-8") as handle:
+            lines = handle.read().splitlines()
+        if not lines or json.loads(lines[0]).get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported load checkpoint in {self.path}")
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Ignoring truncated checkpoint entry in %s", self.path)
+                continue
+            if "setting" in entry:
+                self._settings[entry["setting"]] = entry["value"]
+            else:
+                self._states[(entry["statement"], entry["offset"])] = entry["state"]
+        logger.info("Resuming from %s: %d batches committed", self.path, self.completed)
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def require(self, setting: str, value: Any) -> None:
+        """Record ``setting`` or check it against the value recorded earlier."""
+        with self._lock:
+            if setting in self._settings:
+                if self._settings[setting] != value:
+                    raise ValueError(
+                        f"Checkpoint {self.path} was written with {setting}={self._settings[setting]!r}, "
+                        f"got {value!r}"
+                    )
+                return
+            self._settings[setting] = value
+            self._append({"setting": setting, "value": value})
+
+    def is_done(self, statement: str, offset: int) -> bool:
+        with self._lock:
+            return self._states.get((statement, offset)) == _DONE
+
+    def was_started(self, statement: str, offset: int) -> bool:
+        """Whether the batch was begun but not recorded as committed."""
+        with self._lock:
+            return self._states.get((statement, offset)) == _STARTED
+
+    def mark_started(self, statement: str, offset: int) -> None:
+        self._mark(statement, offset, _STARTED)
+
+    def mark_done(self, statement: str, offset: int) -> None:
+        self._mark(statement, offset, _DONE)
+
+    def _mark(self, statement: str, offset: int, state: str) -> None:
+        with self._lock:
+            self._states[(statement, offset)] = state
+            self._append({"statement": statement, "offset": offset, "state": state})
+
+    @property
+    def completed(self) -> int:
+        with self._lock:
+            return sum(state == _DONE for state in self._states.values())
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "LoadCheckpoint":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+__all__ = ["CHECKPOINT_VERSION", "LoadCheckpoint"]
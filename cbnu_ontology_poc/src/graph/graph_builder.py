@@ -1,74 +1,510 @@
 from __future__ import annotations
 
-from typing import Callable, Dict
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence
 
 import pandas as pd
 
 from src import config
 from src.etl import loaders
+from src.etl.validators import DATASET_LABELS, ValidationReport
 from src.ontology_schema import NODE_KEY_MAP, NODE_SCHEMAS, NodeLabel, RelType
 
-from .neo4j_client import Neo4jClient
+from .checkpoint import LoadCheckpoint
+from .neo4j_client import SERVER_COUNTERS, Neo4jClient, summary_counters
 
-DatasetLoader = Callable[[], pd.DataFrame]
+BatchLoader = Callable[[int, Optional[Sequence[str]]], Iterator[list[dict[str, Any]]]]
+WriteListener = Callable[[], None]
+LoadListener = Callable[["LoadReport"], None]
 
+DEFAULT_NODE_CHUNK_SIZE = 10_000
+DEFAULT_RELATIONSHIP_BATCH_SIZE = 10_000
 
-_DATASET_LOADERS: Dict[NodeLabel, DatasetLoader] = {
-    NodeLabel.STUDENT: loaders.load_students,
-    NodeLabel.COURSE: loaders.load_courses,
-    NodeLabel.BOOK: loaders.load_books,
-    NodeLabel.PROGRAM: loaders.load_programs,
-    NodeLabel.SCHOLARSHIP: loaders.load_scholarships,
-    NodeLabel.DEPARTMENT: loaders.load_departments,
+_RELATION_GROUP_COLUMNS = ["from_label", "rel_type", "to_label"]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    rows: int
+    batches: int
+    elapsed: float
+    skipped: int = 0
+    stage: str = ""
+    # Server-reported SERVER_COUNTERS summed over the stage's batches.
+    counters: dict[str, int] = field(default_factory=dict)
+    # Rows rejected by pre-load validation and never sent.
+    dropped: int = 0
+
+    @property
+    def rows_per_sec(self) -> float:
+        if self.elapsed <= 0:
+            return float(self.rows)
+        return self.rows / self.elapsed
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "rows_per_sec": self.rows_per_sec}
+
+
+def write_load_report(reports: Iterable[LoadReport], path: Path) -> None:
+    """Write stage reports as JSON: ``{"stages": [...], "totals": {...}}``."""
+    reports = list(reports)
+    totals: dict[str, Any] = {
+        "rows": sum(report.rows for report in reports),
+        "batches": sum(report.batches for report in reports),
+        "elapsed": sum(report.elapsed for report in reports),
+    }
+    for name in SERVER_COUNTERS:
+        totals[name] = sum(report.counters.get(name, 0) for report in reports)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(
+        json.dumps({"stages": [report.to_dict() for report in reports], "totals": totals}, indent=2),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, path)
+
+
+_DATASET_LOADERS: Dict[NodeLabel, BatchLoader] = {
+    NodeLabel.STUDENT: loaders.iter_students,
+    NodeLabel.COURSE: loaders.iter_courses,
+    NodeLabel.BOOK: loaders.iter_books,
+    NodeLabel.PROGRAM: loaders.iter_programs,
+    NodeLabel.SCHOLARSHIP: loaders.iter_scholarships,
+    NodeLabel.DEPARTMENT: loaders.iter_departments,
 }
 
 
+_LABEL_DATASETS: Dict[NodeLabel, str] = {label: dataset for dataset, label in DATASET_LABELS.items()}
+
+
+_write_listeners: list[Callable[[], Optional[WriteListener]]] = []
+_load_listeners: list[Callable[[], Optional[LoadListener]]] = []
+_listeners_lock = threading.Lock()
+
+
+def _listener_ref(listener: Callable[..., None]) -> Callable[[], Optional[Callable[..., None]]]:
+    # Bound methods are held weakly, so a listener never keeps its owner alive.
+    if hasattr(listener, "__self__") and hasattr(listener, "__func__"):
+        return weakref.WeakMethod(listener)  # type: ignore[arg-type]
+    return lambda: listener
+
+
+def add_write_listener(listener: WriteListener) -> None:
+    """Call ``listener()`` after every load that wrote to the graph.
+
+    Bound methods are held weakly, so registering ``cache.invalidate`` does
+    not keep ``cache`` alive.
+    """
+    with _listeners_lock:
+        _write_listeners.append(_listener_ref(listener))
+
+
+def remove_write_listener(listener: WriteListener) -> None:
+    with _listeners_lock:
+        _write_listeners[:] = [ref for ref in _write_listeners if ref() not in (None, listener)]
+
+
+def add_load_listener(listener: LoadListener) -> None:
+    """Call ``listener(report)`` with the :class:`LoadReport` of every finished load stage.
+
+    Bound methods are held weakly, as in :func:`add_write_listener`.
+    """
+    with _listeners_lock:
+        _load_listeners.append(_listener_ref(listener))
+
+
+def remove_load_listener(listener: LoadListener) -> None:
+    with _listeners_lock:
+        _load_listeners[:] = [ref for ref in _load_listeners if ref() not in (None, listener)]
+
+
+def _notify_stage(report: LoadReport) -> None:
+    with _listeners_lock:
+        listeners = [ref() for ref in _load_listeners]
+        _load_listeners[:] = [ref for ref, fn in zip(_load_listeners, listeners) if fn is not None]
+    for listener in listeners:
+        if listener is not None:
+            listener(report)
+
+
+def notify_graph_written() -> None:
+    with _listeners_lock:
+        listeners = [ref() for ref in _write_listeners]
+        _write_listeners[:] = [ref for ref, fn in zip(_write_listeners, listeners) if fn is not None]
+    for listener in listeners:
+        if listener is not None:
+            listener()
+
+
 def clear_database(client: Neo4jClient) -> None:
-    client.run("MATCH (n) DETACH DELETE n")
+    try:
+        client.run("MATCH (n) DETACH DELETE n")
+    finally:
+        notify_graph_written()
+
+
+def node_cypher(label: NodeLabel) -> str:
+    """Statement upserting a batch of ``label`` rows (``$rows``) by their key."""
+    key = NODE_SCHEMAS[label].key
+    return (
+        f"UNWIND $rows AS row\n"
+        f"MERGE (n:{label.value} {{{key}: row.{key}}})\n"
+        f"SET n += row"
+    )
+
+
+def _node_batches(
+    label: NodeLabel, chunk_size: int, validation: Optional[ValidationReport] = None
+) -> Iterator[list[dict[str, Any]]]:
+    batches = _DATASET_LOADERS[label](chunk_size, NODE_SCHEMAS[label].properties)
+    if validation is None:
+        return batches
+    return validation.filter_batches(_LABEL_DATASETS[label], batches)
 
 
-def load_nodes(client: Neo4jClient) -> None:
-    for label, loader in _DATASET_LOADERS.items():
-        schema = NODE_SCHEMAS[label]
-        df = loader()
-        if df.empty:
+def _require_validation(
+    checkpoint: Optional[LoadCheckpoint], setting: str, validation: Optional[ValidationReport], datasets: Iterable[str]
+) -> int:
+    # Dropped rows shift every later batch offset, so a checkpoint is only
+    # valid for the same validation outcome.
+    dropped = {dataset: validation.dropped(dataset) for dataset in datasets} if validation is not None else {}
+    if checkpoint is not None:
+        checkpoint.require(setting, dropped)
+    return sum(dropped.values())
+
+
+def write_rows(client: Neo4jClient, cypher: str, rows: list[dict[str, Any]]) -> int:
+    """Run ``cypher`` with ``rows`` as ``$rows`` in a managed write; returns the row count."""
+    client.execute_write(cypher, {"rows": rows})
+    return len(rows)
+
+
+def _with_offsets(
+    batches: Iterable[tuple[str, list[dict[str, Any]]]],
+) -> Iterator[tuple[str, int, list[dict[str, Any]]]]:
+    # A batch's checkpoint position: rows of its statement sent before it.
+    offsets: dict[str, int] = {}
+    for cypher, rows in batches:
+        offset = offsets.get(cypher, 0)
+        offsets[cypher] = offset + len(rows)
+        yield cypher, offset, rows
+
+
+def _write_checkpointed(
+    client: Neo4jClient,
+    cypher: str,
+    offset: int,
+    rows: list[dict[str, Any]],
+    checkpoint: Optional[LoadCheckpoint],
+) -> dict[str, int]:
+    result = client.execute_write(cypher, {"rows": rows})
+    if checkpoint is not None:
+        checkpoint.mark_done(cypher, offset)
+    return summary_counters(result.summary)
+
+
+def _add_counters(totals: dict[str, int], counters: dict[str, int]) -> None:
+    for name, value in counters.items():
+        totals[name] = totals.get(name, 0) + value
+
+
+def _all_node_batches(
+    chunk_size: int, validation: Optional[ValidationReport]
+) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+    for label in _DATASET_LOADERS:
+        cypher = node_cypher(label)
+        for rows in _node_batches(label, chunk_size, validation):
+            yield cypher, rows
+
+
+def _load_nodes_parallel(
+    client: Neo4jClient,
+    chunk_size: int,
+    max_workers: int,
+    checkpoint: Optional[LoadCheckpoint],
+    validation: Optional[ValidationReport],
+) -> tuple[int, int, int, dict[str, int]]:
+    # Readers stream each CSV while writers send its batches; the semaphore
+    # caps the batches held in memory at once.
+    slots = threading.BoundedSemaphore(max_workers * 2)
+    failed = threading.Event()
+
+    def write(cypher: str, offset: int, rows: list[dict[str, Any]]) -> tuple[int, dict[str, int]]:
+        try:
+            return len(rows), _write_checkpointed(client, cypher, offset, rows, checkpoint)
+        except BaseException:
+            failed.set()
+            raise
+        finally:
+            slots.release()
+
+    def read(label: NodeLabel) -> tuple[list[Future[tuple[int, dict[str, int]]]], int]:
+        cypher = node_cypher(label)
+        writes: list[Future[tuple[int, dict[str, int]]]] = []
+        skipped = 0
+        offset = 0
+        for rows in _node_batches(label, chunk_size, validation):
+            offset, batch_offset = offset + len(rows), offset
+            if checkpoint is not None and checkpoint.is_done(cypher, batch_offset):
+                skipped += 1
+                continue
+            slots.acquire()
+            if failed.is_set():
+                slots.release()
+                break
+            writes.append(writer_pool.submit(write, cypher, batch_offset, rows))
+        return writes, skipped
+
+    rows_sent = 0
+    batches = 0
+    skipped = 0
+    counters: dict[str, int] = {}
+    reader_count = min(max_workers, len(_DATASET_LOADERS))
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="load-nodes-write") as writer_pool:
+        with ThreadPoolExecutor(reader_count, thread_name_prefix="load-nodes-read") as reader_pool:
+            reads = [reader_pool.submit(read, label) for label in _DATASET_LOADERS]
+            try:
+                for read_future in reads:
+                    writes, read_skipped = read_future.result()
+                    skipped += read_skipped
+                    for write_future in writes:
+                        rows, batch_counters = write_future.result()
+                        rows_sent += rows
+                        batches += 1
+                        _add_counters(counters, batch_counters)
+            except BaseException:
+                failed.set()
+                raise
+    return rows_sent, batches, skipped, counters
+
+
+def load_nodes(
+    client: Neo4jClient,
+    *,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_NODE_CHUNK_SIZE,
+    checkpoint: Optional[LoadCheckpoint] = None,
+    validation: Optional[ValidationReport] = None,
+) -> LoadReport:
+    """Merge every node dataset into the graph.
+
+    Each CSV is streamed in batches of ``chunk_size`` rows, so memory stays
+    flat regardless of file size. With ``parallel=True`` the CSVs are read and
+    their batches written concurrently by ``max_workers`` writer threads
+    (default ``config.LOAD_WORKERS``).
+    Each label is keyed by its uniqueness constraint, so the result matches
+    the sequential path as long as ``create_constraints`` has run.
+    Every batch runs in a retrying managed write transaction. With a
+    ``checkpoint`` each committed batch is recorded there, and batches it
+    already lists are skipped, so a failed load resumes where it stopped.
+    The report, including the server's update counters, is also passed to
+    every :func:`add_load_listener` listener.
+    With a ``validation`` report from :func:`src.etl.validators.validate_data_dir`
+    the rows it rejected are dropped before batching and never sent.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    if checkpoint is not None:
+        checkpoint.require("load_nodes.chunk_size", chunk_size)
+    dropped = _require_validation(checkpoint, "load_nodes.dropped", validation, _LABEL_DATASETS.values())
+
+    started = time.perf_counter()
+    try:
+        if parallel:
+            workers = config.LOAD_WORKERS if max_workers is None else max_workers
+            if workers <= 0:
+                raise ValueError(f"max_workers must be positive, got {workers}")
+            rows_sent, batches, skipped, counters = _load_nodes_parallel(
+                client, chunk_size, workers, checkpoint, validation
+            )
+        else:
+            rows_sent = 0
+            batches = 0
+            skipped = 0
+            counters = {}
+            with client.session():
+                for cypher, offset, rows in _with_offsets(_all_node_batches(chunk_size, validation)):
+                    if checkpoint is not None and checkpoint.is_done(cypher, offset):
+                        skipped += 1
+                        continue
+                    _add_counters(counters, _write_checkpointed(client, cypher, offset, rows, checkpoint))
+                    rows_sent += len(rows)
+                    batches += 1
+    finally:
+        # Partial loads also leave the graph changed.
+        notify_graph_written()
+
+    report = LoadReport(
+        rows=rows_sent,
+        batches=batches,
+        elapsed=time.perf_counter() - started,
+        skipped=skipped,
+        stage="nodes",
+        counters=counters,
+        dropped=dropped,
+    )
+    logger.info(
+        "Loaded %d nodes in %d batches (%.0f rows/sec, %d checkpointed batches skipped, "
+        "%d invalid rows dropped, %d nodes created, %d properties set)",
+        report.rows,
+        report.batches,
+        report.rows_per_sec,
+        report.skipped,
+        report.dropped,
+        counters.get("nodes_created", 0),
+        counters.get("properties_set", 0),
+    )
+    _notify_stage(report)
+    return report
+
+
+def relationship_cypher(from_label: NodeLabel, rel_type: RelType, to_label: NodeLabel) -> str:
+    """Statement merging a batch of ``from_id``/``to_id`` rows as ``rel_type`` relationships."""
+    from_key = NODE_KEY_MAP[from_label]
+    to_key = NODE_KEY_MAP[to_label]
+    return (
+        f"UNWIND $rows AS row\n"
+        f"MATCH (from:{from_label.value} {{{from_key}: row.from_id}})\n"
+        f"MATCH (to:{to_label.value} {{{to_key}: row.to_id}})\n"
+        f"MERGE (from)-[:{rel_type.value}]->(to)"
+    )
+
+
+def _parse_relation_group(group: tuple[Any, Any, Any]) -> tuple[NodeLabel, RelType, NodeLabel]:
+    raw_from, raw_rel, raw_to = group
+    try:
+        return NodeLabel(raw_from), RelType(raw_rel), NodeLabel(raw_to)
+    except ValueError as exc:
+        raise ValueError(
+            f"Invalid label or relationship type in group: ({raw_from})-[:{raw_rel}]->({raw_to})"
+        ) from exc
+
+
+RelationshipCypher = Callable[[NodeLabel, RelType, NodeLabel], str]
+
+
+def relationship_batches(
+    chunks: Iterable[pd.DataFrame],
+    batch_size: int,
+    cypher_for: RelationshipCypher = relationship_cypher,
+) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+    """``(cypher, rows)`` batches of relation ``chunks``, one statement per relationship group."""
+    # Relation rows arrive in chunks; they are buffered per
+    # (from_label, rel_type, to_label) group and flushed as full batches.
+    buffers: dict[tuple[Any, Any, Any], list[dict[str, Any]]] = {}
+    cyphers: dict[tuple[Any, Any, Any], str] = {}
+    for chunk in chunks:
+        if chunk.empty:
             continue
+        for group, rows in chunk.groupby(_RELATION_GROUP_COLUMNS, sort=False, dropna=False, observed=True):
+            if group not in cyphers:
+                from_label, rel_type, to_label = _parse_relation_group(group)
+                cyphers[group] = cypher_for(from_label, rel_type, to_label)
+            buffer = buffers.setdefault(group, [])
+            buffer.extend(rows.loc[:, ["from_id", "to_id"]].to_dict("records"))
+            while len(buffer) >= batch_size:
+                yield cyphers[group], buffer[:batch_size]
+                del buffer[:batch_size]
+    for group, buffer in buffers.items():
+        if buffer:
+            yield cyphers[group], buffer
 
-        records = df.loc[:, schema.properties].to_dict("records")
-        cypher = (
-            f"UNWIND $rows AS row\n"
-            f"MERGE (n:{label.value} {{{schema.key}: row.{schema.key}}})\n"
-            f"SET n += row"
-        )
-        client.run(cypher, {"rows": records})
 
+def load_relationships(
+    client: Neo4jClient,
+    batch_size: int = DEFAULT_RELATIONSHIP_BATCH_SIZE,
+    checkpoint: Optional[LoadCheckpoint] = None,
+    validation: Optional[ValidationReport] = None,
+) -> LoadReport:
+    """Merge ``relations.csv`` into the graph, one batch per relationship group.
+
+    Batches run in retrying managed write transactions; ``checkpoint``, the
+    load listeners and ``validation`` work as in :func:`load_nodes`, so
+    relations with dangling endpoints or unknown labels are never sent.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    if checkpoint is not None:
+        checkpoint.require("load_relationships.batch_size", batch_size)
+    dropped = _require_validation(checkpoint, "load_relationships.dropped", validation, ["relations"])
 
-def load_relationships(client: Neo4jClient) -> None:
     relations_path = config.DATA_DIR / "relations.csv"
     if not relations_path.is_file():
         raise FileNotFoundError(f"relations.csv not found in data directory: {relations_path}")
 
-    df = pd.read_csv(relations_path)
-    if df.empty:
-        return
+    started = time.perf_counter()
+    rows_sent = 0
+    batches = 0
+    skipped = 0
+    counters: dict[str, int] = {}
+    try:
+        with client.session():
+            chunks = loaders.iter_relation_chunks(batch_size)
+            if validation is not None:
+                chunks = validation.filter_chunks("relations", chunks)
+            grouped = relationship_batches(chunks, batch_size)
+            for cypher, offset, rows in _with_offsets(grouped):
+                if checkpoint is not None and checkpoint.is_done(cypher, offset):
+                    skipped += 1
+                    continue
+                _add_counters(counters, _write_checkpointed(client, cypher, offset, rows, checkpoint))
+                rows_sent += len(rows)
+                batches += 1
+    finally:
+        notify_graph_written()
 
-    for row in df.to_dict("records"):
-        try:
-            from_label = NodeLabel(row["from_label"])
-            to_label = NodeLabel(row["to_label"])
-            rel_type = RelType(row["rel_type"])
-        except ValueError as exc:  # pragma: no cover - invalid schema definitions
-            raise ValueError(f"Invalid label or relationship type in row: {row}") from exc
-
-        from_key = NODE_KEY_MAP[from_label]
-        to_key = NODE_KEY_MAP[to_label]
-        parameters = {"from_id": row["from_id"], "to_id": row["to_id"]}
-        cypher = (
-            f"MATCH (from:{from_label.value} {{{from_key}: $from_id}})\n"
-            f"MATCH (to:{to_label.value} {{{to_key}: $to_id}})\n"
-            f"MERGE (from)-[:{rel_type.value}]->(to)"
-        )
-        client.run(cypher, parameters)
-
-
-__all__ = ["clear_database", "load_nodes", "load_relationships"]
+    report = LoadReport(
+        rows=rows_sent,
+        batches=batches,
+        elapsed=time.perf_counter() - started,
+        skipped=skipped,
+        stage="relationships",
+        counters=counters,
+        dropped=dropped,
+    )
+    logger.info(
+        "Loaded %d relationships in %d batches (%.0f rows/sec, %d checkpointed batches skipped, "
+        "%d invalid rows dropped, %d relationships created)",
+        report.rows,
+        report.batches,
+        report.rows_per_sec,
+        report.skipped,
+        report.dropped,
+        counters.get("relationships_created", 0),
+    )
+    _notify_stage(report)
+    return report
+
+
+__all__ = [
+    "DEFAULT_NODE_CHUNK_SIZE",
+    "DEFAULT_RELATIONSHIP_BATCH_SIZE",
+    "LoadListener",
+    "LoadReport",
+    "RelationshipCypher",
+    "WriteListener",
+    "add_load_listener",
+    "add_write_listener",
+    "clear_database",
+    "load_nodes",
+    "load_relationships",
+    "node_cypher",
+    "notify_graph_written",
+    "remove_load_listener",
+    "relationship_batches",
+    "relationship_cypher",
+    "remove_write_listener",
+    "write_load_report",
+    "write_rows",
+]
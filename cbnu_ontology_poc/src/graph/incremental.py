@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Mapping, Optional
+
+import pandas as pd
+
+from src import config
+from src.etl import loaders
+from src.ontology_schema import NODE_KEY_MAP, NODE_SCHEMAS, NodeLabel, RelType
+
+from .graph_builder import (
+    DEFAULT_RELATIONSHIP_BATCH_SIZE,
+    node_cypher,
+    notify_graph_written,
+    relationship_batches,
+    write_rows,
+)
+from .neo4j_client import Neo4jClient
+
+MANIFEST_VERSION = 1
+RELATIONS_DATASET = "relations"
+
+_NODE_DATASETS: dict[NodeLabel, str] = {
+    NodeLabel.STUDENT: "students",
+    NodeLabel.COURSE: "courses",
+    NodeLabel.BOOK: "books",
+    NodeLabel.PROGRAM: "programs",
+    NodeLabel.SCHOLARSHIP: "scholarships",
+    NodeLabel.DEPARTMENT: "departments",
+}
+
+_RELATION_COLUMNS = ["from_label", "from_id", "rel_type", "to_label", "to_id"]
+# Unit separator: cannot appear in the CSV identifiers, so keys split back cleanly.
+_KEY_SEPARATOR = "\x1f"
+
+Manifest = dict[str, dict[str, str]]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DatasetDelta:
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+    @property
+    def changed(self) -> int:
+        return self.inserted + self.updated + self.deleted
+
+
+@dataclass(frozen=True)
+class SyncReport:
+    datasets: dict[str, DatasetDelta]
+    elapsed: float
+    # Keys per label value of the nodes upserted or deleted, and of both
+    # endpoints of every relationship inserted or deleted.
+    touched: dict[str, frozenset[str]] = field(default_factory=dict)
+
+    @property
+    def rows_changed(self) -> int:
+        return sum(delta.changed for delta in self.datasets.values())
+
+
+def manifest_path() -> Path:
+    return config.LOAD_MANIFEST_PATH or config.DATA_DIR / ".load_manifest.json"
+
+
+def read_manifest(path: Optional[Path] = None) -> Manifest:
+    path = path or manifest_path()
+    if not path.is_file():
+        return {}
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if payload.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported load manifest version in {path}: {payload.get('version')!r}")
+    return payload["datasets"]
+
+
+def write_manifest(manifest: Manifest, path: Optional[Path] = None) -> None:
+    path = path or manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(
+        json.dumps({"version": MANIFEST_VERSION, "datasets": manifest}),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, path)
+
+
+def _row_hashes(chunk: pd.DataFrame, columns: list[str]) -> pd.Series:
+    return pd.util.hash_pandas_object(chunk.loc[:, columns], index=False).astype(str)
+
+
+def _changed_mask(keys: pd.Series, hashes: pd.Series, previous: pd.Series) -> tuple[Any, Any]:
+    before = previous.reindex(keys.to_numpy()).to_numpy()
+    is_new = pd.isna(before)
+    changed = is_new | (before != hashes.to_numpy())
+    return is_new, changed
+
+
+def _sync_node_label(
+    client: Neo4jClient,
+    label: NodeLabel,
+    previous: Mapping[str, str],
+    batch_size: int,
+) -> tuple[DatasetDelta, dict[str, str], list[str], list[str]]:
+    schema = NODE_SCHEMAS[label]
+    properties = list(schema.properties)
+    filename = loaders.dataset_filename(_NODE_DATASETS[label])
+    before = pd.Series(previous, dtype=object)
+    current: dict[str, str] = {}
+    upserted: list[str] = []
+    cypher = node_cypher(label)
+    for chunk in loaders.iter_csv_chunks(filename, batch_size, columns=properties):
+        keys = chunk[schema.key].astype(str)
+        hashes = _row_hashes(chunk, properties)
+        _, changed = _changed_mask(keys, hashes, before)
+        current.update(zip(keys, hashes))
+        if changed.any():
+            upserted.extend(keys[changed])
+            write_rows(client, cypher, loaders.frame_records(chunk.loc[changed, properties]))
+
+    # Counted from the final rows so a key repeated in the CSV counts once.
+    is_new, changed = _changed_mask(pd.Series(list(current)), pd.Series(list(current.values())), before)
+    deleted = [key for key in before.index if key not in current]
+    delta = DatasetDelta(int(is_new.sum()), int((changed & ~is_new).sum()), len(deleted))
+    return delta, current, list(dict.fromkeys(upserted)), deleted
+
+
+def _relation_keys(chunk: pd.DataFrame) -> pd.Series:
+    keys = chunk[_RELATION_COLUMNS[0]].astype(str)
+    for column in _RELATION_COLUMNS[1:]:
+        keys = keys + _KEY_SEPARATOR + chunk[column].astype(str)
+    return keys
+
+
+def _relationship_delete_cypher(from_label: NodeLabel, rel_type: RelType, to_label: NodeLabel) -> str:
+    from_key = NODE_KEY_MAP[from_label]
+    to_key = NODE_KEY_MAP[to_label]
+    return (
+        f"UNWIND $rows AS row\n"
+        f"MATCH (from:{from_label.value} {{{from_key}: row.from_id}})"
+        f"-[r:{rel_type.value}]->"
+        f"(to:{to_label.value} {{{to_key}: row.to_id}})\n"
+        f"DELETE r"
+    )
+
+
+def _touch_endpoints(touched: dict[str, set[str]], rows: pd.DataFrame) -> None:
+    for label_column, id_column in (("from_label", "from_id"), ("to_label", "to_id")):
+        for label, ids in rows.groupby(label_column, sort=False, observed=True)[id_column]:
+            touched.setdefault(str(label), set()).update(ids.astype(str))
+
+
+def _sync_relationships(
+    client: Neo4jClient,
+    previous: Mapping[str, str],
+    batch_size: int,
+    touched: dict[str, set[str]],
+) -> tuple[DatasetDelta, dict[str, str]]:
+    known = pd.Index(list(previous.keys()), dtype=object)
+    current: dict[str, str] = {}
+    inserted = 0
+
+    def new_rows() -> Iterator[pd.DataFrame]:
+        nonlocal inserted
+        for chunk in loaders.iter_relation_chunks(batch_size):
+            if chunk.empty:
+                continue
+            keys = _relation_keys(chunk)
+            seen = keys.map(current.__contains__).astype(bool)
+            fresh = ~keys.isin(known) & ~keys.duplicated() & ~seen
+            current.update(dict.fromkeys(keys, ""))
+            inserted += int(fresh.sum())
+            rows = chunk.loc[fresh.to_numpy()]
+            _touch_endpoints(touched, rows)
+            yield rows
+
+    for cypher, rows in relationship_batches(new_rows(), batch_size):
+        write_rows(client, cypher, rows)
+
+    deleted_keys = [key for key in previous if key not in current]
+    if deleted_keys:
+        removed = pd.DataFrame(
+            [key.split(_KEY_SEPARATOR) for key in deleted_keys],
+            columns=_RELATION_COLUMNS,
+        )
+        _touch_endpoints(touched, removed)
+        for cypher, rows in relationship_batches(
+            [removed], batch_size, cypher_for=_relationship_delete_cypher
+        ):
+            write_rows(client, cypher, rows)
+    return DatasetDelta(inserted=inserted, deleted=len(deleted_keys)), current
+
+
+def _delete_nodes(client: Neo4jClient, label: NodeLabel, keys: list[str], batch_size: int) -> None:
+    key = NODE_KEY_MAP[label]
+    cypher = (
+        f"UNWIND $keys AS key\n"
+        f"MATCH (n:{label.value} {{{key}: key}})\n"
+        f"DETACH DELETE n"
+    )
+    for offset in range(0, len(keys), batch_size):
+        client.run(cypher, {"keys": keys[offset : offset + batch_size]})
+
+
+def sync_graph(
+    client: Neo4jClient,
+    batch_size: int = DEFAULT_RELATIONSHIP_BATCH_SIZE,
+    manifest_file: Optional[Path] = None,
+) -> SyncReport:
+    """Apply only the rows that changed since the last recorded load.
+
+    Rows are compared with the key -> hash manifest written by the previous
+    sync. Node upserts run first, then relationship removals and inserts,
+    then node deletions. ``SyncReport.touched`` lists the keys of every node
+    whose properties or relationships changed. The new manifest is written
+    only after every change has been applied, so a failed sync is simply
+    retried in full next time.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+    started = time.perf_counter()
+    previous = read_manifest(manifest_file)
+    manifest: Manifest = {}
+    deltas: dict[str, DatasetDelta] = {}
+    pending_deletes: dict[NodeLabel, list[str]] = {}
+    touched: dict[str, set[str]] = {}
+
+    try:
+        with client.session():
+            for label, dataset in _NODE_DATASETS.items():
+                delta, hashes, upserted, deleted = _sync_node_label(
+                    client, label, previous.get(dataset, {}), batch_size
+                )
+                deltas[dataset] = delta
+                manifest[dataset] = hashes
+                pending_deletes[label] = deleted
+                touched.setdefault(label.value, set()).update(upserted, deleted)
+
+            delta, keys = _sync_relationships(
+                client, previous.get(RELATIONS_DATASET, {}), batch_size, touched
+            )
+            deltas[RELATIONS_DATASET] = delta
+            manifest[RELATIONS_DATASET] = keys
+
+            for label, deleted in pending_deletes.items():
+                _delete_nodes(client, label, deleted, batch_size)
+    finally:
+        notify_graph_written()
+
+    write_manifest(manifest, manifest_file)
+    report = SyncReport(
+        datasets=deltas,
+        elapsed=time.perf_counter() - started,
+        touched={label: frozenset(keys) for label, keys in touched.items() if keys},
+    )
+    logger.info(
+        "Synced %d changed rows in %.2fs: %s",
+        report.rows_changed,
+        report.elapsed,
+        ", ".join(
+            f"{name} +{d.inserted}/~{d.updated}/-{d.deleted}" for name, d in deltas.items()
+        ),
+    )
+    return report
+
+
+__all__ = [
+    "DatasetDelta",
+    "SyncReport",
+    "manifest_path",
+    "read_manifest",
+    "sync_graph",
+    "write_manifest",
+]
@@ -0,0 +1,2413 @@
+"""In-memory property graph that runs the Cypher subset issued by this project.
+
+``InMemoryGraphClient`` exposes the same ``run``/``session``/``transaction``/
+``run_many`` surface as :class:`~src.graph.neo4j_client.Neo4jClient`, so the
+graph builder and query modules can run against it without a database server.
+Nodes are indexed by label and lazily by ``(label, property)`` hash indexes,
+and relationships are kept in per-type adjacency maps in both directions.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, Sequence
+
+from .neo4j_client import QueryResult, Statement, _normalize_statement
+from .profiling import QueryProfiler
+
+Row = dict
+Evaluator = Callable[[Row, Mapping[str, Any]], Any]
+
+
+class CypherError(Exception):
+    """Raised for statements the in-memory engine cannot parse or execute."""
+
+    code = "Neo.ClientError.Statement.SyntaxError"
+
+
+class ConstraintError(CypherError):
+    code = "Neo.ClientError.Schema.ConstraintValidationFailed"
+
+
+# ---------------------------------------------------------------------------
+# Graph entities and results
+# ---------------------------------------------------------------------------
+
+
+class _Entity:
+    __slots__ = ("id", "_properties")
+
+    def __init__(self, entity_id: int, properties: dict[str, Any]) -> None:
+        self.id = entity_id
+        self._properties = properties
+
+    @property
+    def element_id(self) -> str:
+        return str(self.id)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._properties[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._properties
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._properties)
+
+    def __len__(self) -> int:
+        return len(self._properties)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._properties.get(key, default)
+
+    def keys(self):
+        return self._properties.keys()
+
+    def values(self):
+        return self._properties.values()
+
+    def items(self):
+        return self._properties.items()
+
+
+class Node(_Entity):
+    __slots__ = ("labels",)
+
+    def __init__(self, node_id: int, labels: Iterable[str], properties: dict[str, Any]) -> None:
+        super().__init__(node_id, properties)
+        self.labels = set(labels)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Node) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return self.id
+
+    def __repr__(self) -> str:
+        labels = "".join(f":{label}" for label in sorted(self.labels))
+        return f"<Node id={self.id} labels={labels} properties={self._properties!r}>"
+
+    def _snapshot(self) -> "Node":
+        return Node(self.id, frozenset(self.labels), dict(self._properties))
+
+
+class Relationship(_Entity):
+    __slots__ = ("type", "start_node", "end_node")
+
+    def __init__(
+        self,
+        rel_id: int,
+        rel_type: str,
+        start_node: Node,
+        end_node: Node,
+        properties: dict[str, Any],
+    ) -> None:
+        super().__init__(rel_id, properties)
+        self.type = rel_type
+        self.start_node = start_node
+        self.end_node = end_node
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Relationship) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return ~self.id
+
+    def __repr__(self) -> str:
+        return (
+            f"<Relationship id={self.id} type={self.type} "
+            f"start={self.start_node.id} end={self.end_node.id}>"
+        )
+
+    def _snapshot(self) -> "Relationship":
+        return Relationship(
+            self.id,
+            self.type,
+            self.start_node._snapshot(),
+            self.end_node._snapshot(),
+            dict(self._properties),
+        )
+
+
+class Record(dict):
+    """Result row; behaves like ``neo4j.Record`` for the accessors used here."""
+
+    def value(self, key: int | str = 0, default: Any = None) -> Any:
+        if isinstance(key, int):
+            values = list(self.values())
+            return values[key] if key < len(values) else default
+        return self.get(key, default)
+
+    def data(self) -> dict[str, Any]:
+        return dict(self)
+
+
+@dataclass
+class Counters:
+    nodes_created: int = 0
+    nodes_deleted: int = 0
+    relationships_created: int = 0
+    relationships_deleted: int = 0
+    properties_set: int = 0
+    labels_added: int = 0
+    labels_removed: int = 0
+    indexes_added: int = 0
+    indexes_removed: int = 0
+    constraints_added: int = 0
+    constraints_removed: int = 0
+
+    @property
+    def contains_updates(self) -> bool:
+        return any(getattr(self, f.name) for f in fields(self))
+
+
+@dataclass
+class ResultSummary:
+    query: str
+    parameters: dict[str, Any]
+    counters: Counters
+    query_type: str = "r"
+    profile: Optional[dict[str, Any]] = None
+
+
+# ---------------------------------------------------------------------------
+# Value helpers
+# ---------------------------------------------------------------------------
+
+
+def _hash_key(value: Any) -> Any:
+    """Hashable key with Cypher equality semantics (booleans never equal numbers)."""
+    cls = type(value)
+    if cls is str or cls is int or cls is Node or cls is Relationship or value is None:
+        return value
+    if isinstance(value, bool):
+        return ("\0bool", value)
+    if isinstance(value, (list, tuple)):
+        return ("\0list", tuple(_hash_key(item) for item in value))
+    if isinstance(value, dict):
+        return ("\0map", tuple(sorted((k, _hash_key(v)) for k, v in value.items())))
+    if isinstance(value, float) and value != value:
+        return "\0nan"
+    return value
+
+
+def _equals(left: Any, right: Any) -> Optional[bool]:
+    if left is None or right is None:
+        return None
+    if isinstance(left, bool) != isinstance(right, bool):
+        return False
+    return _hash_key(left) == _hash_key(right) if isinstance(left, (list, dict)) else left == right
+
+
+def _order_key(value: Any) -> tuple:
+    if value is None:
+        return (9, 0)
+    if isinstance(value, bool):
+        return (3, value)
+    if isinstance(value, (int, float)):
+        return (4, value)
+    if isinstance(value, str):
+        return (2, value)
+    if isinstance(value, _Entity):
+        return (1, value.id)
+    if isinstance(value, (list, tuple)):
+        return (5, tuple(_order_key(item) for item in value))
+    return (0, str(value))
+
+
+def _snapshot(value: Any) -> Any:
+    if isinstance(value, _Entity):
+        return value._snapshot()
+    if isinstance(value, list):
+        return [_snapshot(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _snapshot(item) for key, item in value.items()}
+    return value
+
+
+def _properties_of(value: Any) -> Optional[Mapping[str, Any]]:
+    if value is None:
+        return None
+    if isinstance(value, (dict, _Entity)):
+        return value if isinstance(value, dict) else value._properties
+    if isinstance(value, Mapping):
+        return value
+    raise CypherError(f"Expected a map, node or relationship, got {type(value).__name__}")
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class IndexInfo:
+    name: str
+    label: str
+    properties: tuple[str, ...]
+    index_type: str = "RANGE"
+    unique: bool = False
+
+
+class InMemoryGraph:
+    """Node/relationship store with label, property and adjacency indexes."""
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self._nodes: dict[int, Node] = {}
+        self._relationships: dict[int, Relationship] = {}
+        self._labels: dict[str, dict[int, Node]] = {}
+        self._property_index: dict[tuple[str, str], dict[Any, dict[int, Node]]] = {}
+        self._indexed_keys: dict[str, set[str]] = {}
+        self._unique: set[tuple[str, str]] = set()
+        self._outgoing: dict[int, dict[str, dict[int, Relationship]]] = {}
+        self._incoming: dict[int, dict[str, dict[int, Relationship]]] = {}
+        self.schema: dict[str, IndexInfo] = {}
+        self._next_node_id = 0
+        self._next_relationship_id = 0
+        self._journal: list[Callable[[], None]] = []
+
+    # -- introspection -----------------------------------------------------
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def relationship_count(self) -> int:
+        return len(self._relationships)
+
+    def nodes(self, label: Optional[str] = None) -> Iterable[Node]:
+        if label is None:
+            return self._nodes.values()
+        return self._labels.get(label, {}).values()
+
+    def label_size(self, label: str) -> int:
+        return len(self._labels.get(label, ()))
+
+    # -- indexes -----------------------------------------------------------
+
+    def _ensure_index(self, label: str, key: str) -> dict[Any, dict[int, Node]]:
+        index = self._property_index.get((label, key))
+        if index is None:
+            index = {}
+            for node in self._labels.get(label, {}).values():
+                value = node._properties.get(key)
+                if value is not None:
+                    index.setdefault(_hash_key(value), {})[node.id] = node
+            self._property_index[(label, key)] = index
+            self._indexed_keys.setdefault(label, set()).add(key)
+        return index
+
+    def lookup(self, label: str, key: str, value: Any) -> dict[int, Node]:
+        if value is None:
+            return {}
+        return self._ensure_index(label, key).get(_hash_key(value), {})
+
+    def _index_add(self, node: Node, label: str, key: str, value: Any) -> None:
+        if value is None or key not in self._indexed_keys.get(label, ()):
+            return
+        bucket = self._property_index[(label, key)].setdefault(_hash_key(value), {})
+        if (label, key) in self._unique and bucket and node.id not in bucket:
+            raise ConstraintError(
+                f"Node already exists with label `{label}` and property `{key}` = {value!r}"
+            )
+        bucket[node.id] = node
+
+    def _index_remove(self, node: Node, label: str, key: str, value: Any) -> None:
+        if value is None or key not in self._indexed_keys.get(label, ()):
+            return
+        index = self._property_index[(label, key)]
+        hashed = _hash_key(value)
+        bucket = index.get(hashed)
+        if bucket is not None:
+            bucket.pop(node.id, None)
+            if not bucket:
+                del index[hashed]
+
+    def add_index(self, info: IndexInfo) -> bool:
+        if info.name in self.schema:
+            return False
+        for existing in self.schema.values():
+            if (existing.label, existing.properties, existing.unique) == (
+                info.label,
+                info.properties,
+                info.unique,
+            ) and existing.index_type == info.index_type:
+                return False
+        for key in info.properties:
+            self._ensure_index(info.label, key)
+        if info.unique:
+            key = info.properties[0]
+            for bucket in self._property_index[(info.label, key)].values():
+                if len(bucket) > 1:
+                    raise ConstraintError(
+                        f"Existing data violates uniqueness of `{info.label}`.`{key}`"
+                    )
+            self._unique.add((info.label, key))
+        self.schema[info.name] = info
+        return True
+
+    def drop_index(self, name: str) -> Optional[IndexInfo]:
+        info = self.schema.pop(name, None)
+        if info is not None and info.unique:
+            self._unique.discard((info.label, info.properties[0]))
+        return info
+
+    # -- journal -------------------------------------------------------------
+
+    def _record_undo(self, undo: Callable[[], None]) -> None:
+        self._journal.append(undo)
+
+    def _journal_mark(self) -> int:
+        return len(self._journal)
+
+    def _rollback_to(self, mark: int) -> None:
+        while len(self._journal) > mark:
+            self._journal.pop()()
+
+    def _commit_journal(self) -> None:
+        self._journal.clear()
+
+    # -- mutations -----------------------------------------------------------
+
+    def create_node(self, labels: Iterable[str], properties: Mapping[str, Any], counters: Counters) -> Node:
+        node_id = self._next_node_id
+        self._next_node_id += 1
+        clean = {
+            key: list(value) if isinstance(value, tuple) else value
+            for key, value in properties.items()
+            if value is not None
+        }
+        node = Node(node_id, labels, clean)
+        self._nodes[node_id] = node
+        self._outgoing[node_id] = {}
+        self._incoming[node_id] = {}
+        # Registered before indexing so a constraint violation below is undone
+        # together with the rest of the statement.
+        self._record_undo(lambda: self._remove_node(node))
+        for label in node.labels:
+            self._labels.setdefault(label, {})[node_id] = node
+            for key in self._indexed_keys.get(label, ()):
+                self._index_add(node, label, key, clean.get(key))
+        counters.nodes_created += 1
+        counters.labels_added += len(node.labels)
+        counters.properties_set += len(clean)
+        return node
+
+    def _remove_node(self, node: Node) -> None:
+        for label in node.labels:
+            for key, value in node._properties.items():
+                self._index_remove(node, label, key, value)
+            self._labels[label].pop(node.id, None)
+        self._nodes.pop(node.id, None)
+        self._outgoing.pop(node.id, None)
+        self._incoming.pop(node.id, None)
+
+    def _restore_node(self, node: Node) -> None:
+        self._nodes[node.id] = node
+        self._outgoing.setdefault(node.id, {})
+        self._incoming.setdefault(node.id, {})
+        for label in node.labels:
+            self._labels.setdefault(label, {})[node.id] = node
+            for key, value in node._properties.items():
+                self._index_add(node, label, key, value)
+
+    def set_property(self, entity: _Entity, key: str, value: Any, counters: Counters) -> None:
+        if isinstance(value, tuple):
+            value = list(value)
+        old = entity._properties.get(key)
+        if old is None and value is None:
+            return
+        if type(old) is type(value) and old == value:
+            # Re-setting an equal value leaves indexes and the journal untouched.
+            counters.properties_set += 1
+            return
+        if isinstance(entity, Node):
+            for label in entity.labels:
+                self._index_remove(entity, label, key, old)
+            try:
+                for label in entity.labels:
+                    self._index_add(entity, label, key, value)
+            except ConstraintError:
+                for label in entity.labels:
+                    self._index_remove(entity, label, key, value)
+                    self._index_add(entity, label, key, old)
+                raise
+        if value is None:
+            del entity._properties[key]
+        else:
+            entity._properties[key] = value
+        self._record_undo(lambda: self._restore_property(entity, key, old))
+        counters.properties_set += 1
+
+    def update_properties(self, entity: _Entity, values: Mapping[str, Any], counters: Counters) -> None:
+        """``SET entity += values`` with a single journal entry for unindexed keys."""
+        properties = entity._properties
+        indexed: set[str] = set()
+        if isinstance(entity, Node):
+            for label in entity.labels:
+                indexed.update(self._indexed_keys.get(label, ()))
+        previous: dict[str, Any] = {}
+        for key, value in values.items():
+            if key in indexed:
+                self.set_property(entity, key, value, counters)
+                continue
+            if isinstance(value, tuple):
+                value = list(value)
+            old = properties.get(key)
+            if old is None and value is None:
+                continue
+            counters.properties_set += 1
+            if type(old) is type(value) and old == value:
+                continue
+            previous.setdefault(key, old)
+            if value is None:
+                del properties[key]
+            else:
+                properties[key] = value
+        if previous:
+            self._record_undo(lambda: self._restore_properties(entity, previous))
+
+    def _restore_properties(self, entity: _Entity, previous: Mapping[str, Any]) -> None:
+        for key, value in previous.items():
+            if value is None:
+                entity._properties.pop(key, None)
+            else:
+                entity._properties[key] = value
+
+    def _restore_property(self, entity: _Entity, key: str, value: Any) -> None:
+        current = entity._properties.get(key)
+        if isinstance(entity, Node):
+            for label in entity.labels:
+                self._index_remove(entity, label, key, current)
+                self._index_add(entity, label, key, value)
+        if value is None:
+            entity._properties.pop(key, None)
+        else:
+            entity._properties[key] = value
+
+    def add_label(self, node: Node, label: str, counters: Counters) -> None:
+        if label in node.labels:
+            return
+        for key, value in node._properties.items():
+            self._index_add(node, label, key, value)
+        node.labels.add(label)
+        self._labels.setdefault(label, {})[node.id] = node
+        self._record_undo(lambda: self._remove_label(node, label))
+        counters.labels_added += 1
+
+    def _remove_label(self, node: Node, label: str) -> None:
+        for key, value in node._properties.items():
+            self._index_remove(node, label, key, value)
+        node.labels.discard(label)
+        self._labels[label].pop(node.id, None)
+
+    def remove_label(self, node: Node, label: str, counters: Counters) -> None:
+        if label not in node.labels:
+            return
+        self._remove_label(node, label)
+        self._record_undo(lambda: self.add_label(node, label, Counters()))
+        counters.labels_removed += 1
+
+    def delete_node(self, node: Node, detach: bool, counters: Counters) -> None:
+        if node.id not in self._nodes:
+            return
+        attached = [
+            rel
+            for adjacency in (self._outgoing[node.id], self._incoming[node.id])
+            for by_id in adjacency.values()
+            for rel in by_id.values()
+        ]
+        if attached and not detach:
+            raise CypherError(
+                f"Cannot delete node<{node.id}>, because it still has relationships. "
+                "To delete this node, you must first delete its relationships."
+            )
+        for rel in attached:
+            self.delete_relationship(rel, counters)
+        self._remove_node(node)
+        self._record_undo(lambda: self._restore_node(node))
+        counters.nodes_deleted += 1
+
+    def create_relationship(
+        self,
+        rel_type: str,
+        start: Node,
+        end: Node,
+        properties: Mapping[str, Any],
+        counters: Counters,
+    ) -> Relationship:
+        rel_id = self._next_relationship_id
+        self._next_relationship_id += 1
+        rel = Relationship(rel_id, rel_type, start, end, {})
+        self._link(rel)
+        self._record_undo(lambda: self._unlink(rel))
+        counters.relationships_created += 1
+        for key, value in properties.items():
+            if value is not None:
+                self.set_property(rel, key, value, counters)
+        return rel
+
+    def _link(self, rel: Relationship) -> None:
+        self._relationships[rel.id] = rel
+        self._outgoing[rel.start_node.id].setdefault(rel.type, {})[rel.id] = rel
+        self._incoming[rel.end_node.id].setdefault(rel.type, {})[rel.id] = rel
+
+    def _unlink(self, rel: Relationship) -> None:
+        self._relationships.pop(rel.id, None)
+        self._outgoing.get(rel.start_node.id, {}).get(rel.type, {}).pop(rel.id, None)
+        self._incoming.get(rel.end_node.id, {}).get(rel.type, {}).pop(rel.id, None)
+
+    def delete_relationship(self, rel: Relationship, counters: Counters) -> None:
+        if rel.id not in self._relationships:
+            return
+        self._unlink(rel)
+        self._record_undo(lambda: self._link(rel))
+        counters.relationships_deleted += 1
+
+    # -- traversal -----------------------------------------------------------
+
+    def relationships(self, node: Node, types: Sequence[str], outgoing: bool) -> Iterator[Relationship]:
+        adjacency = (self._outgoing if outgoing else self._incoming).get(node.id)
+        if not adjacency:
+            return
+        if types:
+            for rel_type in types:
+                by_id = adjacency.get(rel_type)
+                if by_id:
+                    yield from list(by_id.values())
+        else:
+            for by_id in list(adjacency.values()):
+                yield from list(by_id.values())
+
+    def degree(self, node: Node, types: Sequence[str], outgoing: bool) -> int:
+        adjacency = (self._outgoing if outgoing else self._incoming).get(node.id)
+        if not adjacency:
+            return 0
+        if types:
+            return sum(len(adjacency.get(rel_type, ())) for rel_type in types)
+        return sum(len(by_id) for by_id in adjacency.values())
+
+    def all_relationships(self) -> Iterable[Relationship]:
+        return self._relationships.values()
+
+
+# ---------------------------------------------------------------------------
+# Lexer
+# ---------------------------------------------------------------------------
+
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<ws>\s+|//[^\n]*)
+    |(?P<number>\d+\.\d+(?:[eE][+-]?\d+)?|\d+[eE][+-]?\d+|\d+)
+    |(?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+    |(?P<param>\$[A-Za-z_][A-Za-z0-9_]*)
+    |(?P<ident>[A-Za-z_][A-Za-z0-9_]*|`[^`]+`)
+    |(?P<op><>|<=|>=|->|<-|\+=|=~|\.\.|!=|[-+*/%^=<>(){}\[\],.:|;])
+    """,
+    re.VERBOSE,
+)
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\", "'": "'", '"': '"', "b": "\b", "f": "\f"}
+
+
+@dataclass(frozen=True)
+class _Token:
+    kind: str
+    value: Any
+    start: int
+    end: int
+
+    @property
+    def upper(self) -> str:
+        return self.value.upper() if self.kind == "ident" else ""
+
+
+def _unescape(text: str) -> str:
+    out: list[str] = []
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char == "\\" and index + 1 < len(text):
+            out.append(_ESCAPES.get(text[index + 1], text[index + 1]))
+            index += 2
+        else:
+            out.append(char)
+            index += 1
+    return "".join(out)
+
+
+def _tokenize(query: str) -> list[_Token]:
+    tokens: list[_Token] = []
+    position = 0
+    while position < len(query):
+        match = _TOKEN_RE.match(query, position)
+        if match is None:
+            raise CypherError(f"Unexpected character {query[position]!r} at offset {position}")
+        kind = match.lastgroup or ""
+        text = match.group()
+        if kind == "number":
+            value: Any = float(text) if any(c in text for c in ".eE") else int(text)
+        elif kind == "string":
+            value = _unescape(text[1:-1])
+        elif kind == "param":
+            value = text[1:]
+        elif kind == "ident":
+            value = text[1:-1] if text.startswith("`") else text
+        else:
+            value = text
+        if kind != "ws":
+            tokens.append(_Token(kind, value, match.start(), match.end()))
+        position = match.end()
+    tokens.append(_Token("eof", None, len(query), len(query)))
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# AST
+# ---------------------------------------------------------------------------
+
+_AGGREGATES = frozenset({"count", "collect", "sum", "avg", "min", "max"})
+
+
+@dataclass
+class _Expr:
+    kind: str
+    args: tuple = ()
+    text: str = ""
+
+
+@dataclass
+class _NodePattern:
+    var: Optional[str]
+    labels: tuple[str, ...]
+    properties: tuple[tuple[str, _Expr], ...]
+
+
+@dataclass
+class _RelPattern:
+    var: Optional[str]
+    types: tuple[str, ...]
+    direction: str  # "out", "in" or "both"
+    properties: tuple[tuple[str, _Expr], ...]
+
+
+@dataclass
+class _Path:
+    nodes: list[_NodePattern]
+    relationships: list[_RelPattern]
+
+
+@dataclass
+class _ProjectionItem:
+    expr: _Expr
+    alias: str
+
+
+@dataclass
+class _Projection:
+    items: list[_ProjectionItem]
+    star: bool
+    distinct: bool
+    order_by: list[tuple[_Expr, bool]]
+    skip: Optional[_Expr]
+    limit: Optional[_Expr]
+    where: Optional[_Expr]
+
+
+@dataclass
+class _Clause:
+    kind: str
+    payload: Any
+
+
+# ---------------------------------------------------------------------------
+# Parser
+# ---------------------------------------------------------------------------
+
+_CLAUSE_KEYWORDS = frozenset(
+    {"MATCH", "OPTIONAL", "UNWIND", "MERGE", "CREATE", "SET", "DELETE", "DETACH",
+     "REMOVE", "WITH", "RETURN", "ON", "ORDER", "SKIP", "LIMIT", "WHERE"}
+)
+
+
+class _Parser:
+    def __init__(self, query: str) -> None:
+        self.query = query
+        self.tokens = _tokenize(query)
+        self.pos = 0
+
+    # -- token helpers ---------------------------------------------------------
+
+    def peek(self, offset: int = 0) -> _Token:
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def advance(self) -> _Token:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def at_keyword(self, *words: str, offset: int = 0) -> bool:
+        return self.peek(offset).upper in words
+
+    def accept_keyword(self, *words: str) -> bool:
+        for index, word in enumerate(words):
+            if self.peek(index).upper != word:
+                return False
+        self.pos += len(words)
+        return True
+
+    def expect_keyword(self, *words: str) -> None:
+        if not self.accept_keyword(*words):
+            self.error(f"expected {' '.join(words)}")
+
+    def at_op(self, *ops: str, offset: int = 0) -> bool:
+        token = self.peek(offset)
+        return token.kind == "op" and token.value in ops
+
+    def accept_op(self, op: str) -> bool:
+        if self.at_op(op):
+            self.pos += 1
+            return True
+        return False
+
+    def expect_op(self, op: str) -> None:
+        if not self.accept_op(op):
+            self.error(f"expected '{op}'")
+
+    def expect_ident(self) -> str:
+        token = self.peek()
+        if token.kind != "ident":
+            self.error("expected an identifier")
+        self.pos += 1
+        return token.value
+
+    def error(self, message: str) -> None:
+        token = self.peek()
+        raise CypherError(f"Invalid input at offset {token.start}: {message}\n{self.query}")
+
+    # -- statements ------------------------------------------------------------
+
+    def parse(self) -> list[_Clause]:
+        clauses: list[_Clause] = []
+        while self.peek().kind != "eof":
+            if self.accept_op(";"):
+                continue
+            clauses.append(self.parse_clause())
+        if not clauses:
+            self.error("empty statement")
+        return clauses
+
+    def parse_clause(self) -> _Clause:
+        if self.accept_keyword("OPTIONAL", "MATCH"):
+            return self.parse_match(optional=True)
+        if self.accept_keyword("MATCH"):
+            return self.parse_match(optional=False)
+        if self.accept_keyword("UNWIND"):
+            expr = self.parse_expression()
+            self.expect_keyword("AS")
+            return _Clause("unwind", (expr, self.expect_ident()))
+        if self.accept_keyword("MERGE"):
+            path = self.parse_path()
+            on_create: list = []
+            on_match: list = []
+            while self.at_keyword("ON"):
+                if self.accept_keyword("ON", "CREATE", "SET"):
+                    on_create.extend(self.parse_set_items())
+                elif self.accept_keyword("ON", "MATCH", "SET"):
+                    on_match.extend(self.parse_set_items())
+                else:
+                    self.error("expected ON CREATE SET or ON MATCH SET")
+            return _Clause("merge", (path, on_create, on_match))
+        if self.accept_keyword("CREATE"):
+            return _Clause("create", self.parse_pattern_list())
+        if self.accept_keyword("SET"):
+            return _Clause("set", self.parse_set_items())
+        if self.accept_keyword("REMOVE"):
+            return _Clause("remove", self.parse_remove_items())
+        if self.accept_keyword("DETACH", "DELETE"):
+            return _Clause("delete", (True, self.parse_expression_list()))
+        if self.accept_keyword("DELETE"):
+            return _Clause("delete", (False, self.parse_expression_list()))
+        if self.accept_keyword("WITH"):
+            return _Clause("with", self.parse_projection(allow_where=True))
+        if self.accept_keyword("RETURN"):
+            return _Clause("return", self.parse_projection(allow_where=False))
+        self.error("unsupported clause")
+        raise AssertionError("unreachable")
+
+    def parse_match(self, optional: bool) -> _Clause:
+        patterns = self.parse_pattern_list()
+        where = self.parse_expression() if self.accept_keyword("WHERE") else None
+        return _Clause("optional_match" if optional else "match", (patterns, where))
+
+    def parse_pattern_list(self) -> list[_Path]:
+        patterns = [self.parse_path()]
+        while self.accept_op(","):
+            patterns.append(self.parse_path())
+        return patterns
+
+    def parse_path(self) -> _Path:
+        nodes = [self.parse_node_pattern()]
+        relationships: list[_RelPattern] = []
+        while self.at_op("-", "<-"):
+            relationships.append(self.parse_rel_pattern())
+            nodes.append(self.parse_node_pattern())
+        return _Path(nodes, relationships)
+
+    def parse_node_pattern(self) -> _NodePattern:
+        self.expect_op("(")
+        var = self.advance().value if self.peek().kind == "ident" else None
+        labels: list[str] = []
+        while self.accept_op(":"):
+            labels.append(self.expect_ident())
+        properties = self.parse_map_entries() if self.at_op("{") else ()
+        if self.at_op("$"):
+            self.error("parameter maps in patterns are not supported")
+        self.expect_op(")")
+        return _NodePattern(var, tuple(labels), properties)
+
+    def parse_rel_pattern(self) -> _RelPattern:
+        incoming = self.accept_op("<-")
+        if not incoming:
+            self.expect_op("-")
+        var = None
+        types: list[str] = []
+        properties: tuple = ()
+        if self.accept_op("["):
+            if self.peek().kind == "ident":
+                var = self.advance().value
+            if self.accept_op(":"):
+                types.append(self.expect_ident())
+                while self.accept_op("|"):
+                    self.accept_op(":")
+                    types.append(self.expect_ident())
+            if self.at_op("*"):
+                self.error("variable-length relationships are not supported")
+            if self.at_op("{"):
+                properties = self.parse_map_entries()
+            self.expect_op("]")
+        if self.accept_op("->"):
+            if incoming:
+                self.error("relationship cannot point both ways")
+            direction = "out"
+        else:
+            self.expect_op("-")
+            direction = "in" if incoming else "both"
+        return _RelPattern(var, tuple(types), direction, properties)
+
+    def parse_map_entries(self) -> tuple[tuple[str, _Expr], ...]:
+        self.expect_op("{")
+        entries: list[tuple[str, _Expr]] = []
+        if not self.at_op("}"):
+            while True:
+                token = self.advance()
+                if token.kind not in ("ident", "string"):
+                    self.error("expected a map key")
+                self.expect_op(":")
+                entries.append((token.value, self.parse_expression()))
+                if not self.accept_op(","):
+                    break
+        self.expect_op("}")
+        return tuple(entries)
+
+    def parse_set_items(self) -> list[tuple]:
+        items: list[tuple] = []
+        while True:
+            var = self.expect_ident()
+            if self.accept_op("."):
+                key = self.expect_ident()
+                self.expect_op("=")
+                items.append(("property", var, key, self.parse_expression()))
+            elif self.accept_op("+="):
+                items.append(("merge", var, self.parse_expression()))
+            elif self.accept_op("="):
+                items.append(("replace", var, self.parse_expression()))
+            elif self.at_op(":"):
+                labels = []
+                while self.accept_op(":"):
+                    labels.append(self.expect_ident())
+                items.append(("labels", var, tuple(labels)))
+            else:
+                self.error("invalid SET item")
+            if not self.accept_op(","):
+                return items
+
+    def parse_remove_items(self) -> list[tuple]:
+        items: list[tuple] = []
+        while True:
+            var = self.expect_ident()
+            if self.accept_op("."):
+                items.append(("property", var, self.expect_ident()))
+            else:
+                labels = []
+                while self.accept_op(":"):
+                    labels.append(self.expect_ident())
+                if not labels:
+                    self.error("invalid REMOVE item")
+                items.append(("labels", var, tuple(labels)))
+            if not self.accept_op(","):
+                return items
+
+    def parse_projection(self, allow_where: bool) -> _Projection:
+        distinct = self.accept_keyword("DISTINCT")
+        star = False
+        items: list[_ProjectionItem] = []
+        if self.accept_op("*"):
+            star = True
+            if not self.accept_op(","):
+                return self._finish_projection(items, star, distinct, allow_where)
+        while True:
+            start = self.peek().start
+            expr = self.parse_expression()
+            if self.accept_keyword("AS"):
+                alias = self.expect_ident()
+            else:
+                alias = self.query[start : self.tokens[self.pos - 1].end].strip()
+            items.append(_ProjectionItem(expr, alias))
+            if not self.accept_op(","):
+                break
+        return self._finish_projection(items, star, distinct, allow_where)
+
+    def _finish_projection(self, items, star, distinct, allow_where) -> _Projection:
+        order_by: list[tuple[_Expr, bool]] = []
+        if self.accept_keyword("ORDER", "BY"):
+            while True:
+                expr = self.parse_expression()
+                descending = False
+                if self.accept_keyword("DESC") or self.accept_keyword("DESCENDING"):
+                    descending = True
+                elif self.accept_keyword("ASC") or self.accept_keyword("ASCENDING"):
+                    descending = False
+                order_by.append((expr, descending))
+                if not self.accept_op(","):
+                    break
+        skip = self.parse_expression() if self.accept_keyword("SKIP") else None
+        limit = self.parse_expression() if self.accept_keyword("LIMIT") else None
+        where = None
+        if allow_where and self.accept_keyword("WHERE"):
+            where = self.parse_expression()
+        return _Projection(items, star, distinct, order_by, skip, limit, where)
+
+    def parse_expression_list(self) -> list[_Expr]:
+        exprs = [self.parse_expression()]
+        while self.accept_op(","):
+            exprs.append(self.parse_expression())
+        return exprs
+
+    # -- expressions -------------------------------------------------------------
+
+    def parse_expression(self) -> _Expr:
+        return self.parse_or()
+
+    def _text(self, start: int) -> str:
+        return self.query[start : self.tokens[self.pos - 1].end].strip()
+
+    def parse_or(self) -> _Expr:
+        start = self.peek().start
+        left = self.parse_xor()
+        while self.accept_keyword("OR"):
+            left = _Expr("or", (left, self.parse_xor()), self._text(start))
+        return left
+
+    def parse_xor(self) -> _Expr:
+        start = self.peek().start
+        left = self.parse_and()
+        while self.accept_keyword("XOR"):
+            left = _Expr("xor", (left, self.parse_and()), self._text(start))
+        return left
+
+    def parse_and(self) -> _Expr:
+        start = self.peek().start
+        left = self.parse_not()
+        while self.accept_keyword("AND"):
+            left = _Expr("and", (left, self.parse_not()), self._text(start))
+        return left
+
+    def parse_not(self) -> _Expr:
+        start = self.peek().start
+        if self.accept_keyword("NOT"):
+            return _Expr("not", (self.parse_not(),), self._text(start))
+        return self.parse_comparison()
+
+    def parse_comparison(self) -> _Expr:
+        start = self.peek().start
+        left = self.parse_additive()
+        while True:
+            token = self.peek()
+            if token.kind == "op" and token.value in ("=", "<>", "!=", "<", ">", "<=", ">="):
+                self.pos += 1
+                op = "<>" if token.value == "!=" else token.value
+                left = _Expr("compare", (op, left, self.parse_additive()), self._text(start))
+            elif self.accept_keyword("IS", "NOT", "NULL"):
+                left = _Expr("is_null", (left, True), self._text(start))
+            elif self.accept_keyword("IS", "NULL"):
+                left = _Expr("is_null", (left, False), self._text(start))
+            elif self.accept_keyword("IN"):
+                left = _Expr("in", (left, self.parse_additive()), self._text(start))
+            elif self.accept_keyword("STARTS", "WITH"):
+                left = _Expr("string_op", ("starts", left, self.parse_additive()), self._text(start))
+            elif self.accept_keyword("ENDS", "WITH"):
+                left = _Expr("string_op", ("ends", left, self.parse_additive()), self._text(start))
+            elif self.accept_keyword("CONTAINS"):
+                left = _Expr("string_op", ("contains", left, self.parse_additive()), self._text(start))
+            else:
+                return left
+
+    def parse_additive(self) -> _Expr:
+        start = self.peek().start
+        left = self.parse_multiplicative()
+        while self.at_op("+", "-"):
+            op = self.advance().value
+            left = _Expr("arith", (op, left, self.parse_multiplicative()), self._text(start))
+        return left
+
+    def parse_multiplicative(self) -> _Expr:
+        start = self.peek().start
+        left = self.parse_unary()
+        while self.at_op("*", "/", "%", "^"):
+            op = self.advance().value
+            left = _Expr("arith", (op, left, self.parse_unary()), self._text(start))
+        return left
+
+    def parse_unary(self) -> _Expr:
+        start = self.peek().start
+        if self.accept_op("-"):
+            return _Expr("neg", (self.parse_unary(),), self._text(start))
+        if self.accept_op("+"):
+            return self.parse_unary()
+        return self.parse_postfix()
+
+    def parse_postfix(self) -> _Expr:
+        start = self.peek().start
+        expr = self.parse_atom()
+        while True:
+            if self.at_op(".") and self.peek(1).kind == "ident":
+                self.pos += 1
+                expr = _Expr("property", (expr, self.advance().value), self._text(start))
+            elif self.accept_op("["):
+                index = self.parse_expression()
+                self.expect_op("]")
+                expr = _Expr("index", (expr, index), self._text(start))
+            elif self.at_op(":") and expr.kind == "var":
+                labels = []
+                while self.accept_op(":"):
+                    labels.append(self.expect_ident())
+                expr = _Expr("has_labels", (expr, tuple(labels)), self._text(start))
+            else:
+                return expr
+
+    def parse_atom(self) -> _Expr:
+        token = self.peek()
+        start = token.start
+        if token.kind in ("number", "string"):
+            self.pos += 1
+            return _Expr("literal", (token.value,), self._text(start))
+        if token.kind == "param":
+            self.pos += 1
+            return _Expr("param", (token.value,), self._text(start))
+        if token.kind == "op" and token.value == "(":
+            self.pos += 1
+            expr = self.parse_expression()
+            self.expect_op(")")
+            return expr
+        if token.kind == "op" and token.value == "[":
+            return self.parse_list()
+        if token.kind == "op" and token.value == "{":
+            entries = self.parse_map_entries()
+            return _Expr("map", (entries,), self._text(start))
+        if token.kind == "ident":
+            upper = token.upper
+            if upper in ("TRUE", "FALSE"):
+                self.pos += 1
+                return _Expr("literal", (upper == "TRUE",), self._text(start))
+            if upper == "NULL":
+                self.pos += 1
+                return _Expr("literal", (None,), self._text(start))
+            if upper == "CASE":
+                return self.parse_case()
+            if self.at_op("(", offset=1) or (self.at_op(".", offset=1) and self.at_op("(", offset=3)):
+                return self.parse_function()
+            self.pos += 1
+            return _Expr("var", (token.value,), self._text(start))
+        self.error("unexpected token in expression")
+        raise AssertionError("unreachable")
+
+    def parse_list(self) -> _Expr:
+        start = self.peek().start
+        self.expect_op("[")
+        if self.peek().kind == "ident" and self.at_keyword("IN", offset=1):
+            var = self.advance().value
+            self.expect_keyword("IN")
+            source = self.parse_expression()
+            where = self.parse_expression() if self.accept_keyword("WHERE") else None
+            mapping = self.parse_expression() if self.accept_op("|") else None
+            self.expect_op("]")
+            return _Expr("list_comprehension", (var, source, where, mapping), self._text(start))
+        items: list[_Expr] = []
+        if not self.at_op("]"):
+            items = self.parse_expression_list()
+        self.expect_op("]")
+        return _Expr("list", tuple(items), self._text(start))
+
+    def parse_case(self) -> _Expr:
+        start = self.peek().start
+        self.expect_keyword("CASE")
+        subject = None if self.at_keyword("WHEN") else self.parse_expression()
+        branches: list[tuple[_Expr, _Expr]] = []
+        while self.accept_keyword("WHEN"):
+            condition = self.parse_expression()
+            self.expect_keyword("THEN")
+            branches.append((condition, self.parse_expression()))
+        default = self.parse_expression() if self.accept_keyword("ELSE") else None
+        self.expect_keyword("END")
+        return _Expr("case", (subject, tuple(branches), default), self._text(start))
+
+    def parse_function(self) -> _Expr:
+        start = self.peek().start
+        name = self.expect_ident()
+        while self.accept_op("."):
+            name = f"{name}.{self.expect_ident()}"
+        self.expect_op("(")
+        lowered = name.lower()
+        if lowered == "count" and self.accept_op("*"):
+            self.expect_op(")")
+            return _Expr("count_star", (), self._text(start))
+        distinct = self.accept_keyword("DISTINCT")
+        args: list[_Expr] = []
+        if not self.at_op(")"):
+            args = self.parse_expression_list()
+        self.expect_op(")")
+        kind = "aggregate" if lowered in _AGGREGATES else "function"
+        return _Expr(kind, (lowered, distinct, tuple(args)), self._text(start))
+
+
+# ---------------------------------------------------------------------------
+# Expression compiler
+# ---------------------------------------------------------------------------
+
+_AGG_SLOT = "\0aggregates"
+
+
+def _compare(op: str, left: Any, right: Any) -> Optional[bool]:
+    if op == "=":
+        return _equals(left, right)
+    if op == "<>":
+        equal = _equals(left, right)
+        return None if equal is None else not equal
+    if left is None or right is None:
+        return None
+    try:
+        if op == "<":
+            return left < right
+        if op == ">":
+            return left > right
+        if op == "<=":
+            return left <= right
+        return left >= right
+    except TypeError:
+        return None
+
+
+def _arith(op: str, left: Any, right: Any) -> Any:
+    if left is None or right is None:
+        return None
+    if op == "+":
+        if isinstance(left, list):
+            return left + (right if isinstance(right, list) else [right])
+        if isinstance(right, list):
+            return [left] + right
+        if isinstance(left, str) or isinstance(right, str):
+            return f"{_to_string(left)}{_to_string(right)}"
+        return left + right
+    if op == "-":
+        return left - right
+    if op == "*":
+        return left * right
+    if op == "/":
+        if isinstance(left, int) and isinstance(right, int):
+            if right == 0:
+                raise CypherError("/ by zero")
+            quotient = abs(left) // abs(right)
+            return quotient if (left >= 0) == (right >= 0) else -quotient
+        return left / right if right else math.copysign(math.inf, left) if left else math.nan
+    if op == "%":
+        return math.fmod(left, right) if isinstance(left, float) or isinstance(right, float) else int(math.fmod(left, right))
+    return float(left) ** float(right)
+
+
+def _to_string(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _to_integer(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(float(value)) if isinstance(value, str) else int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_boolean(value: Any) -> Optional[bool]:
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        return True if lowered == "true" else False if lowered == "false" else None
+    return None
+
+
+def _size(value: Any) -> Optional[int]:
+    return None if value is None else len(value)
+
+
+def _labels(value: Any) -> Optional[list[str]]:
+    return None if value is None else sorted(value.labels)
+
+
+def _keys(value: Any) -> Optional[list[str]]:
+    properties = _properties_of(value)
+    return None if properties is None else list(properties.keys())
+
+
+def _properties(value: Any) -> Optional[dict[str, Any]]:
+    properties = _properties_of(value)
+    return None if properties is None else dict(properties)
+
+
+def _range(start: int, end: int, step: int = 1) -> list[int]:
+    return list(range(start, end + (1 if step > 0 else -1), step))
+
+
+def _null_safe(func: Callable[..., Any]) -> Callable[..., Any]:
+    def wrapper(*args: Any) -> Any:
+        if args and args[0] is None:
+            return None
+        return func(*args)
+
+    return wrapper
+
+
+_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "size": _size,
+    "coalesce": lambda *args: next((arg for arg in args if arg is not None), None),
+    "tostring": _to_string,
+    "tointeger": _to_integer,
+    "tofloat": _to_float,
+    "toboolean": _to_boolean,
+    "labels": _labels,
+    "type": _null_safe(lambda rel: rel.type),
+    "id": _null_safe(lambda entity: entity.id),
+    "elementid": _null_safe(lambda entity: entity.element_id),
+    "keys": _keys,
+    "properties": _properties,
+    "head": _null_safe(lambda items: items[0] if items else None),
+    "last": _null_safe(lambda items: items[-1] if items else None),
+    "tail": _null_safe(lambda items: list(items[1:])),
+    "reverse": _null_safe(lambda items: items[::-1]),
+    "range": _range,
+    "tolower": _null_safe(str.lower),
+    "toupper": _null_safe(str.upper),
+    "trim": _null_safe(str.strip),
+    "abs": _null_safe(abs),
+    "round": _null_safe(lambda value, digits=0: float(round(value, int(digits)))),
+    "floor": _null_safe(lambda value: float(math.floor(value))),
+    "ceil": _null_safe(lambda value: float(math.ceil(value))),
+    "sqrt": _null_safe(math.sqrt),
+    "startnode": _null_safe(lambda rel: rel.start_node),
+    "endnode": _null_safe(lambda rel: rel.end_node),
+    "exists": lambda value: value is not None,
+}
+
+
+def _truthy(value: Any) -> bool:
+    return value is True
+
+
+def _collect_aggregates(expr: _Expr, found: list[_Expr]) -> None:
+    if expr.kind in ("aggregate", "count_star"):
+        found.append(expr)
+        return
+    for arg in expr.args:
+        if isinstance(arg, _Expr):
+            _collect_aggregates(arg, found)
+        elif isinstance(arg, tuple):
+            for item in arg:
+                if isinstance(item, _Expr):
+                    _collect_aggregates(item, found)
+                elif isinstance(item, tuple):
+                    for sub in item:
+                        if isinstance(sub, _Expr):
+                            _collect_aggregates(sub, found)
+
+
+def _compile(expr: _Expr, aggregates: Optional[list[_Expr]] = None) -> Evaluator:
+    kind = expr.kind
+    args = expr.args
+
+    if kind == "literal":
+        value = args[0]
+        return lambda row, params: value
+    if kind == "param":
+        name = args[0]
+
+        def param(row: Row, params: Mapping[str, Any]) -> Any:
+            try:
+                return params[name]
+            except KeyError:
+                raise CypherError(f"Expected parameter(s): {name}") from None
+
+        return param
+    if kind == "var":
+        name = args[0]
+
+        def variable(row: Row, params: Mapping[str, Any]) -> Any:
+            try:
+                return row[name]
+            except KeyError:
+                raise CypherError(f"Variable `{name}` not defined") from None
+
+        return variable
+    if kind in ("aggregate", "count_star"):
+        if aggregates is None:
+            raise CypherError(f"Aggregation is not allowed here: {expr.text}")
+        slot = next(index for index, candidate in enumerate(aggregates) if candidate is expr)
+        return lambda row, params: row[_AGG_SLOT][slot]
+    if kind == "property":
+        target = _compile(args[0], aggregates)
+        key = args[1]
+
+        def prop(row: Row, params: Mapping[str, Any]) -> Any:
+            value = target(row, params)
+            if value is None:
+                return None
+            if isinstance(value, _Entity):
+                return value._properties.get(key)
+            if isinstance(value, (dict, Mapping)):
+                return value.get(key)
+            raise CypherError(f"Type mismatch: cannot read property `{key}` of {value!r}")
+
+        return prop
+    if kind == "index":
+        target = _compile(args[0], aggregates)
+        index = _compile(args[1], aggregates)
+
+        def subscript(row: Row, params: Mapping[str, Any]) -> Any:
+            value = target(row, params)
+            key = index(row, params)
+            if value is None or key is None:
+                return None
+            if isinstance(value, list):
+                return value[key] if -len(value) <= key < len(value) else None
+            return _properties_of(value).get(key)  # type: ignore[union-attr]
+
+        return subscript
+    if kind == "has_labels":
+        target = _compile(args[0], aggregates)
+        labels = args[1]
+
+        def has_labels(row: Row, params: Mapping[str, Any]) -> Any:
+            node = target(row, params)
+            return None if node is None else all(label in node.labels for label in labels)
+
+        return has_labels
+    if kind == "map":
+        entries = [(key, _compile(value, aggregates)) for key, value in args[0]]
+        return lambda row, params: {key: value(row, params) for key, value in entries}
+    if kind == "list":
+        items = [_compile(item, aggregates) for item in args]
+        return lambda row, params: [item(row, params) for item in items]
+    if kind == "list_comprehension":
+        var, source_expr, where_expr, mapping_expr = args
+        source = _compile(source_expr, aggregates)
+        where = _compile(where_expr, aggregates) if where_expr else None
+        mapping = _compile(mapping_expr, aggregates) if mapping_expr else None
+
+        def comprehension(row: Row, params: Mapping[str, Any]) -> Any:
+            values = source(row, params)
+            if values is None:
+                return None
+            out = []
+            for value in values:
+                inner = dict(row)
+                inner[var] = value
+                if where is not None and not _truthy(where(inner, params)):
+                    continue
+                out.append(mapping(inner, params) if mapping else value)
+            return out
+
+        return comprehension
+    if kind == "case":
+        subject_expr, branch_exprs, default_expr = args
+        subject = _compile(subject_expr, aggregates) if subject_expr else None
+        branches = [(_compile(c, aggregates), _compile(v, aggregates)) for c, v in branch_exprs]
+        default = _compile(default_expr, aggregates) if default_expr else (lambda row, params: None)
+
+        def case(row: Row, params: Mapping[str, Any]) -> Any:
+            if subject is not None:
+                value = subject(row, params)
+                for condition, result in branches:
+                    if _equals(value, condition(row, params)):
+                        return result(row, params)
+            else:
+                for condition, result in branches:
+                    if _truthy(condition(row, params)):
+                        return result(row, params)
+            return default(row, params)
+
+        return case
+    if kind == "compare":
+        op, left_expr, right_expr = args
+        left = _compile(left_expr, aggregates)
+        right = _compile(right_expr, aggregates)
+        return lambda row, params: _compare(op, left(row, params), right(row, params))
+    if kind == "arith":
+        op, left_expr, right_expr = args
+        left = _compile(left_expr, aggregates)
+        right = _compile(right_expr, aggregates)
+        return lambda row, params: _arith(op, left(row, params), right(row, params))
+    if kind == "neg":
+        operand = _compile(args[0], aggregates)
+
+        def negate(row: Row, params: Mapping[str, Any]) -> Any:
+            value = operand(row, params)
+            return None if value is None else -value
+
+        return negate
+    if kind in ("and", "or", "xor"):
+        left = _compile(args[0], aggregates)
+        right = _compile(args[1], aggregates)
+        if kind == "and":
+
+            def conjunction(row: Row, params: Mapping[str, Any]) -> Any:
+                a = left(row, params)
+                if a is False:
+                    return False
+                b = right(row, params)
+                if b is False:
+                    return False
+                return None if a is None or b is None else True
+
+            return conjunction
+        if kind == "or":
+
+            def disjunction(row: Row, params: Mapping[str, Any]) -> Any:
+                a = left(row, params)
+                if a is True:
+                    return True
+                b = right(row, params)
+                if b is True:
+                    return True
+                return None if a is None or b is None else False
+
+            return disjunction
+
+        def exclusive(row: Row, params: Mapping[str, Any]) -> Any:
+            a = left(row, params)
+            b = right(row, params)
+            return None if a is None or b is None else a != b
+
+        return exclusive
+    if kind == "not":
+        operand = _compile(args[0], aggregates)
+
+        def negation(row: Row, params: Mapping[str, Any]) -> Any:
+            value = operand(row, params)
+            return None if value is None else not value
+
+        return negation
+    if kind == "is_null":
+        operand = _compile(args[0], aggregates)
+        negate = args[1]
+        return lambda row, params: (operand(row, params) is None) != negate
+    if kind == "in":
+        item = _compile(args[0], aggregates)
+        container = _compile(args[1], aggregates)
+
+        def membership(row: Row, params: Mapping[str, Any]) -> Any:
+            values = container(row, params)
+            value = item(row, params)
+            if values is None:
+                return None
+            if any(_equals(value, candidate) for candidate in values):
+                return True
+            return None if value is None or any(c is None for c in values) else False
+
+        return membership
+    if kind == "string_op":
+        op, left_expr, right_expr = args
+        left = _compile(left_expr, aggregates)
+        right = _compile(right_expr, aggregates)
+
+        def string_op(row: Row, params: Mapping[str, Any]) -> Any:
+            a = left(row, params)
+            b = right(row, params)
+            if not isinstance(a, str) or not isinstance(b, str):
+                return None
+            if op == "starts":
+                return a.startswith(b)
+            if op == "ends":
+                return a.endswith(b)
+            return b in a
+
+        return string_op
+    if kind == "function":
+        name, _distinct, arg_exprs = args
+        func = _FUNCTIONS.get(name)
+        if func is None:
+            raise CypherError(f"Unknown function '{name}'")
+        compiled = [_compile(arg, aggregates) for arg in arg_exprs]
+        if name == "exists" and arg_exprs and arg_exprs[0].kind != "property":
+            raise CypherError("exists() only supports property arguments")
+        return lambda row, params: func(*(arg(row, params) for arg in compiled))
+    raise CypherError(f"Unsupported expression: {expr.text}")
+
+
+class _Aggregator:
+    def __init__(self, expr: _Expr) -> None:
+        self.star = expr.kind == "count_star"
+        if self.star:
+            self.name, self.distinct, self.argument = "count", False, None
+        else:
+            self.name, self.distinct, arg_exprs = expr.args
+            if len(arg_exprs) != 1:
+                raise CypherError(f"{self.name}() takes exactly one argument")
+            self.argument = _compile(arg_exprs[0])
+
+    def compute(self, rows: Sequence[Row], params: Mapping[str, Any]) -> Any:
+        if self.star:
+            return len(rows)
+        values = [self.argument(row, params) for row in rows]  # type: ignore[misc]
+        values = [value for value in values if value is not None]
+        if self.distinct:
+            seen: set = set()
+            unique = []
+            for value in values:
+                key = _hash_key(value)
+                if key not in seen:
+                    seen.add(key)
+                    unique.append(value)
+            values = unique
+        if self.name == "count":
+            return len(values)
+        if self.name == "collect":
+            return values
+        if self.name == "sum":
+            return sum(values) if values else 0
+        if self.name == "avg":
+            return sum(values) / len(values) if values else None
+        if self.name == "min":
+            return min(values, key=_order_key) if values else None
+        return max(values, key=_order_key) if values else None
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Context:
+    graph: InMemoryGraph
+    params: Mapping[str, Any]
+    counters: Counters
+    # (clause, rows after it) per executed clause when PROFILE was requested.
+    steps: Optional[list[tuple[str, int]]] = None
+
+
+class _CompiledNode:
+    __slots__ = ("var", "labels", "properties")
+
+    def __init__(self, pattern: _NodePattern) -> None:
+        self.var = pattern.var
+        self.labels = pattern.labels
+        self.properties = [(key, _compile(value)) for key, value in pattern.properties]
+
+    def evaluate(self, row: Row, params: Mapping[str, Any]) -> Optional[dict[str, Any]]:
+        values = {}
+        for key, evaluator in self.properties:
+            value = evaluator(row, params)
+            if value is None:
+                return None
+            values[key] = value
+        return values
+
+
+class _CompiledRel:
+    __slots__ = ("var", "types", "direction", "properties")
+
+    def __init__(self, pattern: _RelPattern) -> None:
+        self.var = pattern.var
+        self.types = pattern.types
+        self.direction = pattern.direction
+        self.properties = [(key, _compile(value)) for key, value in pattern.properties]
+
+    def evaluate(self, row: Row, params: Mapping[str, Any]) -> Optional[dict[str, Any]]:
+        values = {}
+        for key, evaluator in self.properties:
+            value = evaluator(row, params)
+            if value is None:
+                return None
+            values[key] = value
+        return values
+
+
+def _node_matches(node: Node, labels: Sequence[str], properties: Mapping[str, Any]) -> bool:
+    node_labels = node.labels
+    for label in labels:
+        if label not in node_labels:
+            return False
+    stored = node._properties
+    for key, value in properties.items():
+        if not _equals(stored.get(key), value):
+            return False
+    return True
+
+
+def _properties_match(entity: _Entity, properties: Mapping[str, Any]) -> bool:
+    stored = entity._properties
+    return all(_equals(stored.get(key), value) for key, value in properties.items())
+
+
+class _CompiledPath:
+    def __init__(self, path: _Path) -> None:
+        self.nodes = [_CompiledNode(node) for node in path.nodes]
+        self.relationships = [_CompiledRel(rel) for rel in path.relationships]
+        self.variables = [n.var for n in self.nodes if n.var] + [r.var for r in self.relationships if r.var]
+
+    # -- matching --------------------------------------------------------------
+
+    def _candidates(
+        self, graph: InMemoryGraph, node: _CompiledNode, properties: Mapping[str, Any], row: Row
+    ) -> tuple[int, Optional[Iterable[Node]]]:
+        if node.var and node.var in row:
+            bound = row[node.var]
+            if bound is None:
+                return 0, []
+            return 0, [bound]
+        if node.labels and properties:
+            best: Optional[dict[int, Node]] = None
+            for label in node.labels:
+                for key, value in properties.items():
+                    found = graph.lookup(label, key, value)
+                    if best is None or len(found) < len(best):
+                        best = found
+            return 1, list(best.values()) if best else []
+        if node.labels:
+            smallest = min(node.labels, key=graph.label_size)
+            return 2 + graph.label_size(smallest), list(graph.nodes(smallest))
+        return 2 + graph.node_count, list(graph.nodes())
+
+    def match(self, ctx: _Context, row: Row) -> Iterator[Row]:
+        graph = ctx.graph
+        params = ctx.params
+        node_props = []
+        for node in self.nodes:
+            props = node.evaluate(row, params)
+            if props is None:
+                return
+            node_props.append(props)
+        rel_props = []
+        for rel in self.relationships:
+            props = rel.evaluate(row, params)
+            if props is None:
+                return
+            rel_props.append(props)
+
+        anchor = 0
+        anchor_cost: Optional[int] = None
+        anchor_nodes: Iterable[Node] = ()
+        for position, node in enumerate(self.nodes):
+            cost, candidates = self._candidates(graph, node, node_props[position], row)
+            if anchor_cost is None or cost < anchor_cost:
+                anchor, anchor_cost, anchor_nodes = position, cost, candidates  # type: ignore[assignment]
+            if cost == 0:
+                break
+
+        if not self.relationships:
+            pattern = self.nodes[0]
+            for start in anchor_nodes:
+                if _node_matches(start, pattern.labels, node_props[0]):
+                    out = dict(row)
+                    if pattern.var:
+                        out[pattern.var] = start
+                    yield out
+            return
+
+        if anchor == 0 and anchor_cost == 0 and len(self.nodes) == 2:
+            # Both endpoints bound (typical for MERGE of a relationship):
+            # expand from whichever side has fewer candidate relationships.
+            other = self.nodes[1].var
+            end = row.get(other) if other else None
+            start = next(iter(anchor_nodes), None)
+            if isinstance(end, Node) and isinstance(start, Node):
+                rel = self.relationships[0]
+                if rel.direction != "both" and graph.degree(
+                    end, rel.types, rel.direction == "in"
+                ) < graph.degree(start, rel.types, rel.direction == "out"):
+                    anchor, anchor_nodes = 1, [end]
+
+        order = list(range(anchor + 1, len(self.nodes))) + list(range(anchor - 1, -1, -1))
+        anchor_pattern = self.nodes[anchor]
+        for start in anchor_nodes:
+            if not _node_matches(start, anchor_pattern.labels, node_props[anchor]):
+                continue
+            bound_nodes: list[Optional[Node]] = [None] * len(self.nodes)
+            bound_nodes[anchor] = start
+            bound_rels: list[Optional[Relationship]] = [None] * len(self.relationships)
+            yield from self._extend(ctx, row, order, 0, bound_nodes, bound_rels, node_props, rel_props)
+
+    def _extend(self, ctx, row, order, step, bound_nodes, bound_rels, node_props, rel_props) -> Iterator[Row]:
+        if step == len(order):
+            out = dict(row)
+            for pattern, node in zip(self.nodes, bound_nodes):
+                if pattern.var:
+                    existing = out.get(pattern.var, node)
+                    if existing is not node and existing != node:
+                        return
+                    out[pattern.var] = node
+            for pattern, rel in zip(self.relationships, bound_rels):
+                if pattern.var:
+                    out[pattern.var] = rel
+            yield out
+            return
+
+        position = order[step]
+        forward = position > 0 and bound_nodes[position - 1] is not None
+        rel_index = position - 1 if forward else position
+        source = bound_nodes[position - 1] if forward else bound_nodes[position + 1]
+        rel_pattern = self.relationships[rel_index]
+        node_pattern = self.nodes[position]
+        required = row.get(node_pattern.var) if node_pattern.var else None
+        bound_rel = row.get(rel_pattern.var) if rel_pattern.var else None
+
+        directions: list[bool] = []
+        if rel_pattern.direction in ("out", "both"):
+            directions.append(forward)
+        if rel_pattern.direction in ("in", "both"):
+            directions.append(not forward)
+        seen_self_loops: set[int] = set()
+        for outgoing in directions:
+            for rel in ctx.graph.relationships(source, rel_pattern.types, outgoing):  # type: ignore[arg-type]
+                if bound_rel is not None and rel != bound_rel:
+                    continue
+                if rel in bound_rels:
+                    continue
+                target = rel.end_node if outgoing else rel.start_node
+                if rel.start_node is rel.end_node:
+                    if rel.id in seen_self_loops:
+                        continue
+                    seen_self_loops.add(rel.id)
+                if required is not None and target != required:
+                    continue
+                if not _node_matches(target, node_pattern.labels, node_props[position]):
+                    continue
+                if rel_props[rel_index] and not _properties_match(rel, rel_props[rel_index]):
+                    continue
+                bound_nodes[position] = target
+                bound_rels[rel_index] = rel
+                yield from self._extend(ctx, row, order, step + 1, bound_nodes, bound_rels, node_props, rel_props)
+                bound_nodes[position] = None
+                bound_rels[rel_index] = None
+
+    # -- creation --------------------------------------------------------------
+
+    def create(self, ctx: _Context, row: Row) -> Row:
+        out = dict(row)
+        created: list[Node] = []
+        for node in self.nodes:
+            if node.var and node.var in out:
+                bound = out[node.var]
+                if bound is None:
+                    raise CypherError(f"Failed to create relationship, node `{node.var}` is null")
+                created.append(bound)
+                continue
+            properties = {key: value(row, ctx.params) for key, value in node.properties}
+            new_node = ctx.graph.create_node(node.labels, properties, ctx.counters)
+            if node.var:
+                out[node.var] = new_node
+            created.append(new_node)
+        for index, rel in enumerate(self.relationships):
+            if len(rel.types) != 1:
+                raise CypherError("Exactly one relationship type must be specified for CREATE")
+            start, end = created[index], created[index + 1]
+            if rel.direction == "in":
+                start, end = end, start
+            properties = {key: value(row, ctx.params) for key, value in rel.properties}
+            new_rel = ctx.graph.create_relationship(rel.types[0], start, end, properties, ctx.counters)
+            if rel.var:
+                out[rel.var] = new_rel
+        return out
+
+
+def _apply_set_items(ctx: _Context, row: Row, items: Sequence[tuple]) -> None:
+    graph = ctx.graph
+    for item in items:
+        kind = item[0]
+        target = row.get(item[1])
+        if target is None:
+            continue
+        if kind == "property":
+            graph.set_property(target, item[2], item[3](row, ctx.params), ctx.counters)
+        elif kind in ("merge", "replace"):
+            value = _properties_of(item[2](row, ctx.params))
+            if value is None:
+                continue
+            if kind == "replace":
+                for key in [key for key in target._properties if key not in value]:
+                    graph.set_property(target, key, None, ctx.counters)
+            graph.update_properties(target, value, ctx.counters)
+        else:
+            for label in item[2]:
+                graph.add_label(target, label, ctx.counters)
+
+
+def _compile_set_items(items: Sequence[tuple]) -> list[tuple]:
+    compiled = []
+    for item in items:
+        if item[0] == "property":
+            compiled.append(("property", item[1], item[2], _compile(item[3])))
+        elif item[0] in ("merge", "replace"):
+            compiled.append((item[0], item[1], _compile(item[2])))
+        else:
+            compiled.append(item)
+    return compiled
+
+
+class _CompiledProjection:
+    def __init__(self, projection: _Projection) -> None:
+        self.star = projection.star
+        self.distinct = projection.distinct
+        self.aggregate_exprs: list[_Expr] = []
+        for item in projection.items:
+            _collect_aggregates(item.expr, self.aggregate_exprs)
+        self.aggregating = bool(self.aggregate_exprs)
+        self.items = []
+        for item in projection.items:
+            found: list[_Expr] = []
+            _collect_aggregates(item.expr, found)
+            evaluator = _compile(item.expr, self.aggregate_exprs if found else None)
+            self.items.append((item.alias, evaluator, bool(found)))
+        self.aggregators = [_Aggregator(expr) for expr in self.aggregate_exprs]
+        order_aggregates: list[_Expr] = []
+        for expr, _descending in projection.order_by:
+            _collect_aggregates(expr, order_aggregates)
+        if order_aggregates:
+            raise CypherError("Aggregations in ORDER BY must be projected first")
+        self.order_by = [(_compile(expr), descending) for expr, descending in projection.order_by]
+        self.skip = _compile(projection.skip) if projection.skip else None
+        self.limit = _compile(projection.limit) if projection.limit else None
+        self.where = _compile(projection.where) if projection.where else None
+        self.aliases = [alias for alias, _evaluator, _is_agg in self.items]
+
+    def _star_columns(self, rows: Sequence[Row]) -> list[str]:
+        if not self.star or not rows:
+            return []
+        return [key for key in rows[0] if not key.startswith("\0")]
+
+    def apply(self, ctx: _Context, rows: list[Row]) -> tuple[list[str], list[Row]]:
+        params = ctx.params
+        star_columns = self._star_columns(rows)
+        columns = star_columns + [alias for alias in self.aliases if alias not in star_columns]
+        projected: list[tuple[Row, Row]] = []
+        if self.aggregating:
+            groups: dict[tuple, list[Row]] = {}
+            group_heads: dict[tuple, Row] = {}
+            key_items = [(alias, evaluator) for alias, evaluator, is_agg in self.items if not is_agg]
+            # collect() results carried through WITH repeat the same list object
+            # on every row; each container is hashed once and replaced by a small
+            # interned token. The cache holds the container so its id stays unique.
+            container_keys: dict[int, tuple[Any, int]] = {}
+            interned: dict[Any, int] = {}
+
+            def group_key(value: Any) -> Any:
+                if isinstance(value, (list, dict)):
+                    cached = container_keys.get(id(value))
+                    if cached is None:
+                        token = interned.setdefault(_hash_key(value), len(interned))
+                        cached = container_keys[id(value)] = (value, token)
+                    return ("\0container", cached[1])
+                return _hash_key(value)
+
+            for row in rows:
+                key_values = {column: row[column] for column in star_columns}
+                for alias, evaluator in key_items:
+                    key_values[alias] = evaluator(row, params)
+                key = tuple(group_key(value) for value in key_values.values())
+                bucket = groups.get(key)
+                if bucket is None:
+                    groups[key] = bucket = []
+                    group_heads[key] = key_values
+                bucket.append(row)
+            if not groups and not key_items and not star_columns:
+                groups[()] = []
+                group_heads[()] = {}
+            for key, bucket in groups.items():
+                head = group_heads[key]
+                scope = dict(bucket[0]) if bucket else {}
+                scope[_AGG_SLOT] = [aggregator.compute(bucket, params) for aggregator in self.aggregators]
+                out: Row = dict(head)
+                for alias, evaluator, is_agg in self.items:
+                    if is_agg:
+                        out[alias] = evaluator(scope, params)
+                projected.append((out, out))
+        else:
+            for row in rows:
+                out = {column: row[column] for column in star_columns}
+                for alias, evaluator, _is_agg in self.items:
+                    out[alias] = evaluator(row, params)
+                scope = dict(row)
+                scope.update(out)
+                projected.append((out, scope))
+
+        if self.distinct:
+            seen: set = set()
+            unique = []
+            for out, scope in projected:
+                key = tuple(_hash_key(out[column]) for column in columns)
+                if key not in seen:
+                    seen.add(key)
+                    unique.append((out, scope))
+            projected = unique
+
+        if self.where is not None:
+            projected = [(out, scope) for out, scope in projected if _truthy(self.where(out, params))]
+
+        for evaluator, descending in reversed(self.order_by):
+            projected.sort(key=lambda pair: _order_key(evaluator(pair[1], params)), reverse=descending)
+
+        if self.skip is not None:
+            projected = projected[int(self.skip({}, params)) :]
+        if self.limit is not None:
+            projected = projected[: int(self.limit({}, params))]
+        return columns, [out for out, _scope in projected]
+
+
+class _CompiledQuery:
+    def __init__(self, clauses: list[_Clause]) -> None:
+        self.steps: list[tuple[str, Any]] = []
+        self.updating = False
+        self.returns = False
+        for index, clause in enumerate(clauses):
+            kind = clause.kind
+            if kind in ("match", "optional_match"):
+                paths, where = clause.payload
+                self.steps.append(
+                    (kind, ([_CompiledPath(path) for path in paths], _compile(where) if where else None))
+                )
+            elif kind == "unwind":
+                expr, var = clause.payload
+                self.steps.append((kind, (_compile(expr), var)))
+            elif kind == "merge":
+                path, on_create, on_match = clause.payload
+                self.steps.append(
+                    (kind, (_CompiledPath(path), _compile_set_items(on_create), _compile_set_items(on_match)))
+                )
+                self.updating = True
+            elif kind == "create":
+                self.steps.append((kind, [_CompiledPath(path) for path in clause.payload]))
+                self.updating = True
+            elif kind == "set":
+                self.steps.append((kind, _compile_set_items(clause.payload)))
+                self.updating = True
+            elif kind == "remove":
+                self.steps.append((kind, clause.payload))
+                self.updating = True
+            elif kind == "delete":
+                detach, exprs = clause.payload
+                self.steps.append((kind, (detach, [_compile(expr) for expr in exprs])))
+                self.updating = True
+            elif kind in ("with", "return"):
+                if kind == "return" and index != len(clauses) - 1:
+                    raise CypherError("RETURN can only be used at the end of the query")
+                self.steps.append((kind, _CompiledProjection(clause.payload)))
+                self.returns = self.returns or kind == "return"
+        if not self.returns and not self.updating and self.steps and self.steps[-1][0] != "return":
+            raise CypherError("Query cannot conclude with MATCH (must be a RETURN clause or an update clause)")
+
+    def execute(self, ctx: _Context) -> tuple[list[str], list[Row]]:
+        rows: list[Row] = [{}]
+        columns: list[str] = []
+        params = ctx.params
+        graph = ctx.graph
+        for kind, payload in self.steps:
+            if kind == "match":
+                paths, where = payload
+                for path in paths:
+                    rows = [out for row in rows for out in path.match(ctx, row)]
+                if where is not None:
+                    rows = [row for row in rows if _truthy(where(row, params))]
+            elif kind == "optional_match":
+                paths, where = payload
+                new_vars = {var for path in paths for var in path.variables}
+                next_rows = []
+                for row in rows:
+                    matched = [row]
+                    for path in paths:
+                        matched = [out for partial in matched for out in path.match(ctx, partial)]
+                    if where is not None:
+                        matched = [out for out in matched if _truthy(where(out, params))]
+                    if matched:
+                        next_rows.extend(matched)
+                    else:
+                        fallback = dict(row)
+                        for var in new_vars:
+                            fallback.setdefault(var, None)
+                        next_rows.append(fallback)
+                rows = next_rows
+            elif kind == "unwind":
+                expr, var = payload
+                next_rows = []
+                for row in rows:
+                    values = expr(row, params)
+                    if values is None:
+                        continue
+                    if not isinstance(values, (list, tuple)):
+                        values = [values]
+                    for value in values:
+                        out = dict(row)
+                        out[var] = value
+                        next_rows.append(out)
+                rows = next_rows
+            elif kind == "merge":
+                path, on_create, on_match = payload
+                next_rows = []
+                for row in rows:
+                    matched = list(path.match(ctx, row))
+                    if matched:
+                        for out in matched:
+                            _apply_set_items(ctx, out, on_match)
+                        next_rows.extend(matched)
+                    else:
+                        out = path.create(ctx, row)
+                        _apply_set_items(ctx, out, on_create)
+                        next_rows.append(out)
+                rows = next_rows
+            elif kind == "create":
+                next_rows = []
+                for row in rows:
+                    out = row
+                    for path in payload:
+                        out = path.create(ctx, out)
+                    next_rows.append(out)
+                rows = next_rows
+            elif kind == "set":
+                for row in rows:
+                    _apply_set_items(ctx, row, payload)
+            elif kind == "remove":
+                for row in rows:
+                    for item in payload:
+                        target = row.get(item[1])
+                        if target is None:
+                            continue
+                        if item[0] == "property":
+                            graph.set_property(target, item[2], None, ctx.counters)
+                        else:
+                            for label in item[2]:
+                                graph.remove_label(target, label, ctx.counters)
+            elif kind == "delete":
+                detach, exprs = payload
+                for row in rows:
+                    for expr in exprs:
+                        value = expr(row, params)
+                        for entity in value if isinstance(value, list) else [value]:
+                            if isinstance(entity, Node):
+                                graph.delete_node(entity, detach, ctx.counters)
+                            elif isinstance(entity, Relationship):
+                                graph.delete_relationship(entity, ctx.counters)
+                            elif entity is not None:
+                                raise CypherError(f"Cannot delete {entity!r}")
+            else:
+                columns, rows = payload.apply(ctx, rows)
+            if ctx.steps is not None:
+                ctx.steps.append((kind, len(rows)))
+        if not self.returns:
+            return [], []
+        return columns, rows
+
+
+def _profile_tree(steps: Sequence[tuple[str, int]], columns: Sequence[str], rows: int) -> dict[str, Any]:
+    """Shape per-clause row counts like a Neo4j PROFILE plan (leaf first clause)."""
+    plan: Optional[dict[str, Any]] = None
+    for kind, count in steps:
+        operator = "".join(part.capitalize() for part in kind.split("_"))
+        plan = {
+            "operatorType": f"{operator}@memory",
+            "rows": count,
+            "dbHits": 0,
+            "children": [plan] if plan is not None else [],
+        }
+    return {
+        "operatorType": "ProduceResults@memory",
+        "identifiers": list(columns),
+        "rows": rows,
+        "dbHits": 0,
+        "children": [plan] if plan is not None else [],
+    }
+
+
+@lru_cache(maxsize=1024)
+def _compile_query(query: str) -> _CompiledQuery:
+    return _CompiledQuery(_Parser(query).parse())
+
+
+# ---------------------------------------------------------------------------
+# Schema statements
+# ---------------------------------------------------------------------------
+
+_IDENT = r"(?:`[^`]+`|[A-Za-z_][A-Za-z0-9_]*)"
+_CREATE_CONSTRAINT_RE = re.compile(
+    rf"^CREATE\s+CONSTRAINT\s*(?P<name>{_IDENT})?\s*(?P<ine>IF\s+NOT\s+EXISTS)?\s+"
+    rf"FOR\s*\(\s*(?P<var>{_IDENT})\s*:\s*(?P<label>{_IDENT})\s*\)\s*"
+    rf"REQUIRE\s+(?P<props>.+?)\s+IS\s+UNIQUE\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_CREATE_INDEX_RE = re.compile(
+    rf"^CREATE\s+(?:(?P<kind>RANGE|TEXT|POINT|BTREE)\s+)?INDEX\s*(?P<name>{_IDENT})?\s*"
+    rf"(?P<ine>IF\s+NOT\s+EXISTS)?\s+FOR\s*\(\s*(?P<var>{_IDENT})\s*:\s*(?P<label>{_IDENT})\s*\)\s*"
+    rf"ON\s*\((?P<props>.+?)\)\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_DROP_RE = re.compile(
+    rf"^DROP\s+(?P<what>INDEX|CONSTRAINT)\s+(?P<name>{_IDENT})\s*(?P<ie>IF\s+EXISTS)?\s*;?\s*$",
+    re.IGNORECASE,
+)
+_SHOW_RE = re.compile(r"^SHOW\s+(?:(?:ALL|RANGE|TEXT)\s+)?(?P<what>INDEXES|INDEX|CONSTRAINTS)\b", re.IGNORECASE)
+_AWAIT_RE = re.compile(r"^CALL\s+db\.awaitIndex(?:es)?\s*\(", re.IGNORECASE)
+_PREFIX_RE = re.compile(r"^\s*(?P<mode>PROFILE|EXPLAIN)\b", re.IGNORECASE)
+
+
+def _unquote(name: Optional[str]) -> Optional[str]:
+    if name and name.startswith("`"):
+        return name[1:-1]
+    return name
+
+
+def _property_names(var: str, text: str) -> tuple[str, ...]:
+    text = text.strip().strip("()")
+    names = []
+    for part in text.split(","):
+        part = part.strip()
+        prefix = f"{var}."
+        if not part.startswith(prefix):
+            raise CypherError(f"Invalid property reference in schema statement: {part}")
+        names.append(_unquote(part[len(prefix) :].strip()) or "")
+    return tuple(names)
+
+
+def _run_schema_statement(graph: InMemoryGraph, query: str, counters: Counters) -> Optional[tuple[list[str], list[Row]]]:
+    stripped = query.strip()
+    match = _CREATE_CONSTRAINT_RE.match(stripped)
+    if match:
+        var = _unquote(match["var"]) or ""
+        label = _unquote(match["label"]) or ""
+        properties = _property_names(var, match["props"])
+        name = _unquote(match["name"]) or f"constraint_{label}_{'_'.join(properties)}".lower()
+        if graph.add_index(IndexInfo(name, label, properties, "RANGE", unique=True)):
+            counters.constraints_added += 1
+        return [], []
+    match = _CREATE_INDEX_RE.match(stripped)
+    if match:
+        var = _unquote(match["var"]) or ""
+        label = _unquote(match["label"]) or ""
+        properties = _property_names(var, match["props"])
+        kind = (match["kind"] or "RANGE").upper()
+        name = _unquote(match["name"]) or f"index_{label}_{'_'.join(properties)}".lower()
+        if graph.add_index(IndexInfo(name, label, properties, "RANGE" if kind == "BTREE" else kind)):
+            counters.indexes_added += 1
+        return [], []
+    match = _DROP_RE.match(stripped)
+    if match:
+        name = _unquote(match["name"]) or ""
+        info = graph.schema.get(name)
+        if info is None or info.unique != (match["what"].upper() == "CONSTRAINT"):
+            if match["ie"]:
+                return [], []
+            raise CypherError(f"There is no such {match['what'].lower()}: {name}")
+        graph.drop_index(name)
+        if info.unique:
+            counters.constraints_removed += 1
+        else:
+            counters.indexes_removed += 1
+        return [], []
+    match = _SHOW_RE.match(stripped)
+    if match:
+        constraints = match["what"].upper() == "CONSTRAINTS"
+        columns = ["name", "type", "entityType", "labelsOrTypes", "properties", "state"]
+        if constraints:
+            columns = ["name", "type", "entityType", "labelsOrTypes", "properties"]
+        rows = []
+        for info in graph.schema.values():
+            if constraints and not info.unique:
+                continue
+            row = {
+                "name": info.name,
+                "type": "UNIQUENESS" if constraints else info.index_type,
+                "entityType": "NODE",
+                "labelsOrTypes": [info.label],
+                "properties": list(info.properties),
+            }
+            if not constraints:
+                row["state"] = "ONLINE"
+            rows.append(row)
+        return columns, rows
+    if _AWAIT_RE.match(stripped):
+        return [], []
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+class _MemoryScope:
+    def __init__(self, client: "InMemoryGraphClient", is_transaction: bool) -> None:
+        self._client = client
+        self.is_transaction = is_transaction
+
+    def run(self, query: str, parameters: Optional[Mapping[str, Any]] = None) -> QueryResult:
+        return self._client._run(query, parameters)
+
+
+class InMemoryGraphClient:
+    """Drop-in stand-in for ``Neo4jClient`` backed by :class:`InMemoryGraph`."""
+
+    def __init__(self, graph: Optional[InMemoryGraph] = None, profiler: Optional[QueryProfiler] = None) -> None:
+        self.graph = graph if graph is not None else InMemoryGraph()
+        self.profiler = profiler
+        self._local = threading.local()
+
+    def close(self) -> None:
+        pass
+
+    def _scopes(self) -> list[_MemoryScope]:
+        scopes = getattr(self._local, "scopes", None)
+        if scopes is None:
+            scopes = []
+            self._local.scopes = scopes
+        return scopes
+
+    def _in_transaction(self) -> bool:
+        return any(scope.is_transaction for scope in self._scopes())
+
+    def _run(self, query: str, parameters: Optional[Mapping[str, Any]]) -> QueryResult:
+        if self.profiler is None:
+            return self._execute(query, parameters)
+        return self.profiler.run(query, parameters, lambda statement: self._execute(statement, parameters))
+
+    def _execute(self, query: str, parameters: Optional[Mapping[str, Any]]) -> QueryResult:
+        params = dict(parameters or {})
+        counters = Counters()
+        graph = self.graph
+        mode = None
+        prefix = _PREFIX_RE.match(query)
+        statement = query
+        if prefix:
+            mode = prefix["mode"].upper()
+            statement = query[prefix.end() :]
+        with graph.lock:
+            schema_result = _run_schema_statement(graph, statement, counters)
+            if schema_result is not None:
+                columns, rows = schema_result
+                summary = ResultSummary(query, params, counters, query_type="s")
+                return QueryResult([Record(row) for row in rows], columns, summary)
+            compiled = _compile_query(statement.strip())
+            if mode == "EXPLAIN":
+                summary = ResultSummary(query, params, counters, "rw" if compiled.updating else "r")
+                return QueryResult([], [], summary)
+            mark = graph._journal_mark()
+            try:
+                ctx = _Context(graph, params, counters, [] if mode == "PROFILE" else None)
+                columns, rows = compiled.execute(ctx)
+            except Exception:
+                graph._rollback_to(mark)
+                raise
+            if not self._in_transaction():
+                graph._commit_journal()
+            records = [Record((column, _snapshot(row.get(column))) for column in columns) for row in rows]
+        query_type = "rw" if compiled.updating and compiled.returns else "w" if compiled.updating else "r"
+        summary = ResultSummary(query, params, counters, query_type)
+        if mode == "PROFILE":
+            summary.profile = _profile_tree(ctx.steps or [], columns, len(records))
+        return QueryResult(records, columns, summary)
+
+    @contextmanager
+    def session(self) -> Iterator[_MemoryScope]:
+        scopes = self._scopes()
+        if scopes:
+            yield scopes[-1]
+            return
+        scope = _MemoryScope(self, is_transaction=False)
+        scopes.append(scope)
+        try:
+            yield scope
+        finally:
+            scopes.pop()
+
+    @contextmanager
+    def transaction(self) -> Iterator[_MemoryScope]:
+        scopes = self._scopes()
+        if scopes and scopes[-1].is_transaction:
+            yield scopes[-1]
+            return
+        graph = self.graph
+        with graph.lock:
+            mark = graph._journal_mark()
+            scope = _MemoryScope(self, is_transaction=True)
+            scopes.append(scope)
+            try:
+                yield scope
+            except BaseException:
+                graph._rollback_to(mark)
+                raise
+            else:
+                if mark == 0:
+                    graph._commit_journal()
+            finally:
+                scopes.pop()
+
+    def run(self, query: str, parameters: Optional[Mapping[str, Any]] = None) -> QueryResult:
+        return self._run(query, parameters)
+
+    def execute_write(self, query: str, parameters: Optional[Mapping[str, Any]] = None) -> QueryResult:
+        with self.transaction() as tx:
+            return tx.run(query, parameters)
+
+    def run_many(self, statements: Iterable[Statement]) -> list[QueryResult]:
+        with self.transaction() as tx:
+            return [tx.run(*_normalize_statement(statement)) for statement in statements]
+
+
+__all__ = [
+    "ConstraintError",
+    "Counters",
+    "CypherError",
+    "InMemoryGraph",
+    "InMemoryGraphClient",
+    "Node",
+    "Record",
+    "Relationship",
+    "ResultSummary",
+]
@@ -1,23 +1,150 @@
 from __future__ import annotations
 
-from typing import Any, Mapping, Optional
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence, Tuple, Union
 
 try:
-    from neo4j import GraphDatabase
+    from neo4j import AsyncGraphDatabase, GraphDatabase
     from neo4j.exceptions import Neo4jError
 except ImportError:  # pragma: no cover - handled at runtime
+    AsyncGraphDatabase = None  # type: ignore[assignment]
     GraphDatabase = None  # type: ignore[assignment]
     Neo4jError = Exception  # type: ignore[misc, assignment]
 
 from src import config
 
+from .profiling import QueryProfiler, default_profiler
+
+Statement = Union[str, Tuple[str, Optional[Mapping[str, Any]]]]
+
+# Update counters reported in load telemetry, named as on ``SummaryCounters``.
+SERVER_COUNTERS: Tuple[str, ...] = ("nodes_created", "relationships_created", "properties_set")
+
+
+class QueryResult:
+    """Records of a statement, fetched completely before its session closed."""
+
+    __slots__ = ("records", "keys", "summary")
+
+    def __init__(
+        self,
+        records: Sequence[Any],
+        keys: Sequence[str] = (),
+        summary: Any = None,
+    ) -> None:
+        self.records = list(records)
+        self.keys = tuple(keys)
+        self.summary = summary
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def single(self) -> Any:
+        return self.records[0] if self.records else None
+
+    def value(self, key: Union[int, str] = 0, default: Any = None) -> Any:
+        record = self.single()
+        if record is None:
+            return default
+        if isinstance(key, int):
+            return list(record.values())[key]
+        return record.get(key, default)
+
+    def data(self) -> list[dict[str, Any]]:
+        return [dict(record) for record in self.records]
+
+    def consume(self) -> Any:
+        return self.summary
+
+
+def _materialize(result: Any) -> QueryResult:
+    keys = tuple(result.keys())
+    records = list(result)
+    summary = result.consume()
+    return QueryResult(records, keys, summary)
+
+
+async def _materialize_async(result: Any) -> QueryResult:
+    keys = tuple(result.keys())
+    records = [record async for record in result]
+    summary = await result.consume()
+    return QueryResult(records, keys, summary)
+
+
+def summary_counters(summary: Any) -> dict[str, int]:
+    """``SERVER_COUNTERS`` of a result summary; zeros when the summary has none."""
+    counters = getattr(summary, "counters", None)
+    return {name: int(getattr(counters, name, 0) or 0) for name in SERVER_COUNTERS}
+
+
+def _run_statement(
+    runner: Any,
+    query: str,
+    parameters: Optional[Mapping[str, Any]],
+    profiler: Optional[QueryProfiler],
+) -> QueryResult:
+    params = dict(parameters or {})
+    if profiler is None:
+        return _materialize(runner.run(query, params))
+    return profiler.run(query, params, lambda statement: _materialize(runner.run(statement, params)))
+
+
+async def _run_statement_async(
+    runner: Any,
+    query: str,
+    parameters: Optional[Mapping[str, Any]],
+    profiler: Optional[QueryProfiler],
+) -> QueryResult:
+    params = dict(parameters or {})
+
+    async def run(statement: str) -> QueryResult:
+        return await _materialize_async(await runner.run(statement, params))
+
+    if profiler is None:
+        return await run(query)
+    return await profiler.run_async(query, params, run)
+
+
+def _normalize_statement(statement: Statement) -> tuple[str, dict[str, Any]]:
+    if isinstance(statement, str):
+        return statement, {}
+    query, parameters = statement
+    return query, dict(parameters or {})
+
+
+class _Scope:
+    """Runs statements on an open driver session or transaction."""
+
+    def __init__(self, runner: Any, is_transaction: bool, profiler: Optional[QueryProfiler] = None) -> None:
+        self._runner = runner
+        self.is_transaction = is_transaction
+        self._profiler = profiler
+
+    def run(self, query: str, parameters: Optional[Mapping[str, Any]] = None) -> QueryResult:
+        return _run_statement(self._runner, query, parameters, self._profiler)
+
 
 class Neo4jClient:
+    """Thread-aware wrapper around a driver; statements return :class:`QueryResult`.
+
+    ``profiler`` turns on statement profiling and slow-query logging (see
+    :class:`~src.graph.profiling.QueryProfiler`); by default it is built
+    from the ``QUERY_PROFILE_SAMPLE``/``SLOW_QUERY_LOG`` settings, and is
+    off when neither is set.
+    """
+
     def __init__(
         self,
         uri: Optional[str] = None,
         user: Optional[str] = None,
         password: Optional[str] = None,
+        database: Optional[str] = None,
+        profiler: Optional[QueryProfiler] = None,
     ) -> None:
         if GraphDatabase is None:  # pragma: no cover - requires driver install
             raise RuntimeError(
@@ -27,19 +154,177 @@ class Neo4jClient:
         self._uri = uri or config.NEO4J_URI
         self._user = user or config.NEO4J_USER
         self._password = password or config.NEO4J_PASSWORD
+        self._database = database
         self._driver = GraphDatabase.driver(
             self._uri,
             auth=(self._user, self._password),
         )
+        self.profiler = profiler if profiler is not None else default_profiler()
+        # Driver sessions are not thread safe, so every thread keeps its own scopes.
+        self._local = threading.local()
 
     def close(self) -> None:
         if self._driver is not None:
             self._driver.close()
 
-    def run(self, query: str, parameters: Optional[Mapping[str, Any]] = None):
-        params = dict(parameters or {})
-        with self._driver.session() as session:
-            return session.run(query, params)
+    def _scopes(self) -> list[_Scope]:
+        scopes = getattr(self._local, "scopes", None)
+        if scopes is None:
+            scopes = []
+            self._local.scopes = scopes
+        return scopes
+
+    def _open_session(self):
+        if self._database is None:
+            return self._driver.session()
+        return self._driver.session(database=self._database)
+
+    @contextmanager
+    def session(self) -> Iterator[_Scope]:
+        scopes = self._scopes()
+        if scopes:
+            yield scopes[-1]
+            return
+
+        with self._open_session() as session:
+            scope = _Scope(session, is_transaction=False, profiler=self.profiler)
+            scopes.append(scope)
+            try:
+                yield scope
+            finally:
+                scopes.pop()
+
+    @contextmanager
+    def transaction(self) -> Iterator[_Scope]:
+        scopes = self._scopes()
+        if scopes and scopes[-1].is_transaction:
+            yield scopes[-1]
+            return
+
+        with self.session() as session_scope:
+            tx = session_scope._runner.begin_transaction()
+            scope = _Scope(tx, is_transaction=True, profiler=self.profiler)
+            scopes.append(scope)
+            try:
+                yield scope
+            except BaseException:
+                tx.rollback()
+                raise
+            else:
+                tx.commit()
+            finally:
+                scopes.pop()
+                tx.close()
+
+    def run(self, query: str, parameters: Optional[Mapping[str, Any]] = None) -> QueryResult:
+        scopes = self._scopes()
+        if scopes:
+            return scopes[-1].run(query, parameters)
+        with self.session() as scope:
+            return scope.run(query, parameters)
+
+    def execute_write(self, query: str, parameters: Optional[Mapping[str, Any]] = None) -> QueryResult:
+        """Run ``query`` in a managed write transaction.
+
+        The driver retries the whole transaction on transient errors
+        (deadlocks, leader switches, dropped connections) until its retry
+        budget runs out. Inside :meth:`transaction` the statement simply
+        joins the open transaction.
+        """
+        scopes = self._scopes()
+        if scopes and scopes[-1].is_transaction:
+            return scopes[-1].run(query, parameters)
+
+        def work(tx: Any) -> QueryResult:
+            return _run_statement(tx, query, parameters, self.profiler)
+
+        with self.session() as scope:
+            return scope._runner.execute_write(work)
+
+    def run_many(self, statements: Iterable[Statement]) -> list[QueryResult]:
+        with self.transaction() as tx:
+            return [tx.run(*_normalize_statement(statement)) for statement in statements]
+
+
+class AsyncNeo4jClient:
+    """:class:`Neo4jClient` for asyncio code, on the driver's async API.
+
+    Statements return the same :class:`QueryResult`, fetched completely, so
+    query helpers share their result handling with the sync client. Each
+    call runs in its own session from the driver's connection pool; at most
+    ``max_concurrency`` (``QUERY_CONCURRENCY``) statements are in flight per
+    client and further callers wait for a slot instead of failing to get a
+    connection. Use it as ``async with AsyncNeo4jClient() as client:`` or
+    ``await client.close()``.
+    """
+
+    def __init__(
+        self,
+        uri: Optional[str] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        database: Optional[str] = None,
+        profiler: Optional[QueryProfiler] = None,
+        *,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        if AsyncGraphDatabase is None:  # pragma: no cover - requires driver install
+            raise RuntimeError(
+                "neo4j driver is not installed. Please install 'neo4j' package to use AsyncNeo4jClient."
+            )
+        self.max_concurrency = config.QUERY_CONCURRENCY if max_concurrency is None else max_concurrency
+        if self.max_concurrency <= 0:
+            raise ValueError(f"max_concurrency must be positive, got {self.max_concurrency}")
+
+        self._uri = uri or config.NEO4J_URI
+        self._user = user or config.NEO4J_USER
+        self._password = password or config.NEO4J_PASSWORD
+        self._database = database
+        self._driver = AsyncGraphDatabase.driver(
+            self._uri,
+            auth=(self._user, self._password),
+            max_connection_pool_size=self.max_concurrency,
+        )
+        self.profiler = profiler if profiler is not None else default_profiler()
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self) -> None:
+        if self._driver is not None:
+            await self._driver.close()
+
+    async def __aenter__(self) -> "AsyncNeo4jClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _open_session(self):
+        if self._database is None:
+            return self._driver.session()
+        return self._driver.session(database=self._database)
+
+    async def run(self, query: str, parameters: Optional[Mapping[str, Any]] = None) -> QueryResult:
+        async with self._slots:
+            async with self._open_session() as session:
+                return await _run_statement_async(session, query, parameters, self.profiler)
+
+    async def execute_write(self, query: str, parameters: Optional[Mapping[str, Any]] = None) -> QueryResult:
+        """Run ``query`` in a managed write transaction, retried on transient errors."""
+
+        async def work(tx: Any) -> QueryResult:
+            return await _run_statement_async(tx, query, parameters, self.profiler)
+
+        async with self._slots:
+            async with self._open_session() as session:
+                return await session.execute_write(work)
 
 
-__all__ = ["Neo4jClient", "Neo4jError"]
+__all__ = [
+    "AsyncNeo4jClient",
+    "Neo4jClient",
+    "Neo4jError",
+    "QueryResult",
+    "SERVER_COUNTERS",
+    "Statement",
+    "summary_counters",
+]
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Mapping, Optional
+
+from src import config
+
+Clock = Callable[[], float]
+Runner = Callable[[str], Any]
+AsyncRunner = Callable[[str], Awaitable[Any]]
+
+# Operators worth a look in staging: full scans and unconstrained joins.
+SUSPICIOUS_OPERATORS = ("AllNodesScan", "NodeByLabelScan", "CartesianProduct")
+
+# PROFILE cannot wrap schema or administration commands, or a statement that
+# already carries its own PROFILE/EXPLAIN prefix.
+_UNPROFILABLE_RE = re.compile(
+    r"^\s*(?:PROFILE|EXPLAIN|CREATE\s+(?:CONSTRAINT|INDEX|(?:RANGE|TEXT|POINT|LOOKUP|FULLTEXT|VECTOR)\s+INDEX)|"
+    r"DROP|SHOW|CALL\s+db\.awaitIndexes)\b",
+    re.IGNORECASE,
+)
+
+slow_query_logger = logging.getLogger("src.graph.slow_queries")
+
+
+def redact_parameters(parameters: Optional[Mapping[str, Any]]) -> dict[str, str]:
+    """Keep parameter names and shapes, never their values."""
+    redacted: dict[str, str] = {}
+    for name, value in (parameters or {}).items():
+        if isinstance(value, (list, tuple)):
+            redacted[name] = f"<list[{len(value)}]>"
+        elif isinstance(value, Mapping):
+            redacted[name] = f"<map[{len(value)}]>"
+        else:
+            redacted[name] = f"<{type(value).__name__}>"
+    return redacted
+
+
+def _operator_name(plan: Mapping[str, Any]) -> str:
+    operator = str(plan.get("operatorType", ""))
+    return operator.split("@", 1)[0]
+
+
+def _walk_plan(plan: Optional[Mapping[str, Any]], operators: list[str]) -> int:
+    if not plan:
+        return 0
+    operators.append(_operator_name(plan))
+    hits = int(plan.get("dbHits", 0) or 0)
+    for child in plan.get("children", ()) or ():
+        hits += _walk_plan(child, operators)
+    return hits
+
+
+@dataclass(frozen=True)
+class QueryProfile:
+    query: str
+    parameters: dict[str, str]
+    elapsed: float
+    rows: int
+    profiled: bool
+    db_hits: int = 0
+    operators: tuple[str, ...] = ()
+
+    @property
+    def warnings(self) -> tuple[str, ...]:
+        return tuple(op for op in dict.fromkeys(self.operators) if op in SUSPICIOUS_OPERATORS)
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["elapsed_ms"] = round(payload.pop("elapsed") * 1000, 3)
+        payload["warnings"] = list(self.warnings)
+        return payload
+
+
+class QueryProfiler:
+    """Opt-in statement profiling for ``Neo4jClient``.
+
+    A ``sample_rate`` fraction of statements runs under ``PROFILE`` and
+    keeps its plan operators and db hits; every statement is timed. Those
+    slower than ``slow_threshold`` seconds are logged to the
+    ``src.graph.slow_queries`` logger and, with ``log_path``, appended to
+    that file as JSON lines. Parameter values are never recorded, only
+    their names and shapes. The latest ``history`` profiles are kept in
+    :attr:`profiles`.
+    """
+
+    def __init__(
+        self,
+        sample_rate: Optional[float] = None,
+        slow_threshold: Optional[float] = None,
+        log_path: Optional[Path] = None,
+        *,
+        history: int = 1000,
+        clock: Clock = time.perf_counter,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.sample_rate = config.QUERY_PROFILE_SAMPLE if sample_rate is None else sample_rate
+        self.slow_threshold = config.SLOW_QUERY_SECONDS if slow_threshold is None else slow_threshold
+        self.log_path = log_path if log_path is not None else config.SLOW_QUERY_LOG
+        if not 0 <= self.sample_rate <= 1:
+            raise ValueError(f"sample_rate must be between 0 and 1, got {self.sample_rate}")
+        if self.slow_threshold < 0:
+            raise ValueError(f"slow_threshold must not be negative, got {self.slow_threshold}")
+        self.profiles: deque[QueryProfile] = deque(maxlen=history)
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def run(self, query: str, parameters: Optional[Mapping[str, Any]], runner: Runner) -> Any:
+        """Run ``runner(statement)`` for ``query``, profiled if sampled; returns its ``QueryResult``."""
+        profiled = self._sample(query)
+        started = self._clock()
+        result = runner(f"PROFILE {query}" if profiled else query)
+        return self._record(query, parameters, result, self._clock() - started, profiled)
+
+    async def run_async(self, query: str, parameters: Optional[Mapping[str, Any]], runner: AsyncRunner) -> Any:
+        """:meth:`run` for a coroutine ``runner``, as used by ``AsyncNeo4jClient``."""
+        profiled = self._sample(query)
+        started = self._clock()
+        result = await runner(f"PROFILE {query}" if profiled else query)
+        return self._record(query, parameters, result, self._clock() - started, profiled)
+
+    def _record(
+        self, query: str, parameters: Optional[Mapping[str, Any]], result: Any, elapsed: float, profiled: bool
+    ) -> Any:
+        operators: list[str] = []
+        db_hits = _walk_plan(getattr(result.summary, "profile", None), operators) if profiled else 0
+        profile = QueryProfile(
+            query=query,
+            parameters=redact_parameters(parameters),
+            elapsed=elapsed,
+            rows=len(result),
+            profiled=profiled,
+            db_hits=db_hits,
+            operators=tuple(operators),
+        )
+        with self._lock:
+            self.profiles.append(profile)
+        if elapsed >= self.slow_threshold:
+            self._log_slow(profile)
+        return result
+
+    def slow_queries(self) -> list[QueryProfile]:
+        with self._lock:
+            return [profile for profile in self.profiles if profile.elapsed >= self.slow_threshold]
+
+    def _sample(self, query: str) -> bool:
+        if self.sample_rate <= 0 or _UNPROFILABLE_RE.match(query):
+            return False
+        with self._lock:
+            return self.sample_rate >= 1 or self._rng.random() < self.sample_rate
+
+    def _log_slow(self, profile: QueryProfile) -> None:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms, %d rows, %d db hits%s): %s",
+            profile.elapsed * 1000,
+            profile.rows,
+            profile.db_hits,
+            f", {'/'.join(profile.warnings)}" if profile.warnings else "",
+            " ".join(profile.query.split()),
+        )
+        if self.log_path is None:
+            return
+        entry = {"time": datetime.now(timezone.utc).isoformat(), **profile.to_dict()}
+        with self._lock:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.log_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry) + "\n")
+
+
+def default_profiler() -> Optional[QueryProfiler]:
+    """A profiler from the environment settings, or ``None`` when profiling is off."""
+    if config.QUERY_PROFILE_SAMPLE <= 0 and config.SLOW_QUERY_LOG is None:
+        return None
+    return QueryProfiler()
+
+
+__all__ = [
+    "QueryProfile",
+    "QueryProfiler",
+    "SUSPICIOUS_OPERATORS",
+    "default_profiler",
+    "redact_parameters",
+]
@@ -1,9 +1,28 @@
 from __future__ import annotations
 
-from src.ontology_schema import NODE_KEY_MAP, NodeLabel
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+from src.ontology_schema import (
+    INDEX_NAME_PREFIX,
+    INDEX_SPECS,
+    NODE_KEY_MAP,
+    QUERY_PATTERNS,
+    IndexSpec,
+    QueryPattern,
+)
 
 from .neo4j_client import Neo4jClient
 
+DEFAULT_INDEX_TIMEOUT = 300.0
+
+# Plan operators that read from an index rather than scanning the label.
+_INDEX_OPERATORS = ("NodeIndex", "NodeUniqueIndex")
+
+logger = logging.getLogger(__name__)
+
 
 def create_constraints(client: Neo4jClient) -> None:
     for label, key in NODE_KEY_MAP.items():
@@ -14,4 +33,189 @@ def create_constraints(client: Neo4jClient) -> None:
         client.run(cypher)
 
 
-__all__ = ["create_constraints"]
+def index_statement(spec: IndexSpec) -> str:
+    properties = ", ".join(f"n.{name}" for name in spec.properties)
+    return (
+        f"CREATE {spec.kind.value} INDEX {spec.name} IF NOT EXISTS "
+        f"FOR (n:{spec.label.value}) ON ({properties})"
+    )
+
+
+@dataclass(frozen=True)
+class ExistingIndex:
+    name: str
+    label: str
+    properties: tuple[str, ...]
+    kind: str
+    state: str
+
+    def matches(self, spec: IndexSpec) -> bool:
+        return (self.label, self.properties, self.kind) == (spec.label.value, spec.properties, spec.kind.value)
+
+
+@dataclass(frozen=True)
+class IndexDiff:
+    """Declared indexes compared with the database.
+
+    ``missing`` are declared but absent; ``extra`` are managed indexes (named
+    with ``INDEX_NAME_PREFIX``) that are no longer declared.
+    """
+
+    present: tuple[IndexSpec, ...]
+    missing: tuple[IndexSpec, ...]
+    extra: tuple[ExistingIndex, ...]
+
+    @property
+    def in_sync(self) -> bool:
+        return not self.missing and not self.extra
+
+
+def existing_indexes(client: Neo4jClient) -> list[ExistingIndex]:
+    """Secondary node indexes in the database, without constraint-backed ones."""
+    # A uniqueness constraint's backing index has the constraint's name.
+    constraints = {record["name"] for record in client.run("SHOW CONSTRAINTS")}
+    indexes = []
+    for record in client.run("SHOW INDEXES"):
+        labels = record.get("labelsOrTypes") or []
+        if record["name"] in constraints or record.get("entityType") != "NODE" or len(labels) != 1:
+            continue
+        indexes.append(
+            ExistingIndex(
+                name=record["name"],
+                label=labels[0],
+                properties=tuple(record.get("properties") or ()),
+                kind=record["type"],
+                state=record.get("state", "ONLINE"),
+            )
+        )
+    return indexes
+
+
+def diff_indexes(client: Neo4jClient, specs: Sequence[IndexSpec] = INDEX_SPECS) -> IndexDiff:
+    existing = existing_indexes(client)
+    present = tuple(spec for spec in specs if any(index.matches(spec) for index in existing))
+    missing = tuple(spec for spec in specs if spec not in present)
+    extra = tuple(
+        index
+        for index in existing
+        if index.name.startswith(INDEX_NAME_PREFIX) and not any(index.matches(spec) for spec in specs)
+    )
+    return IndexDiff(present=present, missing=missing, extra=extra)
+
+
+def wait_for_indexes(client: Neo4jClient, timeout: float = DEFAULT_INDEX_TIMEOUT) -> None:
+    """Block until every index is online; raise if one failed or ``timeout`` passed."""
+    deadline = time.monotonic() + timeout
+    client.run("CALL db.awaitIndexes($timeout)", {"timeout": int(max(timeout, 1))})
+    while True:
+        states = {index.name: index.state for index in existing_indexes(client)}
+        failed = sorted(name for name, state in states.items() if state == "FAILED")
+        if failed:
+            raise RuntimeError(f"Index population failed: {', '.join(failed)}")
+        pending = sorted(name for name, state in states.items() if state != "ONLINE")
+        if not pending:
+            return
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Indexes not online after {timeout:.0f}s: {', '.join(pending)}")
+        time.sleep(0.5)
+
+
+def sync_indexes(
+    client: Neo4jClient,
+    specs: Sequence[IndexSpec] = INDEX_SPECS,
+    *,
+    drop_extra: bool = True,
+    wait: bool = True,
+    timeout: float = DEFAULT_INDEX_TIMEOUT,
+) -> IndexDiff:
+    """Create the declared indexes that are missing and drop stale managed ones.
+
+    Idempotent: running it again against a synced database changes nothing.
+    Returns the diff it applied. With ``wait`` it returns once every index
+    is online.
+    """
+    diff = diff_indexes(client, specs)
+    for spec in diff.missing:
+        client.run(index_statement(spec))
+    if drop_extra:
+        for index in diff.extra:
+            client.run(f"DROP INDEX {index.name} IF EXISTS")
+    if diff.missing or (drop_extra and diff.extra):
+        logger.info(
+            "Indexes synced: created %s, dropped %s",
+            [spec.name for spec in diff.missing] or "none",
+            [index.name for index in diff.extra] if drop_extra and diff.extra else "none",
+        )
+    if wait:
+        wait_for_indexes(client, timeout)
+    return diff
+
+
+@dataclass(frozen=True)
+class PatternCheck:
+    pattern: str
+    index: str
+    uses_index: Optional[bool]  # None when the server returned no plan
+    operators: tuple[str, ...]
+
+
+def _plan_operators(plan: Optional[Mapping[str, Any]]) -> Iterable[tuple[str, str]]:
+    if not plan:
+        return
+    args = plan.get("args") or plan.get("arguments") or {}
+    details = str(args.get("Details", "")) if isinstance(args, Mapping) else ""
+    yield str(plan.get("operatorType", "")).split("@", 1)[0], details
+    for child in plan.get("children", ()) or ():
+        yield from _plan_operators(child)
+
+
+def _uses_index(operators: Sequence[tuple[str, str]], spec: IndexSpec) -> bool:
+    # Details read like "RANGE INDEX s:Student(status) WHERE status = $status".
+    target = f":{spec.label.value}({', '.join(spec.properties)})"
+    return any(
+        operator.startswith(_INDEX_OPERATORS) and target in details and spec.kind.value in details
+        for operator, details in operators
+    )
+
+
+def check_query_patterns(
+    client: Neo4jClient, patterns: Sequence[QueryPattern] = QUERY_PATTERNS
+) -> list[PatternCheck]:
+    """``EXPLAIN`` every declared pattern and report whether it seeks its index."""
+    checks = []
+    for pattern in patterns:
+        summary = client.run(f"EXPLAIN {pattern.query}", dict(pattern.parameters)).consume()
+        plan = getattr(summary, "plan", None)
+        operators = list(_plan_operators(plan))
+        checks.append(
+            PatternCheck(
+                pattern=pattern.name,
+                index=pattern.index.name,
+                uses_index=_uses_index(operators, pattern.index) if plan else None,
+                operators=tuple(operator for operator, _details in operators),
+            )
+        )
+    for check in checks:
+        if check.uses_index is False:
+            logger.warning(
+                "Query pattern %s does not use index %s (plan: %s)",
+                check.pattern,
+                check.index,
+                " <- ".join(check.operators),
+            )
+    return checks
+
+
+__all__ = [
+    "DEFAULT_INDEX_TIMEOUT",
+    "ExistingIndex",
+    "IndexDiff",
+    "PatternCheck",
+    "check_query_patterns",
+    "create_constraints",
+    "diff_indexes",
+    "existing_indexes",
+    "index_statement",
+    "sync_indexes",
+    "wait_for_indexes",
+]
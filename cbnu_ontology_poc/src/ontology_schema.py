@@ -1,8 +1,8 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Final
+from typing import Any, Final, Mapping
 
 
 class NodeLabel(str, Enum):
@@ -23,11 +23,27 @@ class RelType(str, Enum):
     PARTICIPATED_IN = "PARTICIPATED_IN"
 
 
+class ColumnType(str, Enum):
+    ID = "id"  # identifiers: always text, however a file spells them
+    TEXT = "text"
+    CATEGORY = "category"  # a few distinct values repeated across many rows
+    INT = "int"
+    FLOAT = "float"
+    BOOL = "bool"
+
+
 @dataclass(frozen=True)
 class NodeSchema:
     label: NodeLabel
     key: str
     properties: tuple[str, ...]
+    # Properties not listed here are free text; the key is always an ID.
+    types: Mapping[str, ColumnType] = field(default_factory=dict)
+
+    def column_type(self, column: str) -> ColumnType:
+        if column == self.key:
+            return ColumnType.ID
+        return self.types.get(column, ColumnType.TEXT)
 
 
 NODE_SCHEMAS: Final[dict[NodeLabel, NodeSchema]] = {
@@ -35,26 +51,31 @@ NODE_SCHEMAS: Final[dict[NodeLabel, NodeSchema]] = {
         label=NodeLabel.STUDENT,
         key="student_id",
         properties=("student_id", "name", "dept_id", "year", "status"),
+        types={"dept_id": ColumnType.CATEGORY, "year": ColumnType.INT, "status": ColumnType.CATEGORY},
     ),
     NodeLabel.COURSE: NodeSchema(
         label=NodeLabel.COURSE,
         key="course_id",
         properties=("course_id", "name", "dept_id", "credit", "type"),
+        types={"dept_id": ColumnType.CATEGORY, "credit": ColumnType.INT, "type": ColumnType.CATEGORY},
     ),
     NodeLabel.BOOK: NodeSchema(
         label=NodeLabel.BOOK,
         key="book_id",
         properties=("book_id", "title", "author", "topic", "available"),
+        types={"topic": ColumnType.CATEGORY, "available": ColumnType.BOOL},
     ),
     NodeLabel.PROGRAM: NodeSchema(
         label=NodeLabel.PROGRAM,
         key="program_id",
         properties=("program_id", "name", "target_dept_id", "skill_tag"),
+        types={"target_dept_id": ColumnType.CATEGORY, "skill_tag": ColumnType.CATEGORY},
     ),
     NodeLabel.SCHOLARSHIP: NodeSchema(
         label=NodeLabel.SCHOLARSHIP,
         key="scholarship_id",
         properties=("scholarship_id", "name", "min_gpa", "required_credit"),
+        types={"min_gpa": ColumnType.FLOAT, "required_credit": ColumnType.INT},
     ),
     NodeLabel.DEPARTMENT: NodeSchema(
         label=NodeLabel.DEPARTMENT,
@@ -63,14 +84,118 @@ NODE_SCHEMAS: Final[dict[NodeLabel, NodeSchema]] = {
     ),
 }
 
+# Columns of relations.csv, one row per relationship.
+RELATION_COLUMN_TYPES: Final[dict[str, ColumnType]] = {
+    "from_label": ColumnType.CATEGORY,
+    "from_id": ColumnType.ID,
+    "rel_type": ColumnType.CATEGORY,
+    "to_label": ColumnType.CATEGORY,
+    "to_id": ColumnType.ID,
+}
+
 NODE_KEY_MAP: Final[dict[NodeLabel, str]] = {
     label: schema.key for label, schema in NODE_SCHEMAS.items()
 }
 
+
+class IndexKind(str, Enum):
+    RANGE = "RANGE"  # equality, ranges and prefixes; several properties make a composite index
+    TEXT = "TEXT"  # CONTAINS / ENDS WITH on a single string property
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """A secondary index on properties other than the uniqueness key."""
+
+    label: NodeLabel
+    properties: tuple[str, ...]
+    kind: IndexKind = IndexKind.RANGE
+
+    @property
+    def name(self) -> str:
+        return f"{INDEX_NAME_PREFIX}{self.label.value}_{'_'.join(self.properties)}_{self.kind.value}".lower()
+
+
+@dataclass(frozen=True)
+class QueryPattern:
+    """A filter the application runs, with the index it is expected to use."""
+
+    name: str
+    query: str
+    index: IndexSpec
+    parameters: Mapping[str, Any] = field(default_factory=dict)
+
+
+# Managed indexes carry this prefix; other indexes are never dropped.
+INDEX_NAME_PREFIX: Final[str] = "ontology_"
+
+STUDENT_STATUS_INDEX = IndexSpec(NodeLabel.STUDENT, ("status",))
+STUDENT_COHORT_INDEX = IndexSpec(NodeLabel.STUDENT, ("dept_id", "year"))
+COURSE_DEPARTMENT_INDEX = IndexSpec(NodeLabel.COURSE, ("dept_id",))
+BOOK_AVAILABLE_INDEX = IndexSpec(NodeLabel.BOOK, ("available",))
+BOOK_TITLE_INDEX = IndexSpec(NodeLabel.BOOK, ("title",), IndexKind.TEXT)
+PROGRAM_SKILL_INDEX = IndexSpec(NodeLabel.PROGRAM, ("skill_tag",))
+
+INDEX_SPECS: Final[tuple[IndexSpec, ...]] = (
+    STUDENT_STATUS_INDEX,
+    STUDENT_COHORT_INDEX,
+    COURSE_DEPARTMENT_INDEX,
+    BOOK_AVAILABLE_INDEX,
+    BOOK_TITLE_INDEX,
+    PROGRAM_SKILL_INDEX,
+)
+
+QUERY_PATTERNS: Final[tuple[QueryPattern, ...]] = (
+    QueryPattern(
+        "students_by_status",
+        "MATCH (s:Student) WHERE s.status = $status RETURN s.student_id AS student_id",
+        STUDENT_STATUS_INDEX,
+        {"status": "graduating"},
+    ),
+    QueryPattern(
+        "students_by_cohort",
+        "MATCH (s:Student) WHERE s.dept_id = $dept_id AND s.year = $year RETURN s.student_id AS student_id",
+        STUDENT_COHORT_INDEX,
+        {"dept_id": "CSE", "year": 4},
+    ),
+    QueryPattern(
+        "courses_by_department",
+        "MATCH (c:Course) WHERE c.dept_id = $dept_id RETURN c.course_id AS course_id",
+        COURSE_DEPARTMENT_INDEX,
+        {"dept_id": "CSE"},
+    ),
+    QueryPattern(
+        "available_books",
+        "MATCH (b:Book) WHERE b.available = $available RETURN b.book_id AS book_id",
+        BOOK_AVAILABLE_INDEX,
+        {"available": True},
+    ),
+    QueryPattern(
+        "books_by_title",
+        "MATCH (b:Book) WHERE b.title CONTAINS $text RETURN b.book_id AS book_id",
+        BOOK_TITLE_INDEX,
+        {"text": "Graph"},
+    ),
+    QueryPattern(
+        "programs_by_skill",
+        "MATCH (p:Program) WHERE p.skill_tag = $skill_tag RETURN p.program_id AS program_id",
+        PROGRAM_SKILL_INDEX,
+        {"skill_tag": "AI"},
+    ),
+)
+
 __all__ = [
     "NodeLabel",
     "RelType",
+    "ColumnType",
     "NodeSchema",
     "NODE_SCHEMAS",
+    "RELATION_COLUMN_TYPES",
     "NODE_KEY_MAP",
+    "IndexKind",
+    "IndexSpec",
+    "QueryPattern",
+    "INDEX_NAME_PREFIX",
+    "INDEX_SPECS",
+    "QUERY_PATTERNS",
 ]
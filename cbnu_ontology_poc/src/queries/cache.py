@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from src import config
+from src.graph import graph_builder
+
+Clock = Callable[[], float]
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class QueryCache:
+    """Bounded LRU cache with a per-entry TTL for query results.
+
+    Entries are dropped when ``graph_builder`` reports a load, so results stay
+    consistent with the graph after a reload; a result computed while a load
+    ran is not stored. Cached values are shared between callers and must not
+    be mutated.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        ttl: Optional[float] = None,
+        *,
+        invalidate_on_load: bool = True,
+        clock: Clock = time.monotonic,
+    ) -> None:
+        self.maxsize = config.QUERY_CACHE_SIZE if maxsize is None else maxsize
+        self.ttl = config.QUERY_CACHE_TTL if ttl is None else ttl
+        if self.maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {self.maxsize}")
+        if self.ttl <= 0:
+            raise ValueError(f"ttl must be positive, got {self.ttl}")
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._generation = 0
+        if invalidate_on_load:
+            graph_builder.add_write_listener(self.invalidate)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+            self._misses += 1
+            return default
+
+    @property
+    def generation(self) -> int:
+        """Invalidations so far; pass the value read before a query to :meth:`put`."""
+        return self._generation
+
+    def put(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Store ``value``, unless the cache was invalidated after ``generation`` was read."""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        generation = self._generation
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            # Computed outside the lock: a concurrent miss may run the query
+            # twice, but lookups never wait on the database. A load finishing
+            # meanwhile may have invalidated the result, so it is then not kept.
+            value = compute()
+            self.put(key, value, generation)
+        return value
+
+    async def get_or_compute_async(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """:meth:`get_or_compute` for a coroutine function ``compute``."""
+        generation = self._generation
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = await compute()
+            self.put(key, value, generation)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop ``key``, or every entry when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._invalidations += 1
+            self._generation += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                size=len(self._entries),
+            )
+
+    def close(self) -> None:
+        graph_builder.remove_write_listener(self.invalidate)
+
+
+__all__ = ["CacheStats", "QueryCache"]
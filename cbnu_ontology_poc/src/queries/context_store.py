@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Optional
+
+from src import config
+from src.graph import graph_builder
+from src.ontology_schema import NODE_KEY_MAP, NodeLabel
+
+# Context sections whose nodes a student's document depends on.
+CONTEXT_SECTIONS: dict[str, NodeLabel] = {
+    "courses": NodeLabel.COURSE,
+    "books": NodeLabel.BOOK,
+    "programs": NodeLabel.PROGRAM,
+    "scholarships": NodeLabel.SCHOLARSHIP,
+}
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS contexts (student_id TEXT PRIMARY KEY, document BLOB NOT NULL) WITHOUT ROWID",
+    # Which stored documents embed a node, to find the students a change touches.
+    "CREATE TABLE IF NOT EXISTS refs ("
+    "label TEXT NOT NULL, key TEXT NOT NULL, student_id TEXT NOT NULL, "
+    "PRIMARY KEY (label, key, student_id)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS refs_student ON refs (student_id)",
+)
+# Stay below SQLite's default limit of host parameters per statement.
+_MAX_PARAMETERS = 500
+
+
+@dataclass(frozen=True)
+class MaterializeReport:
+    students: int
+    removed: int
+    batches: int
+    elapsed: float
+
+
+def default_store_path() -> Path:
+    return config.CONTEXT_STORE_PATH or config.DATA_DIR / ".student_contexts.sqlite3"
+
+
+def _encode(document: Mapping[str, Any]) -> bytes:
+    return zlib.compress(json.dumps(document, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def _decode(blob: bytes) -> dict[str, Any]:
+    return json.loads(zlib.decompress(blob))
+
+
+def _refs(student_id: str, document: Mapping[str, Any]) -> Iterable[tuple[str, str, str]]:
+    yield NodeLabel.STUDENT.value, student_id, student_id
+    for section, label in CONTEXT_SECTIONS.items():
+        key = NODE_KEY_MAP[label]
+        for node in document.get(section, ()):
+            if node.get(key) is not None:
+                yield label.value, str(node[key]), student_id
+
+
+def _chunks(items: list[str]) -> Iterable[list[str]]:
+    for offset in range(0, len(items), _MAX_PARAMETERS):
+        yield items[offset : offset + _MAX_PARAMETERS]
+
+
+class StudentContextStore:
+    """Materialized ``get_student_context`` documents in a local SQLite file.
+
+    Documents are stored as compressed JSON keyed by student id, with an
+    index of the courses, books, programs and scholarships each one embeds,
+    so a change to those nodes maps back to the students it affects. Fill
+    it with ``core_queries.materialize_student_contexts`` after a load and
+    keep it current with ``refresh_student_contexts``.
+
+    Once ``graph_builder`` reports a write the store is stale and
+    :meth:`get` misses until the next materialization, so readers fall back
+    to the live query rather than see pre-load documents. Loads made by
+    other processes are not seen; materialize again after them.
+    """
+
+    def __init__(self, path: Optional[Path] = None, *, invalidate_on_write: bool = True) -> None:
+        self.path = path or default_store_path()
+        if str(self.path) != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._stale = False
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+        if invalidate_on_write:
+            graph_builder.add_write_listener(self.mark_stale)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT count(*) FROM contexts").fetchone()[0]
+
+    @property
+    def stale(self) -> bool:
+        return self._stale
+
+    @property
+    def generation(self) -> int:
+        """Graph writes seen so far; compare before and after a rebuild with :meth:`mark_fresh`."""
+        return self._writes
+
+    def mark_stale(self) -> None:
+        self._writes += 1
+        self._stale = True
+
+    def mark_fresh(self, generation: int) -> None:
+        """Serve reads again, unless the graph was written after ``generation`` was read."""
+        if generation == self._writes:
+            self._stale = False
+
+    def get(self, student_id: str) -> Optional[dict[str, Any]]:
+        """The stored document, or ``None`` when it is missing or the store is stale."""
+        if self._stale:
+            return None
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT document FROM contexts WHERE student_id = ?", (student_id,)
+            ).fetchone()
+        return _decode(row[0]) if row is not None else None
+
+    def get_many(self, student_ids: Iterable[str]) -> dict[str, dict[str, Any]]:
+        """Stored documents of ``student_ids``; missing ids are left out."""
+        if self._stale:
+            return {}
+        documents: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for chunk in _chunks(list(dict.fromkeys(student_ids))):
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT student_id, document FROM contexts WHERE student_id IN ({placeholders})", chunk
+                )
+                documents.update((student_id, _decode(blob)) for student_id, blob in rows)
+        return documents
+
+    def put_many(self, documents: Mapping[str, Mapping[str, Any]]) -> None:
+        """Store documents in one transaction; an empty document deletes the student's entry."""
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            self._delete(list(documents))
+            present = {student_id: document for student_id, document in documents.items() if document}
+            self._connection.executemany(
+                "INSERT INTO contexts (student_id, document) VALUES (?, ?)",
+                ((student_id, _encode(document)) for student_id, document in present.items()),
+            )
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO refs (label, key, student_id) VALUES (?, ?, ?)",
+                (ref for student_id, document in present.items() for ref in _refs(student_id, document)),
+            )
+
+    def delete_many(self, student_ids: Iterable[str]) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            self._delete(list(student_ids))
+
+    def _delete(self, student_ids: list[str]) -> None:
+        for chunk in _chunks(student_ids):
+            placeholders = ",".join("?" * len(chunk))
+            self._connection.execute(f"DELETE FROM contexts WHERE student_id IN ({placeholders})", chunk)
+            self._connection.execute(f"DELETE FROM refs WHERE student_id IN ({placeholders})", chunk)
+
+    def student_ids(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT student_id FROM contexts")]
+
+    def students_referencing(self, label: str, keys: Iterable[str]) -> set[str]:
+        """Students whose stored document embeds a ``label`` node with one of ``keys``."""
+        students: set[str] = set()
+        with self._lock:
+            for chunk in _chunks(list(keys)):
+                rows = self._connection.execute(
+                    f"SELECT student_id FROM refs WHERE label = ? AND key IN ({','.join('?' * len(chunk))})",
+                    [label, *chunk],
+                )
+                students.update(row[0] for row in rows)
+        return students
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.execute("DELETE FROM contexts")
+            self._connection.execute("DELETE FROM refs")
+
+    def close(self) -> None:
+        graph_builder.remove_write_listener(self.mark_stale)
+        with self._lock:
+            self._connection.close()
+
+
+__all__ = ["CONTEXT_SECTIONS", "MaterializeReport", "StudentContextStore", "default_store_path"]
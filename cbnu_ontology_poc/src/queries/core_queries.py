@@ -1,8 +1,20 @@
 from __future__ import annotations
 
-from typing import Any, Iterable, Mapping
+import logging
+import time
+from typing import Any, Callable, Iterable, Mapping, Optional
 
-from src.graph.neo4j_client import Neo4jClient
+from src.graph.neo4j_client import AsyncNeo4jClient, Neo4jClient
+from src.ontology_schema import NodeLabel
+
+from .cache import QueryCache
+from .context_store import CONTEXT_SECTIONS, MaterializeReport, StudentContextStore
+
+DEFAULT_MATERIALIZE_BATCH_SIZE = 1_000
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
 
 
 def _serialize_node(node: Any) -> dict[str, Any] | None:
@@ -29,21 +41,56 @@ def _serialize_collection(nodes: Iterable[Any] | None) -> list[dict[str, Any]]:
     return result
 
 
-def get_student_context(client: Neo4jClient, student_id: str) -> dict[str, Any]:
-    query = """
-    MATCH (s:Student {student_id: $student_id})
+# Each branch is collected in its own WITH stage, so the rows in flight stay
+# proportional to the largest branch instead of courses x books x programs x
+# scholarships. ``keys`` are the variables every stage carries forward: the
+# student or course node, plus the requested id in the multi-key variants.
+
+
+def _student_context_query(head: str, keys: str) -> str:
+    return f"""
+    {head}
     OPTIONAL MATCH (s)-[:ENROLLED_IN]->(c:Course)
+    WITH {keys}, collect(DISTINCT c) AS courses
+    OPTIONAL MATCH (s)-[:ENROLLED_IN]->(:Course)-[:USES_BOOK]->(b:Book)
+    WITH {keys}, courses, collect(DISTINCT b) AS books
+    OPTIONAL MATCH (s)-[:ENROLLED_IN]->(:Course)-[:RELATED_PROGRAM]->(p:Program)
+    WITH {keys}, courses, books, collect(DISTINCT p) AS programs
+    OPTIONAL MATCH (s)-[:ENROLLED_IN]->(:Course)<-[:REQUIRES_COURSE]-(sc:Scholarship)
+    RETURN {keys}, courses, books, programs, collect(DISTINCT sc) AS scholarships
+    """
+
+
+def _course_resources_query(head: str, keys: str) -> str:
+    return f"""
+    {head}
     OPTIONAL MATCH (c)-[:USES_BOOK]->(b:Book)
+    WITH {keys}, collect(DISTINCT b) AS books
     OPTIONAL MATCH (c)-[:RELATED_PROGRAM]->(p:Program)
+    WITH {keys}, books, collect(DISTINCT p) AS programs
     OPTIONAL MATCH (sc:Scholarship)-[:REQUIRES_COURSE]->(c)
-    RETURN s,
-           collect(DISTINCT c) AS courses,
-           collect(DISTINCT b) AS books,
-           collect(DISTINCT p) AS programs,
-           collect(DISTINCT sc) AS scholarships
+    RETURN {keys}, books, programs, collect(DISTINCT sc) AS scholarships
     """
-    result = client.run(query, {"student_id": student_id})
-    record: Mapping[str, Any] | None = result.single()
+
+
+STUDENT_CONTEXT_QUERY = _student_context_query(
+    "MATCH (s:Student {student_id: $student_id})", "s"
+)
+STUDENT_CONTEXTS_QUERY = _student_context_query(
+    "UNWIND $student_ids AS student_id\n    MATCH (s:Student {student_id: student_id})",
+    "student_id, s",
+)
+ALL_STUDENT_IDS_QUERY = "MATCH (s:Student) RETURN s.student_id AS student_id"
+COURSE_RESOURCES_QUERY = _course_resources_query(
+    "MATCH (c:Course {course_id: $course_id})", "c"
+)
+COURSE_RESOURCES_MANY_QUERY = _course_resources_query(
+    "UNWIND $course_ids AS course_id\n    MATCH (c:Course {course_id: course_id})",
+    "course_id, c",
+)
+
+
+def _student_context(record: Mapping[str, Any] | None) -> dict[str, Any]:
     if not record:
         return {}
 
@@ -60,19 +107,7 @@ def get_student_context(client: Neo4jClient, student_id: str) -> dict[str, Any]:
     }
 
 
-def get_course_resources(client: Neo4jClient, course_id: str) -> dict[str, Any]:
-    query = """
-    MATCH (c:Course {course_id: $course_id})
-    OPTIONAL MATCH (c)-[:USES_BOOK]->(b:Book)
-    OPTIONAL MATCH (c)-[:RELATED_PROGRAM]->(p:Program)
-    OPTIONAL MATCH (sc:Scholarship)-[:REQUIRES_COURSE]->(c)
-    RETURN c,
-           collect(DISTINCT b) AS books,
-           collect(DISTINCT p) AS programs,
-           collect(DISTINCT sc) AS scholarships
-    """
-    result = client.run(query, {"course_id": course_id})
-    record: Mapping[str, Any] | None = result.single()
+def _course_resources(record: Mapping[str, Any] | None) -> dict[str, Any]:
     if not record:
         return {}
 
@@ -88,4 +123,269 @@ def get_course_resources(client: Neo4jClient, course_id: str) -> dict[str, Any]:
     }
 
 
-__all__ = ["get_student_context", "get_course_resources"]
+def _fetch_many(
+    client: Neo4jClient,
+    query: str,
+    parameter: str,
+    key: str,
+    ids: Iterable[str],
+    build: Callable[[Mapping[str, Any]], dict[str, Any]],
+) -> dict[str, dict[str, Any]]:
+    unique_ids = list(dict.fromkeys(ids))
+    results: dict[str, dict[str, Any]] = {item: {} for item in unique_ids}
+    if unique_ids:
+        for record in client.run(query, {parameter: unique_ids}):
+            results[record[key]] = build(record)
+    return results
+
+
+def _cached_many(
+    cache: Optional[QueryCache],
+    namespace: str,
+    ids: Iterable[str],
+    fetch: Callable[[list[str]], dict[str, dict[str, Any]]],
+) -> dict[str, dict[str, Any]]:
+    unique_ids = list(dict.fromkeys(ids))
+    if cache is None:
+        return fetch(unique_ids)
+
+    generation = cache.generation
+    results: dict[str, dict[str, Any]] = {}
+    missing: list[str] = []
+    for item in unique_ids:
+        value = cache.get((namespace, item), _MISSING)
+        if value is _MISSING:
+            missing.append(item)
+        else:
+            results[item] = value
+    if missing:
+        for item, value in fetch(missing).items():
+            cache.put((namespace, item), value, generation)
+            results[item] = value
+    return {item: results[item] for item in unique_ids}
+
+
+def get_student_context(
+    client: Neo4jClient,
+    student_id: str,
+    *,
+    cache: Optional[QueryCache] = None,
+    store: Optional[StudentContextStore] = None,
+) -> dict[str, Any]:
+    """A student's courses and the books, programs and scholarships linked to them.
+
+    With ``store`` the materialized document is returned when there is one;
+    otherwise the graph is queried (through ``cache`` when given).
+    """
+    if store is not None:
+        document = store.get(student_id)
+        if document is not None:
+            return document
+    if cache is not None:
+        return cache.get_or_compute(
+            ("student_context", student_id), lambda: _fetch_student_context(client, student_id)
+        )
+    return _fetch_student_context(client, student_id)
+
+
+def _fetch_student_context(client: Neo4jClient, student_id: str) -> dict[str, Any]:
+    result = client.run(STUDENT_CONTEXT_QUERY, {"student_id": student_id})
+    return _student_context(result.single())
+
+
+async def get_student_context_async(
+    client: AsyncNeo4jClient,
+    student_id: str,
+    *,
+    cache: Optional[QueryCache] = None,
+    store: Optional[StudentContextStore] = None,
+) -> dict[str, Any]:
+    """``get_student_context`` on an :class:`AsyncNeo4jClient`; same query, cache keys and result."""
+    if store is not None:
+        document = store.get(student_id)
+        if document is not None:
+            return document
+    if cache is not None:
+        return await cache.get_or_compute_async(
+            ("student_context", student_id), lambda: _fetch_student_context_async(client, student_id)
+        )
+    return await _fetch_student_context_async(client, student_id)
+
+
+async def _fetch_student_context_async(client: AsyncNeo4jClient, student_id: str) -> dict[str, Any]:
+    result = await client.run(STUDENT_CONTEXT_QUERY, {"student_id": student_id})
+    return _student_context(result.single())
+
+
+def get_student_contexts(
+    client: Neo4jClient,
+    student_ids: Iterable[str],
+    *,
+    cache: Optional[QueryCache] = None,
+    store: Optional[StudentContextStore] = None,
+) -> dict[str, dict[str, Any]]:
+    """Return ``get_student_context`` for every id in one round trip.
+
+    The result is keyed by id in request order; unknown ids map to ``{}``.
+    Ids without a document in ``store`` are queried.
+    """
+    unique_ids = list(dict.fromkeys(student_ids))
+    stored = store.get_many(unique_ids) if store is not None else {}
+    fetched = _cached_many(
+        cache,
+        "student_context",
+        [student_id for student_id in unique_ids if student_id not in stored],
+        lambda ids: _fetch_many(
+            client, STUDENT_CONTEXTS_QUERY, "student_ids", "student_id", ids, _student_context
+        ),
+    )
+    return {student_id: stored.get(student_id, fetched.get(student_id)) for student_id in unique_ids}
+
+
+def materialize_student_contexts(
+    client: Neo4jClient,
+    store: StudentContextStore,
+    student_ids: Optional[Iterable[str]] = None,
+    *,
+    batch_size: int = DEFAULT_MATERIALIZE_BATCH_SIZE,
+) -> MaterializeReport:
+    """Store the current ``get_student_context`` documents of ``student_ids``.
+
+    Without ``student_ids`` every student in the graph is materialized and
+    entries of students no longer in it are removed; run it after
+    ``load_relationships``. Given ids that are not in the graph lose their
+    entry. Documents are fetched ``batch_size`` students per round trip.
+    The store serves reads again once it is done, unless the graph was
+    written meanwhile.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    started = time.perf_counter()
+    generation = store.generation
+    full = student_ids is None
+    if full:
+        ids = [str(record["student_id"]) for record in client.run(ALL_STUDENT_IDS_QUERY)]
+    else:
+        ids = list(dict.fromkeys(student_ids))
+
+    batches = 0
+    stored = 0
+    removed = 0
+    for offset in range(0, len(ids), batch_size):
+        documents = _fetch_many(
+            client,
+            STUDENT_CONTEXTS_QUERY,
+            "student_ids",
+            "student_id",
+            ids[offset : offset + batch_size],
+            _student_context,
+        )
+        store.put_many(documents)
+        found = sum(1 for document in documents.values() if document)
+        stored += found
+        removed += len(documents) - found
+        batches += 1
+    if full:
+        leftover = set(store.student_ids()).difference(ids)
+        store.delete_many(leftover)
+        removed += len(leftover)
+    store.mark_fresh(generation)
+
+    report = MaterializeReport(
+        students=stored,
+        removed=removed,
+        batches=batches,
+        elapsed=time.perf_counter() - started,
+    )
+    logger.info(
+        "Materialized %d student contexts in %d batches (%.2fs, %d entries removed)",
+        report.students,
+        report.batches,
+        report.elapsed,
+        report.removed,
+    )
+    return report
+
+
+def refresh_student_contexts(
+    client: Neo4jClient,
+    store: StudentContextStore,
+    touched: Mapping[str, Iterable[str]],
+    *,
+    batch_size: int = DEFAULT_MATERIALIZE_BATCH_SIZE,
+) -> MaterializeReport:
+    """Re-materialize only the students affected by changed nodes.
+
+    ``touched`` maps label names to changed node keys, as in
+    ``SyncReport.touched``. Touched students are refreshed along with every
+    student whose stored document embeds a touched course, book, program or
+    scholarship; a relationship change touches both of its endpoints.
+    """
+    students = set(touched.get(NodeLabel.STUDENT.value, ()))
+    for label in CONTEXT_SECTIONS.values():
+        keys = touched.get(label.value)
+        if keys:
+            students.update(store.students_referencing(label.value, keys))
+    return materialize_student_contexts(client, store, sorted(students), batch_size=batch_size)
+
+
+def get_course_resources(
+    client: Neo4jClient, course_id: str, *, cache: Optional[QueryCache] = None
+) -> dict[str, Any]:
+    if cache is not None:
+        return cache.get_or_compute(
+            ("course_resources", course_id), lambda: _fetch_course_resources(client, course_id)
+        )
+    return _fetch_course_resources(client, course_id)
+
+
+def _fetch_course_resources(client: Neo4jClient, course_id: str) -> dict[str, Any]:
+    result = client.run(COURSE_RESOURCES_QUERY, {"course_id": course_id})
+    return _course_resources(result.single())
+
+
+async def get_course_resources_async(
+    client: AsyncNeo4jClient, course_id: str, *, cache: Optional[QueryCache] = None
+) -> dict[str, Any]:
+    """``get_course_resources`` on an :class:`AsyncNeo4jClient`; same query, cache keys and result."""
+    if cache is not None:
+        return await cache.get_or_compute_async(
+            ("course_resources", course_id), lambda: _fetch_course_resources_async(client, course_id)
+        )
+    return await _fetch_course_resources_async(client, course_id)
+
+
+async def _fetch_course_resources_async(client: AsyncNeo4jClient, course_id: str) -> dict[str, Any]:
+    result = await client.run(COURSE_RESOURCES_QUERY, {"course_id": course_id})
+    return _course_resources(result.single())
+
+
+def get_course_resources_many(
+    client: Neo4jClient, course_ids: Iterable[str], *, cache: Optional[QueryCache] = None
+) -> dict[str, dict[str, Any]]:
+    """Return ``get_course_resources`` for every id in one round trip.
+
+    The result is keyed by id in request order; unknown ids map to ``{}``.
+    """
+    return _cached_many(
+        cache,
+        "course_resources",
+        course_ids,
+        lambda ids: _fetch_many(
+            client, COURSE_RESOURCES_MANY_QUERY, "course_ids", "course_id", ids, _course_resources
+        ),
+    )
+
+
+__all__ = [
+    "ALL_STUDENT_IDS_QUERY",
+    "DEFAULT_MATERIALIZE_BATCH_SIZE",
+    "get_student_context",
+    "get_student_context_async",
+    "get_student_contexts",
+    "get_course_resources",
+    "get_course_resources_async",
+    "get_course_resources_many",
+    "materialize_student_contexts",
+    "refresh_student_contexts",
+]
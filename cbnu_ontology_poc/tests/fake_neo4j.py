@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from src.graph.memory_graph import InMemoryGraphClient
+
+
+class FakeNeo4jClient(InMemoryGraphClient):
+    """Neo4jClient test double backed by a private in-memory graph."""
+
+
+__all__ = ["FakeNeo4jClient"]
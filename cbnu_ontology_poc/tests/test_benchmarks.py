@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import math
+
+from benchmarks import student_context, suite
+from benchmarks.synthetic import DatasetShape
+from src import config
+from src.graph import InMemoryGraphClient
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert suite.percentile(values, 0.5) == 50.0
+    assert suite.percentile(values, 0.95) == 95.0
+    assert suite.percentile([], 0.5) == 0.0
+
+
+def test_run_suite_reports_every_phase(capsys):
+    payload = suite.run_suite(InMemoryGraphClient, [0.02], query_sample=5)
+    (result,) = payload["results"]
+    assert set(result["phases"]) == {"csv_load", "node_load", "relationship_load"}
+    assert result["phases"]["node_load"]["rows"] == sum(
+        count for name, count in result["rows"].items() if name != "relations.csv"
+    )
+    assert result["queries"]["get_student_context"]["calls"] == 5
+    comparison = suite.compare(payload, payload)
+    assert comparison
+    assert all(ratio == 1.0 for _scale, _metric, old, _new, ratio in comparison if old)
+
+
+def test_peak_rss_is_left_out_where_resource_is_unavailable(monkeypatch):
+    monkeypatch.setattr(suite, "resource", None)
+    payload = suite.run_suite(InMemoryGraphClient, [0.02], query_sample=2)
+    assert math.isnan(payload["results"][0]["peak_rss_mb"])
+    assert all(metric != "peak_rss_mb" for _scale, metric, *_ in suite.compare(payload, payload))
+
+
+def test_load_synthetic_graph_restores_the_data_dir(tmp_path):
+    previous = config.DATA_DIR
+    student_ids = student_context.load_synthetic_graph(
+        InMemoryGraphClient(), tmp_path, DatasetShape(students=3, enrollments_per_student=2), seed=1
+    )
+    assert len(student_ids) == 3
+    assert config.DATA_DIR == previous
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from src.graph import graph_builder, incremental
+from src.ontology_schema import NodeLabel, RelType
+from src.queries import core_queries
+from src.queries.context_store import StudentContextStore
+
+from .fake_neo4j import FakeNeo4jClient
+
+
+class _CountingClient:
+    def __init__(self, client):
+        self._client = client
+        self.statements = 0
+
+    def run(self, query, parameters=None):
+        self.statements += 1
+        return self._client.run(query, parameters)
+
+
+def test_materialized_contexts_serve_reads_until_the_graph_changes(sample_graph_data, tmp_path):
+    client = FakeNeo4jClient()
+    graph_builder.load_nodes(client)
+    graph_builder.load_relationships(client)
+    store = StudentContextStore(tmp_path / "contexts.sqlite3")
+
+    report = core_queries.materialize_student_contexts(client, store, batch_size=1)
+    assert (report.students, report.batches, len(store)) == (2, 2, 2)
+    live = {
+        student_id: core_queries.get_student_context(client, student_id) for student_id in ("20240001", "20240002")
+    }
+    assert store.get_many(live) == live
+    assert [book["book_id"] for book in live["20240001"]["books"]] == ["B001"]
+
+    counting = _CountingClient(client)
+    assert core_queries.get_student_context(counting, "20240001", store=store) == live["20240001"]
+    assert core_queries.get_student_context(counting, "99999999", store=store) == {}
+    contexts = core_queries.get_student_contexts(counting, ["20240002", "99999999", "20240001"], store=store)
+    assert contexts == {**live, "99999999": {}} and list(contexts) == ["20240002", "99999999", "20240001"]
+    assert counting.statements == 2  # only the unknown id went to the graph
+
+    graph_builder.load_relationships(client)  # any write makes the store miss until rebuilt
+    assert store.stale
+    assert core_queries.get_student_context(counting, "20240001", store=store) == live["20240001"]
+    assert counting.statements == 3
+
+    client.run("MATCH (s:Student {student_id: '20240002'}) DETACH DELETE s")
+    report = core_queries.materialize_student_contexts(client, store)
+    assert (report.students, report.removed, store.stale) == (1, 1, False)
+    assert store.get("20240002") is None
+    store.close()
+
+
+def test_refresh_rebuilds_only_students_touched_by_a_sync(sample_graph_data, tmp_path):
+    data_dir = sample_graph_data["data_dir"]
+    client = FakeNeo4jClient()
+    incremental.sync_graph(client)
+    store = StudentContextStore(tmp_path / "contexts.sqlite3")
+    core_queries.materialize_student_contexts(client, store)
+
+    books = pd.read_csv(data_dir / "books.csv")
+    books.loc[books["book_id"] == "B001", "title"] = "Graph Databases, 2nd ed."
+    books.to_csv(data_dir / "books.csv", index=False)
+    students = pd.read_csv(data_dir / "students.csv", dtype={"student_id": str})
+    new_student = {"student_id": "20240003", "name": "Chan", "dept_id": "CSE", "year": 1, "status": "active"}
+    students = pd.concat([students, pd.DataFrame([new_student])])
+    students.to_csv(data_dir / "students.csv", index=False)
+    relations = pd.read_csv(data_dir / "relations.csv")
+    new_enrollment = {
+        "from_label": NodeLabel.STUDENT.value,
+        "from_id": "20240003",
+        "rel_type": RelType.ENROLLED_IN.value,
+        "to_label": NodeLabel.COURSE.value,
+        "to_id": "CSE101",
+    }
+    pd.concat([relations, pd.DataFrame([new_enrollment])]).to_csv(data_dir / "relations.csv", index=False)
+
+    sync = incremental.sync_graph(client)
+    assert sync.touched == {
+        "Student": frozenset({"20240003"}),
+        "Book": frozenset({"B001"}),
+        "Course": frozenset({"CSE101"}),
+    }
+    assert store.stale
+
+    report = core_queries.refresh_student_contexts(client, store, sync.touched)
+    assert (report.students, report.removed, store.stale) == (2, 0, False)
+    assert store.get("20240001")["books"][0]["title"] == "Graph Databases, 2nd ed."
+    for student_id in ("20240001", "20240002", "20240003"):
+        assert store.get(student_id) == core_queries.get_student_context(client, student_id)
+    store.close()
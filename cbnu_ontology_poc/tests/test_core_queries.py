@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import asyncio
+
+from src import config
 from src.graph import graph_builder
 from src.queries import core_queries
+from src.queries.cache import QueryCache
 
 from .fake_neo4j import FakeNeo4jClient
 
@@ -38,3 +42,66 @@ def test_get_course_resources_basic(sample_graph_data):
     assert str(resources["course"]["course_id"]) == "CSE101"
     assert len(resources.get("books", [])) >= 1
     assert len(resources.get("scholarships", [])) >= 1
+
+
+def test_get_student_contexts_matches_single_lookups(sample_graph_data):
+    client = _prepare_graph(sample_graph_data)
+    ids = ["20240002", "99999999", "20240001", "20240002"]
+    contexts = core_queries.get_student_contexts(client, ids)
+    assert list(contexts) == ["20240002", "99999999", "20240001"]
+    for student_id, context in contexts.items():
+        assert context == core_queries.get_student_context(client, student_id)
+
+
+def test_get_course_resources_many_matches_single_lookups(sample_graph_data):
+    client = _prepare_graph(sample_graph_data)
+    resources = core_queries.get_course_resources_many(client, ["CSE101", "NOPE"])
+    assert resources["NOPE"] == {}
+    assert resources["CSE101"] == core_queries.get_course_resources(client, "CSE101")
+
+
+class _AsyncFakeClient:
+    """Awaitable ``run`` over a fake client, counting statements sent."""
+
+    def __init__(self, client):
+        self._client = client
+        self.statements = 0
+
+    async def run(self, query, parameters=None):
+        self.statements += 1
+        await asyncio.sleep(0)
+        return self._client.run(query, parameters)
+
+
+def test_async_queries_match_sync_lookups(sample_graph_data):
+    client = _prepare_graph(sample_graph_data)
+    async_client = _AsyncFakeClient(client)
+    cache = QueryCache(maxsize=16, ttl=60, invalidate_on_load=False)
+    ids = ["20240001", "20240002", "99999999"] * 3
+
+    async def main():
+        contexts = await asyncio.gather(
+            *(core_queries.get_student_context_async(async_client, student_id) for student_id in ids)
+        )
+        resources = await core_queries.get_course_resources_async(async_client, "CSE101", cache=cache)
+        cached = await core_queries.get_course_resources_async(async_client, "CSE101", cache=cache)
+        return contexts, resources, cached
+
+    contexts, resources, cached = asyncio.run(main())
+    assert contexts == [core_queries.get_student_context(client, student_id) for student_id in ids]
+    assert resources == cached == core_queries.get_course_resources(client, "CSE101")
+    assert async_client.statements == len(ids) + 1
+
+
+def test_staged_student_context_matches_legacy_query(tmp_path, monkeypatch):
+    from benchmarks import student_context
+    from benchmarks.synthetic import DatasetShape, generate_dataset
+
+    generate_dataset(tmp_path, DatasetShape(students=60, courses=12, books=20, programs=6, scholarships=5))
+    monkeypatch.setattr(config, "DATA_DIR", tmp_path)
+    client = FakeNeo4jClient()
+    graph_builder.load_nodes(client)
+    graph_builder.load_relationships(client)
+
+    student_ids = [record["id"] for record in client.run("MATCH (s:Student) RETURN s.student_id AS id")]
+    student_context._check_same_output(client, student_ids + ["missing"])
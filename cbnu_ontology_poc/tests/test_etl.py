@@ -64,3 +64,139 @@ def test_load_csv_missing_file(tmp_path, monkeypatch):
     monkeypatch.setattr(config, "DATA_DIR", tmp_path)
     with pytest.raises(FileNotFoundError):
         loaders.load_csv("not_exist.csv")
+
+def test_iter_students_streams_fixed_size_batches(sample_data_dir):
+    batches = list(loaders.iter_students(batch_size=1))
+    assert [len(batch) for batch in batches] == [1, 1]
+    assert batches[0][0]["student_id"] == "1"
+
+def test_iter_csv_batches_selects_columns(sample_data_dir):
+    batches = list(loaders.iter_courses(batch_size=10, columns=["course_id", "credit"]))
+    assert len(batches) == 1
+    assert set(batches[0][0]) == {"course_id", "credit"}
+
+def test_load_csv_reuses_snapshot_until_source_changes(sample_data_dir):
+    pytest.importorskip("pyarrow")
+    first = loaders.load_departments()
+    snapshots = sorted(path.suffix for path in (sample_data_dir / ".snapshots").iterdir())
+    assert snapshots == [".feather", ".json"]
+    pd.testing.assert_frame_equal(loaders.load_departments(), first)
+
+    pd.DataFrame([{"dept_id": "ME", "name": "Mechanical Engineering"}]).to_csv(
+        sample_data_dir / "departments.csv", index=False
+    )
+    assert loaders.load_departments()["dept_id"].tolist() == ["ME"]
+
+def test_iter_csv_batches_from_snapshot_matches_csv(sample_data_dir, monkeypatch):
+    pytest.importorskip("pyarrow")
+    streamed = list(loaders.iter_students(batch_size=1))
+    cached = list(loaders.iter_students(batch_size=1))
+    monkeypatch.setattr(config, "SNAPSHOT_CACHE", False)
+    assert cached == streamed == list(loaders.iter_students(batch_size=1))
+
+@pytest.mark.parametrize("snapshots", [True, False])
+@pytest.mark.parametrize("whole_file_first", [True, False])
+def test_zero_padded_ids_read_the_same_through_every_path(
+    sample_data_dir, monkeypatch, snapshots, whole_file_first
+):
+    monkeypatch.setattr(config, "SNAPSHOT_CACHE", snapshots)
+    pd.DataFrame(
+        [
+            {"student_id": "00123", "name": "Cara", "dept_id": "007", "year": 1, "status": "active"},
+            {"student_id": "00456", "name": "Dan", "dept_id": "007", "year": 2, "status": "active"},
+        ]
+    ).to_csv(sample_data_dir / "students.csv", index=False)
+
+    def whole_file():
+        return loaders.load_students()["student_id"].tolist()
+
+    def chunked():
+        return [row["student_id"] for batch in loaders.iter_students(batch_size=1) for row in batch]
+
+    readers = [whole_file, chunked] if whole_file_first else [chunked, whole_file]
+    for reader in readers * 2:  # the second round reads the snapshot the first one wrote
+        assert reader() == ["00123", "00456"]
+    assert loaders.load_students()["dept_id"].tolist() == ["007", "007"]
+
+
+def test_snapshots_are_rebuilt_when_the_parse_schema_changes(sample_data_dir, monkeypatch):
+    pytest.importorskip("pyarrow")
+    loaders.load_departments()
+    monkeypatch.setattr(loaders, "_PARSE_VERSION", loaders._PARSE_VERSION + 1)
+    reads = []
+    original = pd.read_csv
+    monkeypatch.setattr(pd, "read_csv", lambda *args, **kwargs: reads.append(args) or original(*args, **kwargs))
+    loaders.load_departments()
+    loaders.load_departments()
+    assert len(reads) == 1
+
+
+def test_validate_datasets_reports_every_problem_with_its_line():
+    frames = {
+        "students": pd.DataFrame(
+            {
+                "student_id": ["1", "2", "2", None],
+                "name": ["A", "B", "C", "D"],
+                "dept_id": ["CS"] * 4,
+                "year": [3, "three", 2, 1],
+                "status": ["active"] * 4,
+            }
+        ),
+        "courses": pd.DataFrame([{"course_id": "CS101", "name": "Intro", "dept_id": "CS", "credit": 3, "type": "core"}]),
+        "books": pd.DataFrame([{"book_id": "B1", "title": "T"}]),
+        "relations": pd.DataFrame(
+            {
+                "from_label": ["Student", "Student", "Student", "Teacher", "Student"],
+                "from_id": ["1", "9", "2", "1", "1"],
+                "rel_type": ["ENROLLED_IN", "ENROLLED_IN", "ENROLLED_IN", "ENROLLED_IN", "LIKES"],
+                "to_label": ["Course", "Course", "Course", "Course", "Course"],
+                "to_id": ["CS101", "CS101", "XX999", "CS101", "CS101"],
+            }
+        ),
+    }
+    report = validators.validate_datasets(frames)
+
+    found = {
+        (row.dataset, row.line, row.check, row.column) for row in report.issues.itertuples(index=False)
+    }
+    assert found == {
+        ("students", 3, "dtype_mismatch", "year"),
+        ("students", 4, "duplicate_key", "student_id"),
+        ("students", 5, "null_key", "student_id"),
+        ("books", 1, "missing_column", "author, available, topic"),
+        ("relations", 3, "dangling_endpoint", "from_id"),
+        ("relations", 4, "dangling_endpoint", "from_id"),
+        ("relations", 4, "dangling_endpoint", "to_id"),
+        ("relations", 5, "unknown_label", "from_label"),
+        ("relations", 6, "unknown_rel_type", "rel_type"),
+    }
+    # Student "2" on line 3 is dropped for its year, so its relation dangles too.
+    assert report.invalid_rows["relations"].tolist() == [1, 2, 3, 4]
+    assert report.dropped("books") == 1
+    assert report.keep_mask("students", 1, 3).tolist() == [False, False, False]
+    batches = list(report.filter_batches("relations", [[{"n": 0}, {"n": 1}], [{"n": 2}, {"n": 3}], [{"n": 4}]]))
+    assert batches == [[{"n": 0}]]
+
+@pytest.mark.parametrize("snapshots", [True, False])
+def test_loaders_type_columns_from_the_ontology_schema(sample_data_dir, monkeypatch, snapshots):
+    monkeypatch.setattr(config, "SNAPSHOT_CACHE", snapshots)
+    pd.DataFrame(
+        [
+            {"student_id": 7, "name": "Cara", "dept_id": "CS", "year": 1, "status": "active"},
+            {"student_id": 8, "name": "Dan", "dept_id": "CS", "year": "first", "status": None},
+        ]
+    ).to_csv(sample_data_dir / "students.csv", index=False)
+
+    for _ in range(2):  # the second read comes from the snapshot when enabled
+        students = loaders.load_students()
+        assert pd.api.types.is_string_dtype(students["student_id"])
+        assert students["student_id"].tolist() == ["7", "8"]
+        assert isinstance(students["dept_id"].dtype, pd.CategoricalDtype)
+        assert str(students["year"].dtype) == "Int64" and students["year"].isna().tolist() == [False, True]
+    assert str(loaders.load_books()["available"].dtype) == "boolean"
+    assert loaders.load_csv("students.csv", typed=False)["year"].tolist() == ["1", "first"]
+
+    (chunk,) = loaders.iter_csv_chunks("students.csv")
+    assert chunk.dtypes.to_dict() == students.dtypes.to_dict()
+    (batch,) = loaders.iter_students()
+    assert batch[1] == {"student_id": "8", "name": "Dan", "dept_id": "CS", "year": None, "status": None}
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+import json
+
+import pandas as pd
+import pytest
+
+from src.etl.validators import validate_data_dir
 from src.graph import graph_builder
+from src.graph.checkpoint import LoadCheckpoint
 from src.ontology_schema import NODE_KEY_MAP, NodeLabel
 
 from .fake_neo4j import FakeNeo4jClient
@@ -35,3 +42,118 @@ def test_load_relationships_creates_edges(sample_graph_data):
     )
     result = client.run(query)
     assert result.single()["count"] == 1
+
+
+def test_load_relationships_batches_by_group(sample_graph_data):
+    client = FakeNeo4jClient()
+    graph_builder.clear_database(client)
+    graph_builder.load_nodes(client)
+    report = graph_builder.load_relationships(client, batch_size=1)
+
+    assert report.rows == len(sample_graph_data["relations"])
+    assert report.batches == len(sample_graph_data["relations"])
+    result = client.run("MATCH ()-[r]->() RETURN count(r) AS count")
+    assert result.single()["count"] == len(sample_graph_data["relations"])
+
+
+def test_parallel_load_nodes_matches_sequential(sample_graph_data):
+    sequential = FakeNeo4jClient()
+    graph_builder.load_nodes(sequential)
+    parallel = FakeNeo4jClient()
+    report = graph_builder.load_nodes(parallel, parallel=True, max_workers=3, chunk_size=1)
+
+    assert report.rows == sum(sample_graph_data["counts"].values())
+    assert report.batches == report.rows
+    for label in sample_graph_data["counts"]:
+        key = NODE_KEY_MAP[label]
+        query = f"MATCH (n:{label.value}) RETURN n.{key} AS key ORDER BY key"
+        assert parallel.run(query).data() == sequential.run(query).data()
+    with pytest.raises(ValueError):
+        graph_builder.load_nodes(FakeNeo4jClient(), parallel=True, max_workers=0)
+
+
+class _FlakyClient(FakeNeo4jClient):
+    def __init__(self, fail_after: int) -> None:
+        super().__init__()
+        self.fail_after = fail_after
+        self.writes = 0
+
+    def execute_write(self, query, parameters=None):
+        self.writes += 1
+        if self.writes > self.fail_after:
+            raise ConnectionError("connection lost")
+        return super().execute_write(query, parameters)
+
+
+def test_checkpointed_load_resumes_where_it_stopped(sample_graph_data, tmp_path):
+    path = tmp_path / "load.checkpoint"
+    client = _FlakyClient(fail_after=4)
+    with LoadCheckpoint(path) as checkpoint, pytest.raises(ConnectionError):
+        graph_builder.load_nodes(client, chunk_size=1, checkpoint=checkpoint)
+
+    client.fail_after = 2**31
+    with LoadCheckpoint(path, resume=True) as checkpoint:
+        nodes = graph_builder.load_nodes(client, chunk_size=1, checkpoint=checkpoint)
+        relationships = graph_builder.load_relationships(client, batch_size=1, checkpoint=checkpoint)
+        with pytest.raises(ValueError):
+            graph_builder.load_nodes(client, chunk_size=2, checkpoint=checkpoint)
+
+    total = sum(sample_graph_data["counts"].values())
+    assert (nodes.skipped, nodes.batches) == (4, total - 4)
+    assert relationships.rows == len(sample_graph_data["relations"])
+
+    with LoadCheckpoint(path, resume=True) as checkpoint:
+        again = graph_builder.load_relationships(client, batch_size=1, checkpoint=checkpoint)
+    assert (again.batches, again.skipped) == (0, len(sample_graph_data["relations"]))
+    for label, expected_count in sample_graph_data["counts"].items():
+        result = client.run(f"MATCH (n:{label.value}) RETURN count(n) AS count")
+        assert result.single()["count"] == expected_count
+
+
+def test_load_listeners_receive_stage_reports(sample_graph_data, tmp_path):
+    stages = []
+    graph_builder.add_load_listener(stages.append)
+    try:
+        client = FakeNeo4jClient()
+        graph_builder.load_nodes(client)
+        graph_builder.load_relationships(client)
+    finally:
+        graph_builder.remove_load_listener(stages.append)
+
+    nodes, relationships = stages
+    assert (nodes.stage, relationships.stage) == ("nodes", "relationships")
+    assert nodes.counters["nodes_created"] == nodes.rows == sum(sample_graph_data["counts"].values())
+    assert relationships.counters["relationships_created"] == len(sample_graph_data["relations"])
+
+    path = tmp_path / "load.json"
+    graph_builder.write_load_report(stages, path)
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    assert [stage["stage"] for stage in payload["stages"]] == ["nodes", "relationships"]
+    assert payload["totals"]["rows"] == nodes.rows + relationships.rows
+
+
+def test_validated_load_never_sends_rejected_rows(sample_graph_data):
+    data_dir = sample_graph_data["data_dir"]
+    students = pd.read_csv(data_dir / "students.csv", dtype={"student_id": str})
+    students.loc[len(students)] = ["20240001", "Alice again", "CSE", 1, "active"]
+    students.to_csv(data_dir / "students.csv", index=False)
+    relations = pd.read_csv(data_dir / "relations.csv", dtype=str)
+    relations.loc[len(relations)] = ["Student", "20249999", "ENROLLED_IN", "Course", "CSE101"]
+    relations.loc[len(relations)] = ["Student", "20240002", "TEACHES", "Course", "CSE101"]
+    relations.to_csv(data_dir / "relations.csv", index=False)
+
+    validation = validate_data_dir()
+    assert validation.counts() == {
+        ("relations", "dangling_endpoint"): 1,
+        ("relations", "unknown_rel_type"): 1,
+        ("students", "duplicate_key"): 1,
+    }
+    client = FakeNeo4jClient()
+    nodes = graph_builder.load_nodes(client, chunk_size=1, validation=validation)
+    relationships = graph_builder.load_relationships(client, batch_size=2, validation=validation)
+
+    assert (nodes.dropped, relationships.dropped) == (1, 2)
+    assert nodes.rows == sum(sample_graph_data["counts"].values())
+    assert relationships.rows == len(sample_graph_data["relations"])
+    names = client.run("MATCH (s:Student {student_id: '20240001'}) RETURN s.name AS name").data()
+    assert names == [{"name": "Alice"}]
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from src.graph import graph_builder, incremental
+from src.ontology_schema import NodeLabel, RelType
+
+from .fake_neo4j import FakeNeo4jClient
+
+
+def _count(client, query):
+    return client.run(query).single()["count"]
+
+
+def test_sync_graph_first_run_loads_everything(sample_graph_data):
+    client = FakeNeo4jClient()
+    report = incremental.sync_graph(client)
+
+    for label, expected in sample_graph_data["counts"].items():
+        assert _count(client, f"MATCH (n:{label.value}) RETURN count(n) AS count") == expected
+    assert report.datasets["relations"].inserted == len(sample_graph_data["relations"])
+    assert _count(client, "MATCH ()-[r]->() RETURN count(r) AS count") == len(sample_graph_data["relations"])
+    assert incremental.manifest_path().is_file()
+
+
+def test_sync_graph_applies_only_changes(sample_graph_data):
+    data_dir = sample_graph_data["data_dir"]
+    client = FakeNeo4jClient()
+    incremental.sync_graph(client)
+
+    students = pd.read_csv(data_dir / "students.csv", dtype={"student_id": str})
+    students.loc[students["student_id"] == "20240001", "status"] = "graduating"
+    students = students[students["student_id"] != "20240002"]
+    students = pd.concat(
+        [
+            students,
+            pd.DataFrame(
+                [{"student_id": "20240003", "name": "Chan", "dept_id": "CSE", "year": 1, "status": "active"}]
+            ),
+        ]
+    )
+    students.to_csv(data_dir / "students.csv", index=False)
+
+    relations = pd.read_csv(data_dir / "relations.csv")
+    relations = relations[relations["rel_type"] != RelType.USES_BOOK.value]
+    relations = pd.concat(
+        [
+            relations,
+            pd.DataFrame(
+                [
+                    {
+                        "from_label": NodeLabel.STUDENT.value,
+                        "from_id": "20240003",
+                        "rel_type": RelType.ENROLLED_IN.value,
+                        "to_label": NodeLabel.COURSE.value,
+                        "to_id": "CSE101",
+                    }
+                ]
+            ),
+        ]
+    )
+    relations.to_csv(data_dir / "relations.csv", index=False)
+
+    report = incremental.sync_graph(client)
+
+    assert report.datasets["students"] == incremental.DatasetDelta(inserted=1, updated=1, deleted=1)
+    assert report.datasets["courses"].changed == 0
+    assert report.datasets["relations"] == incremental.DatasetDelta(inserted=1, deleted=1)
+    assert _count(client, "MATCH (s:Student {student_id: '20240002'}) RETURN count(s) AS count") == 0
+    assert _count(client, "MATCH (s:Student {status: 'graduating'}) RETURN count(s) AS count") == 1
+    assert _count(client, "MATCH (:Course)-[r:USES_BOOK]->(:Book) RETURN count(r) AS count") == 0
+    assert _count(client, "MATCH (:Student)-[r:ENROLLED_IN]->(:Course) RETURN count(r) AS count") == 2
+
+
+def test_sync_graph_without_changes_is_a_no_op(sample_graph_data):
+    client = FakeNeo4jClient()
+    graph_builder.load_nodes(client)
+    incremental.sync_graph(client)
+    report = incremental.sync_graph(client)
+    assert report.rows_changed == 0
+
+
+def test_sync_graph_counts_a_repeated_key_once(sample_graph_data):
+    data_dir = sample_graph_data["data_dir"]
+    client = FakeNeo4jClient()
+    incremental.sync_graph(client)
+
+    students = pd.read_csv(data_dir / "students.csv", dtype={"student_id": str})
+    new_student = {"student_id": "20240003", "name": "Chan", "dept_id": "CSE", "year": 1, "status": "active"}
+    pd.concat([students, pd.DataFrame([new_student] * 2)]).to_csv(data_dir / "students.csv", index=False)
+    relations = pd.read_csv(data_dir / "relations.csv")
+    enrollment = {
+        "from_label": NodeLabel.STUDENT.value,
+        "from_id": "20240003",
+        "rel_type": RelType.ENROLLED_IN.value,
+        "to_label": NodeLabel.COURSE.value,
+        "to_id": "CSE101",
+    }
+    pd.concat([relations, pd.DataFrame([enrollment] * 2)]).to_csv(data_dir / "relations.csv", index=False)
+
+    report = incremental.sync_graph(client, batch_size=1)
+
+    assert report.datasets["students"] == incremental.DatasetDelta(inserted=1)
+    assert report.datasets["relations"] == incremental.DatasetDelta(inserted=1)
+    assert report.touched["Student"] == frozenset({"20240003"})
+    assert _count(client, "MATCH (s:Student {student_id: '20240003'}) RETURN count(s) AS count") == 1
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import pytest
+
+from src.graph.memory_graph import ConstraintError, CypherError, InMemoryGraphClient
+
+
+@pytest.fixture()
+def client():
+    client = InMemoryGraphClient()
+    client.run(
+        "UNWIND $rows AS row MERGE (s:Student {student_id: row.id}) SET s += row.props",
+        {
+            "rows": [
+                {"id": "S1", "props": {"name": "Alice", "year": 3}},
+                {"id": "S2", "props": {"name": "Bob", "year": 2}},
+            ]
+        },
+    )
+    client.run("UNWIND ['C1', 'C2'] AS id MERGE (:Course {course_id: id})")
+    client.run(
+        "UNWIND $rows AS row "
+        "MATCH (s:Student {student_id: row.s}) MATCH (c:Course {course_id: row.c}) "
+        "MERGE (s)-[:ENROLLED_IN]->(c)",
+        {"rows": [{"s": "S1", "c": "C1"}, {"s": "S1", "c": "C2"}, {"s": "S2", "c": "C1"}]},
+    )
+    return client
+
+
+def test_merge_is_idempotent(client):
+    summary = client.run(
+        "MATCH (s:Student {student_id: 'S1'}) MATCH (c:Course {course_id: 'C1'}) "
+        "MERGE (s)-[:ENROLLED_IN]->(c)"
+    ).consume()
+    assert summary.counters.relationships_created == 0
+    assert client.graph.node_count == 4
+    assert client.graph.relationship_count == 3
+
+
+def test_optional_match_and_aggregation(client):
+    client.run("CREATE (:Student {student_id: 'S3', name: 'Chan'})")
+    records = client.run(
+        "MATCH (s:Student) OPTIONAL MATCH (s)-[:ENROLLED_IN]->(c:Course) "
+        "RETURN s.student_id AS id, count(c) AS courses, collect(DISTINCT c.course_id) AS ids "
+        "ORDER BY id"
+    ).data()
+    assert [(r["id"], r["courses"], sorted(r["ids"])) for r in records] == [
+        ("S1", 2, ["C1", "C2"]),
+        ("S2", 1, ["C1"]),
+        ("S3", 0, []),
+    ]
+
+
+def test_incoming_pattern_and_where(client):
+    records = client.run(
+        "MATCH (c:Course)<-[:ENROLLED_IN]-(s:Student) WHERE s.year >= 3 RETURN c.course_id AS id ORDER BY id"
+    )
+    assert [r["id"] for r in records] == ["C1", "C2"]
+
+
+def test_unique_constraint_rejects_duplicates(client):
+    client.run("CREATE CONSTRAINT student_id IF NOT EXISTS FOR (s:Student) REQUIRE s.student_id IS UNIQUE")
+    with pytest.raises(ConstraintError):
+        client.run("UNWIND ['S9', 'S1'] AS id CREATE (:Student {student_id: id})")
+    # The failed statement is rolled back as a whole.
+    assert client.run("MATCH (s:Student {student_id: 'S9'}) RETURN count(s) AS n").single()["n"] == 0
+
+
+def test_transaction_rolls_back_on_error(client):
+    with pytest.raises(RuntimeError):
+        with client.transaction() as tx:
+            tx.run("MATCH (s:Student {student_id: 'S2'}) DETACH DELETE s")
+            raise RuntimeError("boom")
+    assert client.graph.node_count == 4
+    assert client.graph.relationship_count == 3
+
+
+def test_detach_delete_removes_relationships(client):
+    with pytest.raises(CypherError):
+        client.run("MATCH (c:Course {course_id: 'C1'}) DELETE c")
+    summary = client.run("MATCH (c:Course {course_id: 'C1'}) DETACH DELETE c").consume()
+    assert summary.counters.nodes_deleted == 1
+    assert summary.counters.relationships_deleted == 2
+    assert client.graph.relationship_count == 1
+
+
+def test_profile_reports_rows_per_clause(client):
+    profile = client.run(
+        "PROFILE MATCH (s:Student) OPTIONAL MATCH (s)-[:ENROLLED_IN]->(c) RETURN s, collect(c) AS cs"
+    ).consume().profile
+    rows = []
+    while profile:
+        rows.append(profile["rows"])
+        profile = profile["children"][0] if profile["children"] else None
+    assert rows == [2, 2, 3, 2]
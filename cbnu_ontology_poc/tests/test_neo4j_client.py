@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.graph import neo4j_client
+from src.graph.profiling import QueryProfiler
+
+
+class _StubResult:
+    def __init__(self, query, parameters):
+        self._records = [{"query": query, "parameters": parameters}]
+
+    def keys(self):
+        return ["query", "parameters"]
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def consume(self):
+        return "summary"
+
+
+class _StubTransaction:
+    def __init__(self, log):
+        self._log = log
+
+    def run(self, query, parameters=None):
+        self._log.append(("tx.run", query))
+        return _StubResult(query, parameters)
+
+    def commit(self):
+        self._log.append(("commit",))
+
+    def rollback(self):
+        self._log.append(("rollback",))
+
+    def close(self):
+        self._log.append(("tx.close",))
+
+
+class _StubSession:
+    def __init__(self, log):
+        self._log = log
+
+    def __enter__(self):
+        self._log.append(("session.open",))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._log.append(("session.close",))
+
+    def run(self, query, parameters=None):
+        self._log.append(("session.run", query))
+        return _StubResult(query, parameters)
+
+    def begin_transaction(self):
+        return _StubTransaction(self._log)
+
+    def execute_write(self, work):
+        self._log.append(("execute_write",))
+        return work(_StubTransaction(self._log))
+
+
+class _StubDriver:
+    def __init__(self):
+        self.log = []
+
+    def session(self, **kwargs):
+        return _StubSession(self.log)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture()
+def stub_client(monkeypatch):
+    driver = _StubDriver()
+
+    class _StubGraphDatabase:
+        @staticmethod
+        def driver(uri, auth):
+            return driver
+
+    monkeypatch.setattr(neo4j_client, "GraphDatabase", _StubGraphDatabase)
+    client = neo4j_client.Neo4jClient("bolt://stub", "user", "secret")
+    return client, driver.log
+
+
+def test_run_materializes_records(stub_client):
+    client, log = stub_client
+    result = client.run("RETURN 1", {"x": 1})
+    assert log == [("session.open",), ("session.run", "RETURN 1"), ("session.close",)]
+    assert result.single()["parameters"] == {"x": 1}
+    assert result.keys == ("query", "parameters")
+    assert result.consume() == "summary"
+
+
+def test_session_is_reused_across_statements(stub_client):
+    client, log = stub_client
+    with client.session():
+        client.run("RETURN 1")
+        client.run("RETURN 2")
+    assert log.count(("session.open",)) == 1
+
+
+def test_transaction_rolls_back_on_error(stub_client):
+    client, log = stub_client
+    with pytest.raises(RuntimeError):
+        with client.transaction() as tx:
+            tx.run("CREATE (n)")
+            raise RuntimeError("boom")
+    assert ("rollback",) in log
+    assert ("commit",) not in log
+
+
+def test_run_many_uses_single_transaction(stub_client):
+    client, log = stub_client
+    results = client.run_many(["RETURN 1", ("RETURN $x", {"x": 2})])
+    assert [r.single()["parameters"] for r in results] == [{}, {"x": 2}]
+    assert log.count(("session.open",)) == 1
+    assert log.count(("commit",)) == 1
+
+
+def test_execute_write_uses_a_managed_transaction(stub_client):
+    client, log = stub_client
+    result = client.execute_write("CREATE (n)", {"x": 1})
+    assert log == [("session.open",), ("execute_write",), ("tx.run", "CREATE (n)"), ("session.close",)]
+    assert result.single()["parameters"] == {"x": 1}
+
+    log.clear()
+    with client.transaction():
+        client.execute_write("CREATE (m)")
+    assert ("execute_write",) not in log
+    assert ("tx.run", "CREATE (m)") in log
+
+
+def test_profiler_wraps_client_statements(stub_client):
+    client, log = stub_client
+    client.profiler = QueryProfiler(sample_rate=1.0, slow_threshold=60.0)
+    client.run("MATCH (n) RETURN n")
+    client.run("SHOW CONSTRAINTS")
+    assert ("session.run", "PROFILE MATCH (n) RETURN n") in log
+    assert ("session.run", "SHOW CONSTRAINTS") in log
+    assert [profile.profiled for profile in client.profiler.profiles] == [True, False]
+
+
+class _StubAsyncResult(_StubResult):
+    def __aiter__(self):
+        return self._aiter()
+
+    async def _aiter(self):
+        for record in self._records:
+            yield record
+
+    async def consume(self):
+        return "summary"
+
+
+class _StubAsyncSession:
+    def __init__(self, driver):
+        self._driver = driver
+
+    async def __aenter__(self):
+        self._driver.log.append(("session.open",))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._driver.log.append(("session.close",))
+
+    async def run(self, query, parameters=None):
+        self._driver.in_flight += 1
+        self._driver.peak = max(self._driver.peak, self._driver.in_flight)
+        await asyncio.sleep(0.001)
+        self._driver.in_flight -= 1
+        self._driver.log.append(("session.run", query))
+        return _StubAsyncResult(query, parameters)
+
+    async def execute_write(self, work):
+        self._driver.log.append(("execute_write",))
+        return await work(self)
+
+
+class _StubAsyncDriver:
+    def __init__(self):
+        self.log = []
+        self.config = {}
+        self.in_flight = 0
+        self.peak = 0
+        self.closed = False
+
+    def session(self, **kwargs):
+        return _StubAsyncSession(self)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture()
+def stub_async_driver(monkeypatch):
+    driver = _StubAsyncDriver()
+
+    class _StubAsyncGraphDatabase:
+        @staticmethod
+        def driver(uri, auth, **config):
+            driver.config = config
+            return driver
+
+    monkeypatch.setattr(neo4j_client, "AsyncGraphDatabase", _StubAsyncGraphDatabase)
+    return driver
+
+
+def test_async_client_bounds_statements_in_flight(stub_async_driver):
+    async def main():
+        async with neo4j_client.AsyncNeo4jClient("bolt://stub", "user", "secret", max_concurrency=3) as client:
+            results = await asyncio.gather(*(client.run("RETURN $x", {"x": i}) for i in range(20)))
+            write = await client.execute_write("CREATE (n)", {"x": 1})
+        return results, write
+
+    results, write = asyncio.run(main())
+    assert [result.single()["parameters"] for result in results] == [{"x": i} for i in range(20)]
+    assert results[0].keys == ("query", "parameters") and results[0].consume() == "summary"
+    assert write.single()["query"] == "CREATE (n)" and ("execute_write",) in stub_async_driver.log
+    assert stub_async_driver.peak == 3
+    assert stub_async_driver.config["max_connection_pool_size"] == 3
+    assert stub_async_driver.log.count(("session.open",)) == 21
+    assert stub_async_driver.closed
+
+
+def test_async_client_profiles_statements(stub_async_driver):
+    client = neo4j_client.AsyncNeo4jClient(
+        "bolt://stub", "user", "secret", profiler=QueryProfiler(sample_rate=1.0, slow_threshold=60.0)
+    )
+    asyncio.run(client.run("MATCH (n) RETURN n"))
+    assert ("session.run", "PROFILE MATCH (n) RETURN n") in stub_async_driver.log
+    assert [profile.rows for profile in client.profiler.profiles] == [1]
@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import subprocess
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from neo4j.exceptions import Neo4jError
+
+import neo4j_loader
+from src.graph.checkpoint import LoadCheckpoint
+from neo4j_loader import (
+    NODE_FAMILIES,
+    RELATIONSHIP_DEPENDENCIES,
+    RELATIONSHIP_ENDPOINTS,
+    RELATIONSHIP_QUERIES,
+    AdaptiveBatchSizer,
+    SampleSizes,
+    StepScheduler,
+    export_bulk_import,
+    generate_sample_data,
+    load_sample_data,
+    mix_and_batch_rounds,
+    replay_query,
+    run_batch,
+    run_with_retry,
+)
+from tests.fake_neo4j import FakeNeo4jClient
+
+
+class _Session:
+    def __init__(self, driver: "_Driver") -> None:
+        self._driver = driver
+
+    def run(self, query, parameters=None, **kwargs):
+        self._driver.count_run()
+        return self._driver.client.run(query, {**(parameters or {}), **kwargs})
+
+
+class _Driver:
+    """Just enough of ``neo4j.Driver`` for ``load_sample_data``.
+
+    With ``fail_after`` set, every statement after that many fails.
+    """
+
+    def __init__(self) -> None:
+        self.client = FakeNeo4jClient()
+        self.fail_after: int | None = None
+        self.runs = 0
+        self._lock = threading.Lock()
+
+    def count_run(self) -> None:
+        with self._lock:
+            self.runs += 1
+            if self.fail_after is not None and self.runs > self.fail_after:
+                raise Neo4jError.hydrate(message="gone", code="Neo.ClientError.General.DatabaseUnavailable")
+
+    @contextmanager
+    def session(self, **_kwargs):
+        with self.client.session():
+            yield _Session(self)
+
+
+def _rows_by_family(sizes: SampleSizes, batch_size: int, vectorized: bool = False) -> dict[str, list[dict]]:
+    rows: dict[str, list[dict]] = {}
+    for family, batch in generate_sample_data(sizes, batch_size, vectorized=vectorized):
+        assert 0 < len(batch) <= batch_size
+        rows.setdefault(family, []).extend(batch)
+    return rows
+
+
+def test_scaled_sizes_keep_every_count_positive():
+    sizes = SampleSizes().scaled(0.001)
+    assert sizes.students == 6
+    assert min(vars(sizes).values()) >= 1
+    with pytest.raises(ValueError):
+        SampleSizes().scaled(0)
+
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_generation_is_deterministic_and_independent_of_batch_size(vectorized):
+    sizes = SampleSizes().scaled(0.05)
+    first = _rows_by_family(sizes, batch_size=7, vectorized=vectorized)
+    second = _rows_by_family(sizes, batch_size=1000, vectorized=vectorized)
+    assert first.keys() == second.keys()
+    for family in first:
+        key = lambda row: sorted(map(str, row.items()))  # noqa: E731
+        assert sorted(first[family], key=key) == sorted(second[family], key=key)
+    assert len(first["students"]) == sizes.students
+    assert len(first["courses"]) == sizes.courses
+    courses_per_student: dict[str, set] = {}
+    for row in first["student_course"]:
+        courses_per_student.setdefault(row["student_id"], set()).add(row["course_id"])
+    assert len(courses_per_student) == sizes.students
+    # Small departments cap the draw below the usual four to six courses.
+    assert all(1 <= len(courses) <= 6 for courses in courses_per_student.values())
+
+
+@pytest.mark.parametrize(("vectorized", "workers"), [(False, 1), (True, 1), (False, 4)])
+def test_load_sample_data_writes_every_relationship(vectorized, workers):
+    driver = _Driver()
+    report = load_sample_data(driver, scale=0.02, batch_size=50, vectorized=vectorized, workers=workers)
+    client = driver.client
+
+    assert client.run("MATCH (s:Student) RETURN count(s) AS n").single()["n"] == report.count("students")
+    relationships = client.run("MATCH ()-[r]->() RETURN count(r) AS n").single()["n"]
+    # Every row matched both endpoints, i.e. no batch referenced a node that
+    # had not been written yet.
+    assert relationships == sum(report.count(family) for family in RELATIONSHIP_QUERIES)
+    assert report.workers == workers
+    assert report.rows_per_sec > 0
+
+
+def test_load_sample_data_reports_server_counters(tmp_path):
+    progress: dict[str, list] = {}
+    report = load_sample_data(
+        _Driver(),
+        scale=0.02,
+        batch_size=50,
+        workers=2,
+        on_progress=lambda family, family_report: progress.setdefault(family, []).append(family_report),
+    )
+
+    assert progress.keys() == report.families.keys()
+    for family, family_report in report.families.items():
+        assert progress[family][-1].rows == family_report.rows
+        counter = "nodes_created" if family in neo4j_loader.NODE_QUERIES else "relationships_created"
+        assert family_report.counters[counter] == family_report.rows
+    assert report.families["students"].counters["properties_set"] > report.count("students")
+
+    path = tmp_path / "load.json"
+    report.write_json(path)
+    totals = json.loads(path.read_text(encoding="utf-8"))["totals"]
+    assert totals["rows"] == totals["nodes_created"] + totals["relationships_created"] == report.rows
+
+
+def test_sample_schema_compiles_statements_and_the_load_dag():
+    assert len({spec.label for spec in NODE_FAMILIES.values()}) == 11
+    assert RELATIONSHIP_DEPENDENCIES["student_course"] == ("students", "courses")
+    assert RELATIONSHIP_DEPENDENCIES["course_prereq"] == ("courses",)
+    assert "CREATE (a)-[:RECEIVED_SCHOLARSHIP {term: row.year}]->(b)" in RELATIONSHIP_QUERIES["student_scholarship"]
+    assert "departmentId: row.department_id" in neo4j_loader.NODE_QUERIES["major_tracks"]
+    assert replay_query("students").splitlines()[1] == "MERGE (n:Student:AcademicActor {id: row.id})"
+    assert "MERGE (a)-[:ENROLLED_IN]->(b)" in replay_query("student_course")
+
+    # Every generated family has a statement, and no relationship precedes its endpoints.
+    seen: set[str] = set()
+    for family, _rows in generate_sample_data(SampleSizes().scaled(0.05)):
+        assert family in neo4j_loader.FAMILY_QUERIES
+        assert seen.issuperset(RELATIONSHIP_DEPENDENCIES.get(family, ()))
+        seen.add(family)
+    assert seen == neo4j_loader.FAMILY_QUERIES.keys()
+
+
+def test_step_scheduler_runs_independent_steps_while_dependents_wait():
+    scheduler = StepScheduler(2)
+    gate = threading.Event()
+    order: list[str] = []
+    try:
+        blocked = scheduler.submit(lambda: gate.wait(5) and order.append("blocked"))
+        dependent = scheduler.submit(order.append, "dependent", after=[blocked])
+        # Waiting steps hold no thread, so the free one runs this at once.
+        scheduler.submit(order.append, "independent").result(timeout=5)
+        assert order == ["independent"] and not dependent.done()
+        gate.set()
+        dependent.result(timeout=5)
+        assert order == ["independent", "blocked", "dependent"]
+
+        failed = scheduler.submit(int, "not a number")
+        skipped = scheduler.submit(order.append, "skipped", after=[failed])
+        with pytest.raises(ValueError):
+            skipped.result(timeout=5)
+        assert "skipped" not in order
+    finally:
+        scheduler.shutdown()
+
+
+def test_mix_and_batch_rounds_never_share_an_endpoint():
+    rows = [
+        row
+        for family, batch in generate_sample_data(SampleSizes().scaled(0.05))
+        if family == "student_course"
+        for row in batch
+    ]
+    (_, start_key), (_, end_key) = RELATIONSHIP_ENDPOINTS["student_course"]
+    rounds = mix_and_batch_rounds(rows, start_key, end_key, partitions=4)
+
+    assert sum(len(cell) for cells in rounds for cell in cells) == len(rows)
+    for cells in rounds:
+        for key in (start_key, end_key):
+            owners: dict[str, int] = {}
+            for index, cell in enumerate(cells):
+                for row in cell:
+                    assert owners.setdefault(row[key], index) == index
+
+
+def test_run_with_retry_retries_transient_errors(monkeypatch):
+    monkeypatch.setattr(neo4j_loader, "RETRY_BACKOFF", 0)
+    deadlock = Neo4jError.hydrate(message="deadlock", code="Neo.TransientError.Transaction.DeadlockDetected")
+
+    class FlakySession:
+        calls = 0
+
+        def run(self, query, **params):
+            self.calls += 1
+            if self.calls < 3:
+                raise deadlock
+            return FakeNeo4jClient().run("RETURN 1 AS one")
+
+    session = FlakySession()
+    assert run_with_retry(session, "RETURN 1", [{}], max_retries=5) == 2
+    with pytest.raises(Neo4jError):
+        run_with_retry(FlakySession(), "RETURN 1", [{}], max_retries=1)
+
+
+def test_adaptive_batch_sizer_steers_toward_the_target_duration():
+    sizer = AdaptiveBatchSizer(target_seconds=1.0, initial=100, minimum=10, maximum=1000)
+    sizer.record("fast", 100, 0.01)
+    assert sizer.size_for("fast") == 200  # grows at most twofold per batch
+    for _ in range(10):
+        sizer.record("fast", sizer.size_for("fast"), 0.01)
+    assert sizer.size_for("fast") == 1000
+
+    sizer.record("slow", 100, 10.0)
+    assert sizer.size_for("slow") == 50
+    assert sizer.size_for("other") == 100
+    assert sizer.sizes() == {"fast": 1000, "slow": 50, "other": 100}
+
+
+def test_run_batch_shrinks_batches_that_exceed_server_memory():
+    out_of_memory = Neo4jError.hydrate(
+        message="too big", code="Neo.TransientError.General.MemoryPoolOutOfMemoryError"
+    )
+
+    class BoundedSession:
+        def __init__(self) -> None:
+            self.written: list[int] = []
+
+        def run(self, query, rows):
+            if len(rows) > 30:
+                raise out_of_memory
+            self.written.extend(row["n"] for row in rows)
+            return FakeNeo4jClient().run("RETURN 1 AS one")
+
+    session = BoundedSession()
+    sizer = AdaptiveBatchSizer(target_seconds=60.0, initial=200, minimum=10)
+    run_batch(session, "UNWIND $rows AS row", [{"n": n} for n in range(500)], sizer=sizer)
+
+    assert session.written == list(range(500))
+    # A memory error also caps later growth, however fast the batches are.
+    assert sizer.size_for("UNWIND $rows AS row") == 25
+
+
+def _graph_counts(client: FakeNeo4jClient) -> tuple[list, list]:
+    nodes = client.run("MATCH (n) RETURN labels(n) AS labels, count(n) AS n ORDER BY n").data()
+    relationships = client.run("MATCH ()-[r]->() RETURN type(r) AS type, count(r) AS n ORDER BY type").data()
+    return sorted(nodes, key=str), relationships
+
+
+def _relationship_rows(client: FakeNeo4jClient) -> list[tuple]:
+    rows = client.run("MATCH (a)-[r]->(b) RETURN type(r) AS type, a.id AS start, b.id AS end").data()
+    return sorted((row["type"], row["start"], row["end"]) for row in rows)
+
+
+# Runs one step of an interrupted load in its own interpreter, so the first
+# run and the resume see different PYTHONHASHSEEDs, as separate CLI runs do.
+# The in-memory graph is handed between the two steps as a pickle.
+_RESUME_STEP = """
+import json, pickle, sys, threading
+import pytest
+from src.graph.checkpoint import LoadCheckpoint
+from neo4j_loader import load_sample_data
+from tests.test_neo4j_loader import _Driver, _graph_counts, _relationship_rows
+
+step, graph_file, checkpoint_file, fail_after, workers = sys.argv[1:]
+options = dict(scale=0.02, batch_size=50, workers=int(workers))
+driver = _Driver()
+if step == "interrupt":
+    driver.fail_after = int(fail_after)
+    with LoadCheckpoint(checkpoint_file) as checkpoint, pytest.raises(RuntimeError):
+        load_sample_data(driver, **options, checkpoint=checkpoint)
+    driver.client.graph.lock = None
+    with open(graph_file, "wb") as handle:
+        pickle.dump(driver.client.graph, handle)
+else:
+    with open(graph_file, "rb") as handle:
+        driver.client.graph = pickle.load(handle)
+    driver.client.graph.lock = threading.RLock()
+    with LoadCheckpoint(checkpoint_file, resume=True) as checkpoint:
+        report = load_sample_data(driver, **options, checkpoint=checkpoint)
+        with pytest.raises(ValueError):
+            load_sample_data(driver, **options, seed=7, checkpoint=checkpoint)
+    print(json.dumps({
+        "skipped": report.skipped,
+        "counts": _graph_counts(driver.client),
+        "relationships": _relationship_rows(driver.client),
+    }))
+"""
+
+
+def _run_resume_step(step: str, hash_seed: str, *args) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", _RESUME_STEP, step, *map(str, args)],
+        cwd=Path(neo4j_loader.__file__).parent,
+        env={**os.environ, "PYTHONHASHSEED": hash_seed},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+# fail_after=14 stops between two student_course batches of one generated
+# block, where a row order that changed between runs would lose edges.
+@pytest.mark.parametrize(("fail_after", "workers"), [(10, 1), (14, 1), (25, 1), (38, 1), (60, 4), (120, 4)])
+def test_load_sample_data_resumes_from_checkpoint(tmp_path, fail_after, workers):
+    expected = _Driver()
+    load_sample_data(expected, scale=0.02, batch_size=50, workers=workers)
+
+    files = (tmp_path / "graph.pickle", tmp_path / "load.checkpoint", fail_after, workers)
+    _run_resume_step("interrupt", "1", *files)
+    resumed = json.loads(_run_resume_step("resume", "2", *files).splitlines()[-1])
+
+    assert resumed["skipped"] > 0
+    # Batches cut off mid-commit were replayed without duplicating rows, and
+    # the new process regenerated the same rows at every checkpointed offset.
+    assert resumed["counts"] == json.loads(json.dumps(_graph_counts(expected.client)))
+    assert [tuple(row) for row in resumed["relationships"]] == _relationship_rows(expected.client)
+
+
+def _read_import_file(directory, family):
+    with open(directory / f"{family}_header.csv", newline="", encoding="utf-8") as handle:
+        header = next(csv.reader(handle))
+    with open(directory / f"{family}.csv", newline="", encoding="utf-8") as handle:
+        return header, list(csv.reader(handle))
+
+
+def test_export_bulk_import_writes_admin_import_files(tmp_path):
+    counts = export_bulk_import(tmp_path, scale=0.02)
+    options = (tmp_path / "import.args").read_text(encoding="utf-8").split()
+    assert len(options) == len(counts)
+
+    ids: dict[str, set[str]] = {}
+    for option in options:
+        kind, files = option.split("=", 1)
+        family = files.split(",")[1].removesuffix(".csv")
+        header, rows = _read_import_file(tmp_path, family)
+        assert len(rows) == counts[family]
+        if kind == "--nodes":
+            space = header[0][len("id:ID(") : -1]
+            assert header[-1] == ":LABEL"
+            ids.setdefault(space, set()).update(row[0] for row in rows)
+            continue
+        assert header[-1] == ":TYPE"
+        start_space = header[0][len(":START_ID(") : -1]
+        end_space = header[1][len(":END_ID(") : -1]
+        # Node files precede relationship files, so every id space is known.
+        assert all(row[0] in ids[start_space] and row[1] in ids[end_space] for row in rows)
+
+    header, rows = _read_import_file(tmp_path, "students")
+    assert header[:3] == ["id:ID(Student)", "name", "studentNumber:long"]
+    assert "gpa:double" in header
+    assert rows[0][-1] == "Student;AcademicActor"
+    header, _rows = _read_import_file(tmp_path, "student_program")
+    assert header == [":START_ID(Student)", ":END_ID(NonCurricularProgram)", "hours:long", ":TYPE"]
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from src.graph.neo4j_client import QueryResult
+from src.graph.profiling import QueryProfiler, redact_parameters
+from src.queries.core_queries import get_student_context
+
+from .fake_neo4j import FakeNeo4jClient
+
+_PLAN = {
+    "operatorType": "ProduceResults@neo4j",
+    "rows": 4,
+    "dbHits": 0,
+    "children": [
+        {
+            "operatorType": "CartesianProduct@neo4j",
+            "rows": 4,
+            "dbHits": 0,
+            "children": [
+                {"operatorType": "NodeByLabelScan@neo4j", "rows": 2, "dbHits": 3, "children": []},
+                {"operatorType": "NodeByLabelScan@neo4j", "rows": 2, "dbHits": 3, "children": []},
+            ],
+        }
+    ],
+}
+
+
+class _Clock:
+    def __init__(self, step: float) -> None:
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+def test_redact_parameters_keeps_only_names_and_shapes():
+    assert redact_parameters({"student_id": "20240001", "rows": [{}, {}], "gpa": 3.5}) == {
+        "student_id": "<str>",
+        "rows": "<list[2]>",
+        "gpa": "<float>",
+    }
+
+
+def test_slow_profiled_statements_are_logged_with_their_plan(tmp_path):
+    log_path = tmp_path / "slow.jsonl"
+    profiler = QueryProfiler(sample_rate=1.0, slow_threshold=0.5, log_path=log_path, clock=_Clock(1.0))
+    sent = []
+
+    def runner(statement):
+        sent.append(statement)
+        return QueryResult([{}] * 4, summary=SimpleNamespace(profile=_PLAN))
+
+    query = "MATCH (a:Student), (b:Student) WHERE a.student_id = $student_id RETURN a, b"
+    profiler.run(query, {"student_id": "20240001"}, runner)
+
+    assert sent == [f"PROFILE {query}"]
+    (entry,) = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert entry["parameters"] == {"student_id": "<str>"}
+    assert "20240001" not in log_path.read_text(encoding="utf-8")
+    assert (entry["rows"], entry["db_hits"], entry["elapsed_ms"]) == (4, 6, 1000.0)
+    assert entry["warnings"] == ["CartesianProduct", "NodeByLabelScan"]
+
+
+def test_profiler_samples_and_skips_schema_statements():
+    profiler = QueryProfiler(sample_rate=0.25, slow_threshold=60.0, rng=random.Random(7))
+    client = FakeNeo4jClient(profiler=profiler)
+    client.run("CREATE CONSTRAINT student_id IF NOT EXISTS FOR (s:Student) REQUIRE s.student_id IS UNIQUE")
+    client.run("CREATE (:Student {student_id: '1'})")
+    for _ in range(200):
+        assert get_student_context(client, "1")["student"] == {"student_id": "1"}
+
+    schema, *rest = profiler.profiles
+    assert not schema.profiled
+    profiled = [profile for profile in rest if profile.profiled]
+    assert 20 < len(profiled) < 80
+    assert all("OptionalMatch" in profile.operators for profile in profiled if "$student_id" in profile.query)
+    assert profiler.slow_queries() == []
+
+
+def test_profiler_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        QueryProfiler(sample_rate=1.5)
+    with pytest.raises(ValueError):
+        QueryProfiler(slow_threshold=-1)
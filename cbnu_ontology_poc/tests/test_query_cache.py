@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+
+from src.graph import graph_builder
+from src.queries import core_queries
+from src.queries.cache import QueryCache
+
+from .fake_neo4j import FakeNeo4jClient
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_evicts_least_recently_used_and_expires():
+    clock = _Clock()
+    cache = QueryCache(maxsize=2, ttl=10, invalidate_on_load=False, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    clock.now = 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 2, 1, 1)
+
+
+def test_cached_student_context_is_invalidated_by_loads(sample_graph_data):
+    client = FakeNeo4jClient()
+    graph_builder.load_nodes(client)
+    graph_builder.load_relationships(client)
+    cache = QueryCache(maxsize=16, ttl=60)
+
+    first = core_queries.get_student_context(client, "20240001", cache=cache)
+    client.run("MATCH (s:Student {student_id: '20240001'}) SET s.status = 'on_leave'")
+    assert core_queries.get_student_context(client, "20240001", cache=cache) is first
+    assert cache.stats().hits == 1
+    many = core_queries.get_student_contexts(client, ["20240001", "20240002"], cache=cache)
+    assert many["20240001"] is first
+    assert core_queries.get_student_context(client, "20240002", cache=cache) is many["20240002"]
+
+    graph_builder.load_relationships(client)
+    refreshed = core_queries.get_student_context(client, "20240001", cache=cache)
+    assert refreshed["student"]["status"] == "on_leave"
+    assert cache.stats().invalidations == 1
+    cache.close()
+
+
+def test_result_computed_across_an_invalidation_is_not_kept():
+    cache = QueryCache(maxsize=4, ttl=60)
+
+    def compute():
+        graph_builder.notify_graph_written()  # a load finishes while the query runs
+        return "old"
+
+    assert cache.get_or_compute("key", compute) == "old"
+    assert cache.get("key") is None
+    assert cache.get_or_compute("key", lambda: "new") == "new"
+    assert cache.get("key") == "new"
+
+    async def compute_async():
+        await asyncio.sleep(0)
+        cache.invalidate()
+        return "old"
+
+    assert asyncio.run(cache.get_or_compute_async("async", compute_async)) == "old"
+    assert cache.get("async") is None
+    cache.close()
+
+
+def test_batch_fetched_across_an_invalidation_is_not_kept(sample_graph_data):
+    client = FakeNeo4jClient()
+    graph_builder.load_nodes(client)
+    graph_builder.load_relationships(client)
+    cache = QueryCache(maxsize=16, ttl=60)
+
+    class _LoadDuringQuery:
+        def run(self, query, parameters=None):
+            graph_builder.notify_graph_written()
+            return client.run(query, parameters)
+
+    contexts = core_queries.get_student_contexts(_LoadDuringQuery(), ["20240001", "20240002"], cache=cache)
+    assert set(contexts) == {"20240001", "20240002"}
+    assert cache.stats().size == 0
+    core_queries.get_student_contexts(client, ["20240001", "20240002"], cache=cache)
+    assert cache.stats().size == 2
+    cache.close()
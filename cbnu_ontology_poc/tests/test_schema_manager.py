@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from src.graph import schema_manager
+from src.graph.neo4j_client import QueryResult
+from src.ontology_schema import INDEX_SPECS, QUERY_PATTERNS, IndexSpec, NodeLabel
+
+from .fake_neo4j import FakeNeo4jClient
+
+
+def test_sync_indexes_is_idempotent_and_leaves_constraints_alone():
+    client = FakeNeo4jClient()
+    schema_manager.create_constraints(client)
+    client.run("CREATE INDEX adhoc_name IF NOT EXISTS FOR (n:Student) ON (n.name)")
+
+    first = schema_manager.sync_indexes(client)
+    assert first.missing == INDEX_SPECS and not first.extra
+    second = schema_manager.sync_indexes(client)
+    assert second.in_sync and second.present == INDEX_SPECS
+
+    names = {index.name for index in schema_manager.existing_indexes(client)}
+    assert {spec.name for spec in INDEX_SPECS} | {"adhoc_name"} == names
+    assert len(client.run("SHOW CONSTRAINTS").records) == len(schema_manager.NODE_KEY_MAP)
+
+
+def test_sync_indexes_drops_managed_indexes_no_longer_declared():
+    client = FakeNeo4jClient()
+    schema_manager.sync_indexes(client)
+    kept = INDEX_SPECS[:2]
+    diff = schema_manager.diff_indexes(client, kept)
+    assert {index.name for index in diff.extra} == {spec.name for spec in INDEX_SPECS[2:]}
+
+    schema_manager.sync_indexes(client, kept)
+    assert schema_manager.diff_indexes(client, kept).in_sync
+    assert {index.name for index in schema_manager.existing_indexes(client)} == {spec.name for spec in kept}
+
+
+def test_index_statement_declares_kind_and_composite_properties():
+    assert schema_manager.index_statement(IndexSpec(NodeLabel.STUDENT, ("dept_id", "year"))) == (
+        "CREATE RANGE INDEX ontology_student_dept_id_year_range IF NOT EXISTS "
+        "FOR (n:Student) ON (n.dept_id, n.year)"
+    )
+
+
+class _PlanClient:
+    """Answers EXPLAIN with a seek on ``indexed`` and a label scan otherwise."""
+
+    def __init__(self, indexed: IndexSpec) -> None:
+        self.indexed = indexed
+
+    def run(self, query, parameters=None):
+        pattern = next(p for p in QUERY_PATTERNS if query == f"EXPLAIN {p.query}")
+        spec = pattern.index
+        if spec == self.indexed:
+            leaf = {
+                "operatorType": "NodeIndexSeek@neo4j",
+                "args": {
+                    "Details": f"{spec.kind.value} INDEX n:{spec.label.value}({', '.join(spec.properties)})"
+                },
+            }
+        else:
+            leaf = {"operatorType": "NodeByLabelScan@neo4j", "args": {"Details": f"n:{spec.label.value}"}}
+        plan = {"operatorType": "ProduceResults@neo4j", "args": {}, "children": [leaf]}
+        return QueryResult([], summary=SimpleNamespace(plan=plan))
+
+
+def test_check_query_patterns_reports_label_scans():
+    checks = schema_manager.check_query_patterns(_PlanClient(QUERY_PATTERNS[0].index))
+    assert [check.uses_index for check in checks] == [True] + [False] * (len(QUERY_PATTERNS) - 1)
+    assert checks[1].operators == ("ProduceResults", "NodeByLabelScan")
+
+    # Servers that return no plan (the in-memory graph) leave the answer open.
+    unknown = schema_manager.check_query_patterns(FakeNeo4jClient())
+    assert {check.uses_index for check in unknown} == {None}